@@ -6,6 +6,8 @@ from ..tools.resource_tools import ResourceTools
 from ..tools.inventory_tools import InventoryTools
 from ..tools.demand_prediction_tools import DemandPredictionTools
 from ..tools.multi_location_tools import MultiLocationTools
+from ..tools.parallel_forecast import ParallelForecaster
+from ..tools.columnar_cache import default_columnar_cache
 from ..models.inventory_models import InventoryItem, InventoryLevel, LocationRecommendation
 
 class ResourceOptimizationAgent:
@@ -34,25 +36,34 @@ class ResourceOptimizationAgent:
 
     def optimize_resources(self, data: Dict[str, Any]) -> Dict[str, Any]:
         locations = data.get('locations', ['Zurich'])
-        historical_data = pd.read_csv(data.get('historical_data_path', 
+        historical_data = default_columnar_cache.load(data.get('historical_data_path',
             'data/sample/inventory_data.csv'))
         inventory_items = data.get('inventory_items', {})
         
+        # Horizonte completo de una vez: cubre el mayor lead time de los items
+        horizon_days = data.get('horizon_days', max(
+            [item.lead_time_days for item in inventory_items.values()] + [1]
+        ))
+        forecast_workers = data.get('forecast_workers', 1)
+        forecaster = (
+            ParallelForecaster('demand', max_workers=forecast_workers)
+            if forecast_workers > 1 else self.demand_tools
+        )
+        demand_horizon = forecaster.forecast_horizon(
+            history=historical_data,
+            items=inventory_items,
+            start=datetime.now(),
+            days=horizon_days,
+            locations=locations
+        )
+
         location_predictions = {}
         location_inventory = {}
         
         for location in locations:
-            location_data = historical_data[
-                historical_data['location'] == location
-            ]
-            
-            predictions = self.demand_tools.predict_demand(
-                historical_data=location_data,
-                items=inventory_items,
-                target_date=datetime.now(),
-                location=location
+            location_predictions[location] = demand_horizon.predictions(
+                location, demand_horizon.dates[0]
             )
-            location_predictions[location] = predictions
             
             location_inventory[location] = {
                 item_id: data.get('inventory_levels', {}).get(
@@ -84,6 +95,7 @@ class ResourceOptimizationAgent:
             'timestamp': datetime.now().isoformat(),
             'locations_analyzed': locations,
             'demand_predictions': location_predictions,
+            'demand_horizon': demand_horizon,
             'inventory_recommendations': inventory_recommendations,
             'multi_location_optimization': multi_location_recommendations,
             'metrics': {
@@ -5,15 +5,18 @@ import os
 import logging
 import yaml
 from datetime import datetime
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Union
 import pandas as pd
 import numpy as np
-import importlib.util
 
 from .agents.performance_analysis_agent import PerformanceAnalysisAgent
 from .agents.resource_optimization_agent import ResourceOptimizationAgent
 from .agents.market_strategy_agent import MarketStrategyAgent
 from .agents.reporting_agent import ReportingAgent
+from .tools.columnar_cache import ColumnarCache
+from .tools.location_partition import SourcePartitions
+from .tools.catalog_snapshot import CatalogSnapshot
+from .tools.sales_store import SalesStore, StoreViews
 
 class TestRunner:
     def __init__(self):
@@ -23,8 +26,10 @@ class TestRunner:
         self.sample_dir = os.path.join(self.data_dir, 'sample')
         self.report_dir = os.path.join(self.data_dir, 'reports')
         os.makedirs(self.report_dir, exist_ok=True)
+        self.columnar_cache = ColumnarCache(os.path.join(self.data_dir, 'cache'))
 
         self.config = self._load_config()
+        self.store, self.store_tables = self._open_store()
         self.inventory_catalog = self._load_inventory_catalog()
         self.agents = self._initialize_agents()
 
@@ -43,17 +48,28 @@ class TestRunner:
             self.config['data_sources']['inventory']['catalog']
         )
         try:
-            spec = importlib.util.spec_from_file_location("catalog", catalog_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            # Snapshot compilado (items construidos solo al pedirlos)
+            snapshot = CatalogSnapshot.load(catalog_path, os.path.join(self.data_dir, 'cache'))
             return {
-                'items': module.INVENTORY_ITEMS,
-                'recipes': module.BURGER_RECIPES
+                'items': snapshot.items,
+                'recipes': snapshot.recipes
             }
         except Exception as e:
             self.logger.error(f"Error loading inventory catalog: {e}")
             raise
 
+    def _open_store(self) -> Tuple[Optional[SalesStore], Dict[str, Dict[str, str]]]:
+        """Almacén SQLite opcional (analysis_config.sql_store) con las fuentes CSV de data_sources"""
+        store_config = self.config['analysis_config'].get('sql_store')
+        if not store_config:
+            return None, {}
+        try:
+            store = SalesStore(os.path.join(self.root_dir, store_config.get('path', 'data/cache/holy_cow.sqlite')))
+            return store, store.sync_sources(self.config['data_sources'], self.sample_dir)
+        except Exception as e:
+            self.logger.error(f"Error opening SQL store: {e}")
+            raise
+
     def _initialize_agents(self) -> Dict[str, Any]:
         return {
             'performance': PerformanceAnalysisAgent(),
@@ -69,8 +85,10 @@ class TestRunner:
         for key, filename in data_config.items():
             if key not in ['catalog']:
                 try:
-                    path = os.path.join(self.sample_dir, filename)
-                    result[key] = pd.read_csv(path)
+                    if self.store is not None:
+                        result[key] = self.store.query(self.store_tables[data_type][key])
+                    else:
+                        result[key] = self.columnar_cache.load(os.path.join(self.sample_dir, filename))
                 except Exception as e:
                     self.logger.error(f"Error loading {data_type} - {key}: {e}")
                     raise
@@ -81,18 +99,27 @@ class TestRunner:
         self.logger.info("Starting system test")
         
         try:
-            data = {
-                'inventory': self._load_data('inventory'),
-                'sales': self._load_data('sales'),
-                'support': self._load_data('support')
-            }
+            if self.store is not None:
+                # Con el almacén SQL solo se leen las filas de cada ubicación
+                partitions = StoreViews(self.store, self.store_tables)
+            else:
+                data = {
+                    'inventory': self._load_data('inventory'),
+                    'sales': self._load_data('sales'),
+                    'support': self._load_data('support')
+                }
+                self.logger.info(
+                    f"Memoria de las fuentes (bytes antes/después del esquema):\n"
+                    f"{self.columnar_cache.memory_report()}"
+                )
+                partitions = SourcePartitions(data)
 
             results = {}
             visualizations = {}
 
             for location in self.config['locations']:
                 try:
-                    location_data = self._prepare_location_data(location, data)
+                    location_data = self._prepare_location_data(location, partitions)
                     
                     # Análisis de rendimiento
                     perf_results = self.agents['performance'].analyze(
@@ -146,31 +173,19 @@ class TestRunner:
     def _prepare_location_data(
         self,
         location: str,
-        data: Dict[str, Dict[str, pd.DataFrame]]
+        partitions: Union[SourcePartitions, StoreViews]
     ) -> Dict[str, Any]:
         return {
             'inventory': {
-                'current': data['inventory']['current'][
-                    data['inventory']['current']['location'] == location
-                ],
-                'historical': data['inventory']['historical'][
-                    data['inventory']['historical']['location'] == location
-                ]
+                'current': partitions.view('inventory', 'current', location),
+                'historical': partitions.view('inventory', 'historical', location)
             },
             'sales': {
-                'current': data['sales']['current'][
-                    data['sales']['current']['location'] == location
-                ],
-                'historical': data['sales']['historical'][
-                    data['sales']['historical']['location'] == location
-                ]
+                'current': partitions.view('sales', 'current', location),
+                'historical': partitions.view('sales', 'historical', location)
             },
-            'marketing': data['support']['marketing'][
-                data['support']['marketing']['location'] == location
-            ],
-            'staff': data['support']['staff'][
-                data['support']['staff']['location'] == location
-            ]
+            'marketing': partitions.view('support', 'marketing', location),
+            'staff': partitions.view('support', 'staff', location)
         }
 
     def _generate_report(
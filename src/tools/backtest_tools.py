@@ -0,0 +1,174 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from ..models.sales_prediction import PredictionMetrics
+from .prediction_tools import PredictionTools
+from .demand_prediction_tools import DemandPredictionTools
+from .series_stats import SeriesGroups
+
+class BacktestTools:
+    """
+    Backtesting con origen móvil para PredictionTools y DemandPredictionTools.
+    Cada fila de prueba se evalúa contra la predicción hecha con los datos
+    disponibles en el origen de su ventana, usando sumas acumuladas por serie
+    """
+
+    ENGINES = ('prediction', 'demand')
+
+    def __init__(
+        self,
+        prediction_tools: Optional[PredictionTools] = None,
+        demand_tools: Optional[DemandPredictionTools] = None
+    ):
+        self.prediction_tools = prediction_tools or PredictionTools()
+        self.demand_tools = demand_tools or DemandPredictionTools()
+
+    def backtest(
+        self,
+        history: pd.DataFrame,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        fold_days: int = 7,
+        min_train: int = 1,
+        engines: Tuple[str, ...] = ENGINES
+    ) -> Dict[str, Dict[Tuple[str, str], PredictionMetrics]]:
+        """Métricas por motor y por (ubicación, item)"""
+        frame = self.backtest_frame(history, start, end, fold_days, min_train, engines)
+        results: Dict[str, Dict[Tuple[str, str], PredictionMetrics]] = {}
+        for row in frame.itertuples(index=False):
+            results.setdefault(row.engine, {})[(row.location, row.item_id)] = PredictionMetrics(
+                mae=row.mae,
+                mape=row.mape,
+                accuracy=row.accuracy,
+                evaluation_period=row.evaluation_period
+            )
+        return results
+
+    def backtest_frame(
+        self,
+        history: pd.DataFrame,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        fold_days: int = 7,
+        min_train: int = 1,
+        engines: Tuple[str, ...] = ENGINES
+    ) -> pd.DataFrame:
+        """
+        Evalúa ventanas consecutivas de `fold_days` días a partir de `start`
+        (por defecto la mitad del periodo histórico). La ventana k prueba los
+        días (start + k·fold, start + (k+1)·fold] con lo observado hasta su origen
+        """
+        for engine in engines:
+            if engine not in self.ENGINES:
+                raise ValueError(f"Motor de backtest desconocido: {engine}")
+        # Sin al menos una observación de entrenamiento no hay media que predecir
+        if min_train < 1:
+            raise ValueError("min_train debe ser al menos 1")
+
+        groups = SeriesGroups(history, ['location', 'item_id'])
+        if not len(groups):
+            return self._empty_frame()
+
+        dates = groups.dates.astype('datetime64[D]')
+        first_day, last_day = dates.min(), dates.max()
+        origin_day = (
+            np.datetime64(pd.Timestamp(start).date(), 'D') if start is not None
+            else first_day + (last_day - first_day) // 2
+        )
+        end_day = np.datetime64(pd.Timestamp(end).date(), 'D') if end is not None else last_day
+
+        # Origen de la ventana de cada fila de prueba
+        day = (dates - first_day).astype(np.int64)
+        start_day = int((origin_day - first_day).astype(np.int64))
+        testing = (dates > origin_day) & (dates <= end_day)
+        fold = (day - start_day - 1) // fold_days
+        origin = start_day + fold * fold_days
+
+        # Última fila de entrenamiento: búsqueda binaria sobre la clave (serie, día)
+        span = int(day.max()) + 2
+        keys = groups.codes.astype(np.int64) * span + day
+        train_end = np.searchsorted(keys, groups.codes * span + origin, side='right') - 1
+        series_start = groups.starts[groups.codes]
+        train_count = train_end - series_start + 1
+        rows = np.flatnonzero(testing & (train_count >= min_train))
+        if not len(rows):
+            return self._empty_frame()
+
+        sales = groups.values('units_sold')
+        offsets = groups.day_offsets()
+        n = train_count[rows].astype(np.float64)
+        last = train_end[rows]
+        before = series_start[rows] - 1
+
+        def prefix(values: np.ndarray) -> np.ndarray:
+            # Suma de la serie desde su inicio hasta la última fila de entrenamiento
+            cumulative = np.cumsum(values)
+            base = np.where(before >= 0, cumulative[np.maximum(before, 0)], 0.0)
+            return cumulative[last] - base
+
+        sum_y = prefix(sales)
+        mean = sum_y / n
+        actual = sales[rows]
+        target = pd.DatetimeIndex(dates[rows])
+        months = target.month.to_numpy()
+        weekdays = target.weekday.to_numpy()
+
+        predictions = {}
+        # Mismas fórmulas que las predicciones de cada motor
+        if 'prediction' in engines:
+            tools = self.prediction_tools
+            trend = tools.trend_factors(sales[series_start[rows]], sales[last], n)
+            predictions['prediction'] = mean * tools.month_factors(months) * trend
+
+        if 'demand' in engines:
+            tools = self.demand_tools
+            month_factor, day_factor = tools.calendar_factors(months, weekdays)
+            trend = tools._trend_from_sums(
+                n,
+                prefix(offsets),
+                sum_y,
+                prefix(offsets * sales),
+                prefix(offsets * offsets)
+            )
+            predictions['demand'] = mean * month_factor * day_factor * trend
+
+        series = groups.codes[rows]
+        size = len(groups)
+        counts = np.bincount(series, minlength=size)
+        nonzero = actual != 0
+        ape_counts = np.bincount(series[nonzero], minlength=size)
+        evaluated = counts > 0
+        period = f"{pd.Timestamp(dates[rows].min()).date()} - {pd.Timestamp(dates[rows].max()).date()}"
+
+        frames = []
+        for engine, predicted in predictions.items():
+            error = np.abs(predicted - actual)
+            mae = np.bincount(series, weights=error, minlength=size)
+            ape = np.bincount(
+                series[nonzero], weights=error[nonzero] / np.abs(actual[nonzero]), minlength=size
+            )
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mae = mae / counts
+                # Sin ventas reales distintas de cero el MAPE no está definido
+                mape = np.where(ape_counts > 0, ape / ape_counts * 100, np.nan)
+            accuracy = np.clip(1 - mape / 100, 0.0, 1.0)
+
+            frames.append(pd.DataFrame({
+                'engine': engine,
+                'location': groups.keys['location'].to_numpy()[evaluated],
+                'item_id': groups.keys['item_id'].to_numpy()[evaluated],
+                'mae': mae[evaluated],
+                'mape': mape[evaluated],
+                'accuracy': accuracy[evaluated],
+                'observations': counts[evaluated],
+                'evaluation_period': period
+            }))
+
+        return pd.concat(frames, ignore_index=True)
+
+    def _empty_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=[
+            'engine', 'location', 'item_id', 'mae', 'mape',
+            'accuracy', 'observations', 'evaluation_period'
+        ])
@@ -0,0 +1,198 @@
+import os
+import ast
+import json
+import hashlib
+import logging
+import importlib.util
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+import numpy as np
+from pydantic import TypeAdapter
+from ..models.inventory_models import InventoryItem
+from .columnar_cache import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+FIELDS = list(InventoryItem.model_fields)
+DATETIME_FIELDS = {'last_order_date'}
+
+class CatalogCompileError(ValueError):
+    pass
+
+def _literal(node: ast.AST) -> Any:
+    # Miembros de enumeraciones (ItemCategory.FROZEN) se guardan por nombre
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        return node.attr
+    try:
+        return ast.literal_eval(node)
+    except ValueError as e:
+        raise CatalogCompileError(f"Valor no literal en la línea {getattr(node, 'lineno', '?')}") from e
+
+def _is_inventory_item(func: ast.AST) -> bool:
+    if isinstance(func, ast.Name):
+        return func.id == 'InventoryItem'
+    return isinstance(func, ast.Attribute) and func.attr == 'InventoryItem'
+
+def _parse_source(source_path: str) -> Dict[str, Any]:
+    """Lee INVENTORY_ITEMS y BURGER_RECIPES del catálogo sin ejecutarlo"""
+    with open(source_path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=source_path)
+
+    values: Dict[str, ast.AST] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            values[node.targets[0].id] = node.value
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+            # Docstrings y constantes sueltas no tienen efecto
+            continue
+        elif not isinstance(node, (ast.Import, ast.ImportFrom)):
+            # Cualquier otra sentencia (p. ej. INVENTORY_ITEMS.update(...)) podría
+            # modificar el catálogo al ejecutarse
+            raise CatalogCompileError(f"Sentencia no soportada en la línea {node.lineno}")
+    if 'INVENTORY_ITEMS' not in values or not isinstance(values['INVENTORY_ITEMS'], ast.Dict):
+        raise CatalogCompileError("INVENTORY_ITEMS no es un diccionario literal")
+
+    items = {}
+    definition = values['INVENTORY_ITEMS']
+    for key, call in zip(definition.keys, definition.values):
+        if not (
+            isinstance(call, ast.Call) and _is_inventory_item(call.func)
+            and not call.args and all(k.arg for k in call.keywords)
+        ):
+            raise CatalogCompileError("Cada item debe ser InventoryItem(campo=valor, ...)")
+        items[_literal(key)] = {keyword.arg: _literal(keyword.value) for keyword in call.keywords}
+
+    recipes = _literal(values['BURGER_RECIPES']) if 'BURGER_RECIPES' in values else {}
+    return {'items': items, 'recipes': recipes}
+
+def _import_source(source_path: str) -> Dict[str, Any]:
+    spec = importlib.util.spec_from_file_location("catalog", source_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return {
+        'items': {key: item.model_dump(mode='json') for key, item in module.INVENTORY_ITEMS.items()},
+        'recipes': getattr(module, 'BURGER_RECIPES', {})
+    }
+
+def compile_catalog(source_path: str) -> Dict[str, Any]:
+    """
+    Compila el catálogo a una tabla por columnas (una lista por campo de
+    InventoryItem) validada una sola vez. Se analiza el archivo con ast y solo
+    si no es literal se ejecuta con importlib
+    """
+    try:
+        catalog = _parse_source(source_path)
+    except (CatalogCompileError, SyntaxError) as e:
+        logger.info(f"Catálogo no literal ({e}); se ejecuta con importlib")
+        catalog = _import_source(source_path)
+
+    keys = list(catalog['items'])
+    validated = TypeAdapter(List[InventoryItem]).validate_python(list(catalog['items'].values()))
+    rows = [item.model_dump(mode='json') for item in validated]
+    return {
+        'format': FORMAT_VERSION,
+        'keys': keys,
+        'columns': {field: [row[field] for row in rows] for field in FIELDS},
+        'recipes': catalog['recipes']
+    }
+
+class LazyItems(Mapping):
+    """Vista dict de los items: cada InventoryItem se construye al pedirlo"""
+
+    def __init__(self, snapshot: 'CatalogSnapshot'):
+        self._snapshot = snapshot
+        self._built: Dict[str, InventoryItem] = {}
+
+    def __getitem__(self, key: str) -> InventoryItem:
+        item = self._built.get(key)
+        if item is None:
+            item = self._snapshot.build_item(self._snapshot.position(key))
+            self._built[key] = item
+        return item
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot.keys)
+
+    def __len__(self) -> int:
+        return len(self._snapshot.keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._snapshot.index
+
+    def __reduce__(self):
+        # Entre procesos viaja como dict ya construido
+        return (dict, (dict(self.items()),))
+
+class CatalogSnapshot:
+    """
+    Catálogo compilado: tabla de items por columnas (arrays de numpy para los
+    campos numéricos) y recetas. Se guarda como JSON en data/cache y se
+    regenera cuando cambia el mtime o el tamaño del archivo fuente
+    """
+
+    def __init__(self, keys: List[str], columns: Dict[str, List[Any]], recipes: Dict[str, Dict[str, float]]):
+        self.keys = list(keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.columns: Dict[str, Any] = {}
+        for field, values in columns.items():
+            if values and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+                self.columns[field] = np.asarray(values)
+            else:
+                self.columns[field] = values
+        self.recipes = recipes
+        self.items = LazyItems(self)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def position(self, key: str) -> int:
+        return self.index[key]
+
+    def column(self, field: str) -> np.ndarray:
+        return np.asarray(self.columns[field])
+
+    def build_item(self, position: int) -> InventoryItem:
+        # Los datos se validaron al compilar: construcción directa sin validar
+        values = {}
+        for field in FIELDS:
+            value = self.columns[field][position]
+            if isinstance(value, np.generic):
+                value = value.item()
+            if field in DATETIME_FIELDS and value is not None:
+                value = datetime.fromisoformat(value)
+            values[field] = value
+        return InventoryItem.model_construct(**values)
+
+    @classmethod
+    def load(cls, source_path: str, cache_dir: Optional[str] = None) -> 'CatalogSnapshot':
+        cache_dir = cache_dir or get_cache_dir()
+        digest = hashlib.blake2b(os.path.abspath(source_path).encode('utf-8'), digest_size=8).hexdigest()
+        snapshot_path = os.path.join(cache_dir, f"catalog-{os.path.basename(source_path)}-{digest}.json")
+        source = os.stat(source_path)
+
+        try:
+            with open(snapshot_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if (
+                stored.get('format') == FORMAT_VERSION
+                and stored.get('mtime_ns') == source.st_mtime_ns
+                and stored.get('size') == source.st_size
+                and stored.get('fields') == FIELDS
+            ):
+                return cls(stored['keys'], stored['columns'], stored['recipes'])
+        except (OSError, ValueError):
+            pass
+
+        compiled = compile_catalog(source_path)
+        compiled.update({'mtime_ns': source.st_mtime_ns, 'size': source.st_size, 'fields': FIELDS})
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            staging = f"{snapshot_path}.{os.getpid()}.tmp"
+            with open(staging, 'w', encoding='utf-8') as f:
+                json.dump(compiled, f, separators=(',', ':'))
+            os.replace(staging, snapshot_path)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar el snapshot del catálogo: {e}")
+        return cls(compiled['keys'], compiled['columns'], compiled['recipes'])
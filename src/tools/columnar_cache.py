@@ -0,0 +1,199 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from .data_schema import SCHEMAS, apply_schema, memory_report
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+
+def get_cache_dir() -> str:
+    root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    return os.path.join(root, 'data', 'cache')
+
+class ColumnarCache:
+    """
+    Cache binario columnar de los CSV de entrada: cada columna se guarda como
+    un .npy (mapeado en memoria al leer) junto a un meta.json con el tipo de
+    cada columna. Las fechas se guardan ya parseadas, cada origen recibe los
+    tipos de su esquema (data_schema.SCHEMAS) y los textos se guardan como
+    códigos de categoría; location e item_id se devuelven como categóricas.
+    Una entrada es válida mientras no cambien el mtime ni el tamaño del origen
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        categorical_columns: Iterable[str] = ('location', 'item_id', 'item'),
+        schemas: Optional[Dict[str, Dict[str, str]]] = None
+    ):
+        self.cache_dir = cache_dir or get_cache_dir()
+        self.categorical_columns = tuple(categorical_columns)
+        self.schemas = schemas if schemas is not None else SCHEMAS
+        self.hits = 0
+        self.misses = 0
+        # Memoria antes/después del esquema de cada origen cargado
+        self.reports: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, path: str) -> pd.DataFrame:
+        """Lee un CSV desde el cache, convirtiéndolo en el primer acceso"""
+        source = os.stat(path)
+        entry = self._entry_dir(path)
+        meta = self._read_meta(entry)
+        if (
+            meta is not None
+            and meta.get('format') == FORMAT_VERSION
+            and meta.get('mtime_ns') == source.st_mtime_ns
+            and meta.get('size') == source.st_size
+            and meta.get('categorical_columns') == list(self.categorical_columns)
+            and meta.get('schema') == self._schema(path)
+        ):
+            try:
+                frame = self._read_columns(entry, meta)
+                with self._lock:
+                    self.hits += 1
+                self._report(path, meta)
+                return frame
+            except (OSError, ValueError) as e:
+                logger.warning(f"Cache columnar corrupto para {path}, se regenera: {e}")
+
+        with self._lock:
+            self.misses += 1
+        raw = self._parse(path)
+        frame = apply_schema(raw, self._schema(path))
+        report = memory_report(raw, frame)
+        try:
+            self._write_columns(entry, frame, path, source, report)
+        except OSError as e:
+            logger.warning(f"No se pudo escribir el cache columnar de {path}: {e}")
+            self._report(path, report)
+            return frame
+        meta = self._read_meta(entry)
+        self._report(path, meta)
+        return self._read_columns(entry, meta)
+
+    def invalidate(self, path: str) -> None:
+        shutil.rmtree(self._entry_dir(path), ignore_errors=True)
+
+    def memory_report(self) -> pd.DataFrame:
+        """Filas y bytes antes/después del esquema de cada origen cargado"""
+        return pd.DataFrame.from_dict(self.reports, orient='index')
+
+    def _schema(self, path: str) -> Dict[str, str]:
+        return self.schemas.get(os.path.basename(path), {})
+
+    def _report(self, path: str, meta: Dict[str, Any]) -> None:
+        report = {key: meta[key] for key in ('rows', 'bytes_before', 'bytes_after', 'saved_pct')}
+        with self._lock:
+            self.reports[os.path.basename(path)] = report
+        logger.debug(
+            f"{os.path.basename(path)}: {report['bytes_before']} -> {report['bytes_after']} bytes "
+            f"({report['saved_pct']}% menos)"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def _entry_dir(self, path: str) -> str:
+        digest = hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=8).hexdigest()
+        return os.path.join(self.cache_dir, f"{os.path.basename(path)}-{digest}")
+
+    def _read_meta(self, entry: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(entry, 'meta.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _parse(self, path: str) -> pd.DataFrame:
+        frame = pd.read_csv(path)
+        for column in frame.columns:
+            if column == 'date' or column.endswith('_date'):
+                try:
+                    frame[column] = pd.to_datetime(frame[column])
+                except (ValueError, TypeError):
+                    logger.debug(f"Columna {column} de {path} no es una fecha")
+        return frame
+
+    def _write_columns(
+        self,
+        entry: str,
+        frame: pd.DataFrame,
+        path: str,
+        source: os.stat_result,
+        report: Dict[str, float]
+    ) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp-')
+        try:
+            columns: List[Dict[str, Any]] = []
+            for position, name in enumerate(frame.columns):
+                series = frame[name]
+                filename = f"{position:04d}.npy"
+                column = {'name': name, 'file': filename}
+                if pd.api.types.is_datetime64_any_dtype(series) and series.dt.tz is None:
+                    column['kind'] = 'datetime'
+                    values = series.to_numpy(dtype='datetime64[ns]')
+                elif isinstance(series.dtype, pd.CategoricalDtype):
+                    column['kind'] = 'category'
+                    column['categories'] = [str(value) for value in series.cat.categories]
+                    values = series.cat.codes.to_numpy().astype(np.int32)
+                elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                    column['kind'] = 'numeric'
+                    values = series.to_numpy()
+                else:
+                    codes, categories = pd.factorize(series, sort=True)
+                    column['kind'] = 'category' if name in self.categorical_columns else 'text'
+                    column['dtype'] = str(series.dtype)
+                    column['categories'] = [str(value) for value in categories]
+                    values = codes.astype(np.int32)
+                np.save(os.path.join(staging, filename), values, allow_pickle=False)
+                columns.append(column)
+
+            meta = {
+                'format': FORMAT_VERSION,
+                'source': os.path.abspath(path),
+                'mtime_ns': source.st_mtime_ns,
+                'size': source.st_size,
+                'categorical_columns': list(self.categorical_columns),
+                'schema': self._schema(path),
+                **report,
+                'columns': columns
+            }
+            with open(os.path.join(staging, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+
+            # Reemplazo atómico de la entrada anterior
+            with self._lock:
+                shutil.rmtree(entry, ignore_errors=True)
+                os.replace(staging, entry)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _read_columns(self, entry: str, meta: Dict[str, Any]) -> pd.DataFrame:
+        data = {}
+        for column in meta['columns']:
+            # Copia en escritura: el DataFrame es modificable sin tocar el cache
+            values = np.load(os.path.join(entry, column['file']), mmap_mode='c', allow_pickle=False)
+            if column['kind'] in ('category', 'text'):
+                values = pd.Categorical.from_codes(np.asarray(values), categories=column['categories'])
+                if column['kind'] == 'text':
+                    values = pd.Series(values).astype(column['dtype']).to_numpy()
+            data[column['name']] = values
+        return pd.DataFrame(data, copy=False)
+
+# Cache compartido por los cargadores de datos dentro de un proceso
+default_columnar_cache = ColumnarCache()
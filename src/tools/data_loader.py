@@ -1,79 +1,185 @@
 import os
+import copy
 import json
 import logging
+import threading
 import pandas as pd
 from typing import Dict, Any, Optional
 from datetime import datetime
+from pydantic import TypeAdapter
 from ..models.inventory_models import InventoryLevel, InventoryItem
+from .columnar_cache import default_columnar_cache
+from .history_index import HistoryIndex
+from .streaming_ingest import StreamingHistory
+from .sales_store import default_sales_store
 
 logger = logging.getLogger(__name__)
 
+# Historial indexado compartido por el proceso, junto al mtime de su origen
+_history_index: Dict[str, Any] = {}
+_history_lock = threading.Lock()
+
 def get_project_root() -> str:
     return os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 
+class _FrozenDict(dict):
+    """dict de solo lectura (mismo repr que un dict; deepcopy devuelve un dict mutable)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Los escenarios cargados son de solo lectura")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+class _FrozenList(list):
+    """list de solo lectura"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Los escenarios cargados son de solo lectura")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze(item) for item in value)
+    return value
+
+# Escenarios validados una vez por proceso, junto al mtime de su origen
+_scenarios: Dict[str, Any] = {}
+_scenarios_lock = threading.Lock()
+_items_adapter = TypeAdapter(Dict[str, Dict[str, InventoryItem]])
+
+def _parse_test_scenarios(file_path: str) -> Dict[str, Any]:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        scenarios = json.load(f)
+
+    # Validación en bloque de todos los items de todas las ubicaciones
+    items = _items_adapter.validate_python({
+        location: scenario['sales_data']['items']
+        for location, scenario in scenarios.items()
+        if 'items' in scenario.get('sales_data', {})
+    })
+
+    # Los niveles solo llevan números: se validan con float() y se construyen sin Pydantic
+    loaded_at = datetime.now()
+    for location, scenario in scenarios.items():
+        sales_data = scenario.get('sales_data')
+        if not sales_data:
+            continue
+        if 'inventory_levels' in sales_data:
+            sales_data['inventory_levels'] = {
+                item_id: InventoryLevel.model_construct(
+                    item_id=item_id,
+                    current_quantity=float(level),
+                    available_quantity=float(level),
+                    reserved_quantity=0.0,
+                    last_updated=loaded_at,
+                    batch_info=None
+                )
+                for item_id, level in sales_data['inventory_levels'].items()
+            }
+        if location in items:
+            sales_data['items'] = items[location]
+
+    return _freeze(scenarios)
+
 def load_test_scenarios() -> Dict[str, Any]:
-    """Carga escenarios de prueba y convierte a modelos Pydantic"""
+    """
+    Escenarios de prueba con modelos Pydantic, leídos y validados una vez por
+    proceso (se recargan si cambia el archivo). Cada ubicación es una vista de
+    solo lectura compartida; usar copy.deepcopy para obtener una copia editable
+    """
     try:
         file_path = os.path.join(get_project_root(), 'data', 'sample', 'test_scenarios.json')
-        with open(file_path, 'r', encoding='utf-8') as f:
-            scenarios = json.load(f)
-            
-        # Convertir a modelos Pydantic
-        for location in scenarios:
-            if 'sales_data' in scenarios[location]:
-                sales_data = scenarios[location]['sales_data']
-                
-                # Convertir inventory_levels a InventoryLevel
-                if 'inventory_levels' in sales_data:
-                    inventory_levels = {}
-                    for item_id, level in sales_data['inventory_levels'].items():
-                        inventory_levels[item_id] = InventoryLevel(
-                            item_id=item_id,
-                            current_quantity=float(level),
-                            available_quantity=float(level),
-                            last_updated=datetime.now()
-                        )
-                    sales_data['inventory_levels'] = inventory_levels
-                
-                # Convertir items a InventoryItem
-                if 'items' in sales_data:
-                    items = {}
-                    for item_id, item_data in sales_data['items'].items():
-                        items[item_id] = InventoryItem(**item_data)
-                    sales_data['items'] = items
-            
-        return scenarios
-            
+        mtime = os.stat(file_path).st_mtime_ns
+        with _scenarios_lock:
+            if _scenarios.get('mtime') != mtime:
+                _scenarios['data'] = _parse_test_scenarios(file_path)
+                _scenarios['mtime'] = mtime
+            return _scenarios['data']
+
     except Exception as e:
         logger.error(f"Error cargando escenarios: {str(e)}")
         raise
 
+def get_scenario(location: str) -> Dict[str, Any]:
+    """Vista de solo lectura del escenario de una ubicación"""
+    return load_test_scenarios()[location]
+
 def load_sales_history() -> pd.DataFrame:
     """Carga historial de ventas"""
     try:
         file_path = os.path.join(get_project_root(), 'data', 'sample', 'sales_history.csv')
-        df = pd.read_csv(file_path)
-        df['date'] = pd.to_datetime(df['date'])
+        # Fechas ya parseadas y location/item_id categóricas desde el cache
+        df = default_columnar_cache.load(file_path)
+        if not pd.api.types.is_datetime64_any_dtype(df['date']):
+            df['date'] = pd.to_datetime(df['date'])
         return df
     except Exception as e:
         logger.error(f"Error cargando historial: {str(e)}")
         raise
 
+def load_daily_sales(memory_budget_mb: float = 256) -> pd.DataFrame:
+    """Totales diarios por (ubicación, item) leyendo el historial por bloques"""
+    file_path = os.path.join(get_project_root(), 'data', 'sample', 'sales_history.csv')
+    return StreamingHistory(file_path, memory_budget_mb=memory_budget_mb).daily_totals()
+
+def get_history_index() -> HistoryIndex:
+    """Historial de ventas indexado, cargado una vez por proceso (se recarga si cambia el archivo)"""
+    file_path = os.path.join(get_project_root(), 'data', 'sample', 'sales_history.csv')
+    mtime = os.stat(file_path).st_mtime_ns
+    with _history_lock:
+        if _history_index.get('mtime') != mtime:
+            _history_index['index'] = HistoryIndex(load_sales_history())
+            _history_index['mtime'] = mtime
+        return _history_index['index']
+
 def get_historical_data(
     location: str,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None
 ) -> pd.DataFrame:
-    """Obtiene datos históricos filtrados"""
-    df = load_sales_history()
-    
-    # Filtrar por ubicación
-    df = df[df['location'] == location]
-    
-    # Filtrar por fechas si se especifican
-    if start_date:
-        df = df[df['date'] >= start_date]
-    if end_date:
-        df = df[df['date'] <= end_date]
-        
-    return df
\ No newline at end of file
+    """Obtiene datos históricos filtrados (corte del historial indexado, sin copia)"""
+    return get_history_index().slice(location, start_date, end_date)
+
+def query_sales_history(
+    location: Optional[str] = None,
+    item_id: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> pd.DataFrame:
+    """Filas del historial filtradas en SQLite (solo se materializa lo pedido)"""
+    file_path = os.path.join(get_project_root(), 'data', 'sample', 'sales_history.csv')
+    table = default_sales_store.sync(file_path)
+    return default_sales_store.query(table, location=location, item_id=item_id,
+                                     start_date=start_date, end_date=end_date)
+
+def aggregate_sales(
+    freq: str = 'D',
+    location: Optional[str] = None,
+    item_id: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> pd.DataFrame:
+    """Unidades e ingresos por (ubicación, item) y día ('D') o semana ('W'), sumados en SQLite"""
+    file_path = os.path.join(get_project_root(), 'data', 'sample', 'sales_history.csv')
+    table = default_sales_store.sync(file_path)
+    return default_sales_store.aggregate(
+        table, ['units_sold', 'revenue'], freq=freq, location=location,
+        item_id=item_id, start_date=start_date, end_date=end_date
+    )
@@ -0,0 +1,104 @@
+import logging
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Tipos declarados por archivo de origen (nombre en data_sources de config.yaml)
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    'inventory_data.csv': {
+        'location': 'category',
+        'item_id': 'category',
+        'units_in_stock': 'int32',
+        'units_sold': 'int32',
+        'waste_units': 'int32',
+        'stock_value': 'float32',
+        'reorder_point': 'int32'
+    },
+    'inventory.csv': {
+        'location': 'category',
+        'item': 'category',
+        'quantity': 'float32',
+        'minimum_stock': 'float32',
+        'cost_per_unit': 'float32',
+        'supplier': 'category'
+    },
+    'sales_history.csv': {
+        'location': 'category',
+        'item_id': 'category',
+        'units_sold': 'int32',
+        'revenue': 'float32'
+    },
+    'historical_sales.csv': {
+        'location': 'category',
+        'daily_sales': 'float32',
+        'customer_count': 'int32',
+        'average_ticket': 'float32',
+        'weather_condition': 'category',
+        'is_holiday': 'bool',
+        'is_event_day': 'bool'
+    },
+    'marketing_campaigns.csv': {
+        'location': 'category',
+        'campaign_type': 'category',
+        'target_audience': 'category',
+        'budget': 'float32',
+        'impressions': 'int32',
+        'conversions': 'int32',
+        'revenue_impact': 'float32'
+    },
+    'staff_metrics.csv': {
+        'location': 'category',
+        'staff_count': 'int32',
+        'shift': 'category',
+        'efficiency_score': 'float32',
+        'hours_worked': 'float32',
+        'overtime_hours': 'float32',
+        'customer_satisfaction': 'float32',
+        'training_completed': 'bool',
+        'years_experience': 'float32',
+        'department': 'category'
+    }
+}
+
+def frame_bytes(frame: pd.DataFrame) -> int:
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+def apply_schema(frame: pd.DataFrame, schema: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """
+    Convierte las columnas declaradas; si un valor no cabe en el tipo
+    (nulos o decimales en un entero, fuera de rango de int32...) la columna
+    se conserva
+    """
+    if not schema:
+        return frame
+    frame = frame.copy()
+    for column, dtype in schema.items():
+        if column not in frame.columns:
+            continue
+        values = frame[column]
+        try:
+            if dtype == 'bool':
+                if values.isna().any() or not values.isin([0, 1, True, False]).all():
+                    raise ValueError("valores no booleanos")
+            elif dtype.startswith('int'):
+                limits = np.iinfo(dtype)
+                if values.isna().any() or values.min() < limits.min or values.max() > limits.max:
+                    raise ValueError(f"fuera del rango de {dtype}")
+                if values.dtype.kind == 'f' and not np.array_equal(values, np.round(values)):
+                    raise ValueError("valores con decimales")
+            frame[column] = values.astype(dtype)
+        except (ValueError, TypeError) as e:
+            logger.debug(f"Columna {column} sin convertir a {dtype}: {e}")
+    return frame
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> Dict[str, float]:
+    bytes_before = frame_bytes(before)
+    bytes_after = frame_bytes(after)
+    return {
+        'rows': len(after),
+        'bytes_before': bytes_before,
+        'bytes_after': bytes_after,
+        'saved_pct': round(100 * (1 - bytes_after / bytes_before), 1) if bytes_before else 0.0
+    }
@@ -0,0 +1,107 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from ..models.inventory_models import InventoryPrediction
+
+class DemandCube:
+    """Demanda prevista densa con ejes (ubicación × item × día)"""
+
+    def __init__(
+        self,
+        locations: List[str],
+        item_ids: List[str],
+        dates: pd.DatetimeIndex,
+        demand: np.ndarray,
+        std: np.ndarray,
+        trend: np.ndarray,
+        seasonality: np.ndarray,
+        observed: np.ndarray
+    ):
+        self.locations = list(locations)
+        self.item_ids = list(item_ids)
+        self.dates = dates
+        self.demand = demand
+        self.std = std
+        self.trend = trend
+        self.seasonality = seasonality
+        self.observed = observed
+        self._location_index = {loc: i for i, loc in enumerate(self.locations)}
+        self._item_index = {item_id: i for i, item_id in enumerate(self.item_ids)}
+
+    @classmethod
+    def concat(cls, cubes: List['DemandCube']) -> 'DemandCube':
+        """Une cubos con los mismos items y fechas a lo largo del eje de ubicaciones"""
+        first = cubes[0]
+        return cls(
+            locations=[loc for cube in cubes for loc in cube.locations],
+            item_ids=first.item_ids,
+            dates=first.dates,
+            demand=np.concatenate([cube.demand for cube in cubes], axis=0),
+            std=np.concatenate([cube.std for cube in cubes], axis=0),
+            trend=np.concatenate([cube.trend for cube in cubes], axis=0),
+            seasonality=first.seasonality,
+            observed=np.concatenate([cube.observed for cube in cubes], axis=0)
+        )
+
+    @property
+    def shape(self) -> tuple:
+        return self.demand.shape
+
+    def sel(
+        self,
+        location: Optional[str] = None,
+        item_id: Optional[str] = None
+    ) -> np.ndarray:
+        """Sub-arreglo por ubicación y/o item (vista, sin copia)"""
+        loc = self._location_index[location] if location is not None else slice(None)
+        item = self._item_index[item_id] if item_id is not None else slice(None)
+        return self.demand[loc, item]
+
+    def day_index(self, date: datetime) -> int:
+        day = pd.Timestamp(date).normalize()
+        position = self.dates.get_indexer([day])[0]
+        if position < 0:
+            raise KeyError(f"Fecha fuera del horizonte: {day.date()}")
+        return int(position)
+
+    def total_demand(self, days: Optional[int] = None) -> np.ndarray:
+        """Demanda acumulada (ubicación × item) de los primeros `days` días"""
+        return np.nansum(self.demand[:, :, :days], axis=2)
+
+    def predictions(
+        self,
+        location: str,
+        date: datetime
+    ) -> Dict[str, InventoryPrediction]:
+        """Predicciones de un día con el mismo formato que predict_demand"""
+        loc = self._location_index[location]
+        day = self.day_index(date)
+        predicted = self.demand[loc, :, day]
+        std_dev = self.std[loc]
+        lower = predicted - 2 * std_dev
+        lower = np.round(np.where(lower > 0, lower, 0.0), 2)
+        upper = np.round(predicted + 2 * std_dev, 2)
+        demand = np.round(predicted, 2)
+        trend = np.round(self.trend[loc], 2)
+        seasonality = round(float(self.seasonality[day]), 2)
+
+        predictions = {}
+        for i in np.flatnonzero(self.observed[loc]):
+            predictions[self.item_ids[i]] = InventoryPrediction(
+                predicted_demand=demand[i],
+                confidence_range=(lower[i], upper[i]),
+                trend_factor=trend[i],
+                seasonality_factor=seasonality
+            )
+        return predictions
+
+    def to_frame(self) -> pd.DataFrame:
+        """Formato largo: una fila por (ubicación, item, fecha) observada"""
+        loc, item, day = np.nonzero(self.observed[:, :, None] & np.ones(len(self.dates), dtype=bool))
+        return pd.DataFrame({
+            'location': np.asarray(self.locations, dtype=object)[loc],
+            'item_id': np.asarray(self.item_ids, dtype=object)[item],
+            'date': self.dates[day],
+            'predicted_demand': self.demand[loc, item, day]
+        })
@@ -1,15 +1,19 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from langchain.tools import StructuredTool
 from ..models.inventory_models import (
     InventoryItem,
     InventoryPrediction
 )
+from .series_stats import SeriesGroups
+from .demand_cube import DemandCube
+from .forecast_cache import ForecastCache, default_forecast_cache, history_fingerprint
 
 class DemandPredictionTools:
-    def __init__(self):
+    def __init__(self, cache: Optional[ForecastCache] = None):
+        self.cache = cache if cache is not None else default_forecast_cache
         self.seasonality_factors = {
             1: 0.9, 2: 0.9, 6: 1.2, 7: 1.2, 8: 1.2, 12: 1.1
         }
@@ -21,53 +25,192 @@ class DemandPredictionTools:
         target_date: datetime,
         location: str
     ) -> Dict[str, InventoryPrediction]:
+        key = self.cache.make_key(
+            'demand',
+            location,
+            items.keys(),
+            target_date,
+            (
+                tuple(sorted(self.seasonality_factors.items())),
+                tuple(sorted(self.day_factors.items()))
+            ),
+            history_fingerprint(historical_data, ['item_id', 'units_sold', 'date'])
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        data = historical_data[historical_data['item_id'].isin(list(items.keys()))]
+        stats = self.series_statistics(data, ['item_id'])
+        predictions = self.build_predictions(stats, items, target_date)
+        self.cache.put(key, predictions)
+        return predictions
+
+    def build_predictions(self,
+        stats: pd.DataFrame,
+        items: Dict[str, InventoryItem],
+        target_date: datetime
+    ) -> Dict[str, InventoryPrediction]:
+        """Convierte estadísticas por item (mean, std, trend) en predicciones"""
         predictions = {}
-        
-        for item_id in items.keys():
-            item_data = historical_data[historical_data['item_id'] == item_id]
-            if item_data.empty:
-                continue
-                
-            avg_daily_sales = item_data['units_sold'].mean()
-            month_factor = self.seasonality_factors.get(target_date.month, 1.0)
-            day_factor = self.day_factors.get(target_date.weekday(), 1.0)
-            trend = self._calculate_trend(item_data)
-            
-            predicted_demand = avg_daily_sales * month_factor * day_factor * trend
-            std_dev = item_data['units_sold'].std()
-            
-            predictions[item_id] = InventoryPrediction(
-                predicted_demand=round(predicted_demand, 2),
-                confidence_range=(
-                    round(max(0, predicted_demand - 2 * std_dev), 2),
-                    round(predicted_demand + 2 * std_dev, 2)
-                ),
-                trend_factor=round(trend, 2),
-                seasonality_factor=round(month_factor * day_factor, 2)
+        month_factor = self.seasonality_factors.get(target_date.month, 1.0)
+        day_factor = self.day_factors.get(target_date.weekday(), 1.0)
+        predicted = stats['mean'].to_numpy() * month_factor * day_factor * stats['trend'].to_numpy()
+        std_dev = stats['std'].to_numpy()
+        lower = predicted - 2 * std_dev
+
+        frame = pd.DataFrame({
+            'predicted_demand': np.round(predicted, 2),
+            'lower_bound': np.round(np.where(lower > 0, lower, 0.0), 2),
+            'upper_bound': np.round(predicted + 2 * std_dev, 2),
+            'trend_factor': np.round(stats['trend'].to_numpy(), 2)
+        }, index=stats.index)
+        seasonality = round(month_factor * day_factor, 2)
+
+        frame = frame.reindex([item_id for item_id in items if item_id in frame.index])
+        for row in frame.itertuples():
+            predictions[row.Index] = InventoryPrediction(
+                predicted_demand=row.predicted_demand,
+                confidence_range=(row.lower_bound, row.upper_bound),
+                trend_factor=row.trend_factor,
+                seasonality_factor=seasonality
             )
-        
+
         return predictions
-    
+
+    def forecast_horizon(self,
+        history: pd.DataFrame,
+        items: Dict[str, InventoryItem],
+        start: datetime,
+        days: int,
+        locations: Optional[List[str]] = None
+    ) -> DemandCube:
+        """
+        Predice los próximos `days` días para todas las ubicaciones e items
+        en una sola llamada, difundiendo los factores de mes y día de la
+        semana sobre el vector de fechas
+        """
+        if locations is None:
+            locations = list(pd.unique(history['location']))
+        item_ids = list(items.keys())
+
+        data = history[
+            history['location'].isin(locations) & history['item_id'].isin(item_ids)
+        ]
+        stats = self.series_statistics(data, ['location', 'item_id'])
+
+        # Ubicar cada serie en la grilla (ubicación × item)
+        loc_pos = pd.Index(locations).get_indexer(stats.index.get_level_values('location'))
+        item_pos = pd.Index(item_ids).get_indexer(stats.index.get_level_values('item_id'))
+        grid = (len(locations), len(item_ids))
+        mean = np.full(grid, np.nan)
+        std = np.full(grid, np.nan)
+        trend = np.ones(grid)
+        observed = np.zeros(grid, dtype=bool)
+        mean[loc_pos, item_pos] = stats['mean'].to_numpy()
+        std[loc_pos, item_pos] = stats['std'].to_numpy()
+        trend[loc_pos, item_pos] = stats['trend'].to_numpy()
+        observed[loc_pos, item_pos] = True
+
+        dates = pd.date_range(pd.Timestamp(start).normalize(), periods=days, freq='D')
+        month_factor, day_factor = self.calendar_factors(dates.month.to_numpy(), dates.weekday.to_numpy())
+
+        # Mismo orden de operaciones que predict_demand: media × mes × día × tendencia
+        demand = (
+            mean[:, :, None] * month_factor[None, None, :]
+            * day_factor[None, None, :] * trend[:, :, None]
+        )
+
+        return DemandCube(
+            locations=locations,
+            item_ids=item_ids,
+            dates=dates,
+            demand=demand,
+            std=std,
+            trend=trend,
+            seasonality=month_factor * day_factor,
+            observed=observed
+        )
+
+    def series_statistics(self,
+        data: pd.DataFrame,
+        keys: List[str]
+    ) -> pd.DataFrame:
+        """Media, desviación y tendencia de todas las series en una sola pasada"""
+        groups = SeriesGroups(data, keys)
+        sales = groups.values('units_sold')
+
+        trend = np.ones(len(groups))
+        if (groups.counts >= 2).any():
+            days = groups.day_offsets()
+            trend = self._trend_from_sums(
+                groups.counts,
+                groups.sum(days),
+                groups.sum(sales),
+                groups.sum(days * sales),
+                groups.sum(days * days)
+            )
+
+        index = pd.MultiIndex.from_frame(groups.keys) if len(keys) > 1 else pd.Index(groups.keys[keys[0]])
+        return pd.DataFrame({
+            'mean': groups.mean(sales),
+            'std': groups.std(sales),
+            'trend': trend,
+            'observations': groups.counts
+        }, index=index)
+
+    def calculate_trends(self,
+        data: pd.DataFrame,
+        keys: List[str] = ['location', 'item_id']
+    ) -> pd.Series:
+        """Factor de tendencia por serie mediante mínimos cuadrados agrupados"""
+        return self.series_statistics(data, keys)['trend']
+
     def _calculate_trend(self, data: pd.DataFrame) -> float:
         if len(data) < 2:
             return 1.0
-            
-        dates = pd.to_datetime(data['date'])
-        sales = data['units_sold']
-        days = [(d - dates.min()).days for d in dates]
-        
-        if not days or not any(days):
-            return 1.0
-            
-        z = np.polyfit(days, sales, 1)
-        slope = z[0]
-        avg_sales = sales.mean()
-        
-        if avg_sales == 0:
-            return 1.0
-            
-        trend = 1 + (slope * 30 / avg_sales)
-        return max(0.5, min(trend, 1.5))
+
+        dates = pd.to_datetime(data['date']).to_numpy()
+        sales = data['units_sold'].to_numpy(dtype=np.float64)
+        days = (dates - dates.min()) / np.timedelta64(1, 'D')
+
+        trend = self._trend_from_sums(
+            np.array([len(days)]),
+            np.array([days.sum()]),
+            np.array([sales.sum()]),
+            np.array([(days * sales).sum()]),
+            np.array([(days * days).sum()])
+        )
+        return float(trend[0])
+
+    def calendar_factors(self, months: np.ndarray, weekdays: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Factores de mes (1-12) y de día de la semana (0-6) de cada fecha"""
+        month_table = np.array([self.seasonality_factors.get(m, 1.0) for m in range(13)])
+        day_table = np.array([self.day_factors.get(d, 1.0) for d in range(7)])
+        return month_table[months], day_table[weekdays]
+
+    def _trend_from_sums(self,
+        n: np.ndarray,
+        sum_x: np.ndarray,
+        sum_y: np.ndarray,
+        sum_xy: np.ndarray,
+        sum_xx: np.ndarray
+    ) -> np.ndarray:
+        """
+        Pendiente de mínimos cuadrados a partir de sumas por serie,
+        expresada como factor a 30 días y limitada a [0.5, 1.5]
+        """
+        n = np.asarray(n, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s_xx = sum_xx - sum_x * sum_x / n
+            s_xy = sum_xy - sum_x * sum_y / n
+            slope = s_xy / s_xx
+            avg_sales = sum_y / n
+            trend = 1 + (slope * 30 / avg_sales)
+
+        # Sin variación de fechas o sin ventas no hay tendencia
+        valid = (n >= 2) & (sum_xx > 0) & (s_xx > 0) & (avg_sales != 0)
+        return np.where(valid, np.clip(trend, 0.5, 1.5), 1.0)
 
     def get_tools(self) -> list[StructuredTool]:
         return [
@@ -76,4 +219,4 @@ class DemandPredictionTools:
                 name="predict_demand",
                 description="Predice demanda futura basada en datos históricos"
             )
-        ]
\ No newline at end of file
+        ]
@@ -0,0 +1,124 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+import pandas as pd
+from pydantic import BaseModel
+
+def history_fingerprint(data: pd.DataFrame, columns: Optional[List[str]] = None) -> str:
+    """Huella del contenido del historial (solo de las columnas que usa el modelo)"""
+    if columns is not None:
+        data = data[[c for c in columns if c in data.columns]]
+    hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+    digest = hashlib.blake2b(hashes.tobytes(), digest_size=16)
+    digest.update(repr(list(data.columns)).encode('utf-8'))
+    return digest.hexdigest()
+
+def _detached(value: Any) -> Any:
+    """Copia de los modelos (y diccionarios de modelos) para que nadie modifique lo guardado"""
+    if isinstance(value, BaseModel):
+        return value.model_copy()
+    if isinstance(value, dict):
+        return {key: _detached(item) for key, item in value.items()}
+    return value
+
+class ForecastCache:
+    """
+    Cache LRU con expiración para resultados de predicción. Guarda y
+    devuelve copias. Por motor y ubicación conserva los resultados de los
+    últimos `fingerprints_per_location` historiales distintos
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: Optional[float] = 3600,
+        fingerprints_per_location: int = 4
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.fingerprints_per_location = fingerprints_per_location
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._fingerprints: Dict[Tuple[str, str], 'OrderedDict[str, None]'] = {}
+        self._lock = threading.Lock()
+
+    def make_key(
+        self,
+        engine: str,
+        location: str,
+        items: Iterable[str],
+        target_date: datetime,
+        params: Hashable,
+        fingerprint: str
+    ) -> Tuple:
+        # Los modelos solo dependen del día, no de la hora
+        return (
+            engine,
+            location,
+            tuple(items),
+            pd.Timestamp(target_date).date(),
+            params,
+            fingerprint
+        )
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _detached(entry[1])
+
+    def put(self, key: Tuple, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            # Historiales recientes del motor y ubicación; el más antiguo se descarta
+            engine, location, fingerprint = key[0], key[1], key[-1]
+            recent = self._fingerprints.setdefault((engine, location), OrderedDict())
+            recent[fingerprint] = None
+            recent.move_to_end(fingerprint)
+            while len(recent) > max(self.fingerprints_per_location, 1):
+                previous, _ = recent.popitem(last=False)
+                stale = [
+                    k for k in self._entries
+                    if k[0] == engine and k[1] == location and k[-1] == previous
+                ]
+                for k in stale:
+                    del self._entries[k]
+
+            self._entries[key] = (time.monotonic(), _detached(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._fingerprints.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds
+
+# Cache compartido por PredictionTools y DemandPredictionTools dentro de un proceso
+default_forecast_cache = ForecastCache()
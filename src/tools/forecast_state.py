@@ -0,0 +1,219 @@
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from ..models.inventory_models import InventoryItem, InventoryPrediction
+from .demand_prediction_tools import DemandPredictionTools
+
+class ForecastState:
+    """
+    Estadísticos suficientes por (ubicación, item) para pronosticar sin
+    recorrer el historial: media/varianza de Welford y sumas de regresión,
+    opcionalmente con decaimiento exponencial diario
+    """
+
+    _ARRAYS = [
+        'count', 'weight', 'mean', 'm2',
+        'sum_x', 'sum_y', 'sum_xy', 'sum_xx', 'origin'
+    ]
+
+    def __init__(
+        self,
+        decay: float = 1.0,
+        tools: Optional[DemandPredictionTools] = None
+    ):
+        if not 0 < decay <= 1:
+            raise ValueError("decay debe estar en (0, 1]")
+        self.decay = decay
+        self.tools = tools or DemandPredictionTools()
+        self.locations = np.array([], dtype=str)
+        self.item_ids = np.array([], dtype=str)
+        self.last_date: Optional[np.datetime64] = None
+        self._index: Dict[Tuple[str, str], int] = {}
+        self.count = np.zeros(0)
+        self.weight = np.zeros(0)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.sum_x = np.zeros(0)
+        self.sum_y = np.zeros(0)
+        self.sum_xy = np.zeros(0)
+        self.sum_xx = np.zeros(0)
+        self.origin = np.array([], dtype='datetime64[D]')
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def update(self, data: pd.DataFrame) -> None:
+        """Incorpora nuevas filas (date, location, item_id, units_sold), día por día"""
+        if data is None or data.empty:
+            return
+
+        # Un solo ordenamiento por fecha; cada día es un tramo contiguo
+        dates = pd.to_datetime(data['date']).to_numpy().astype('datetime64[D]')
+        order = np.argsort(dates, kind='stable')
+        dates = dates[order]
+        locations = data['location'].to_numpy()[order]
+        item_ids = data['item_id'].to_numpy()[order]
+        sales = data['units_sold'].to_numpy(dtype=np.float64)[order]
+        days, starts = np.unique(dates, return_index=True)
+        ends = np.append(starts[1:], len(dates))
+        for day, start, end in zip(days, starts, ends):
+            self._update_day(locations[start:end], item_ids[start:end], sales[start:end], day)
+
+    def _update_day(
+        self,
+        locations: np.ndarray,
+        item_ids: np.ndarray,
+        y: np.ndarray,
+        day: np.datetime64
+    ) -> None:
+        # Avanzar el reloj: el estado previo pierde peso por cada día transcurrido
+        row_weight = 1.0
+        if self.last_date is None or day > self.last_date:
+            if self.last_date is not None and self.decay < 1:
+                factor = self.decay ** int((day - self.last_date) / np.timedelta64(1, 'D'))
+                for name in ['weight', 'm2', 'sum_x', 'sum_y', 'sum_xy', 'sum_xx']:
+                    getattr(self, name)[:] *= factor
+            self.last_date = day
+        elif self.decay < 1:
+            # Día atrasado: sus observaciones llegan ya decaídas
+            row_weight = self.decay ** int((self.last_date - day) / np.timedelta64(1, 'D'))
+
+        positions = self._positions(locations, item_ids, day)
+        w = np.full(len(y), row_weight)
+        x = (day - self.origin[positions]).astype(np.float64)
+        size = len(self._index)
+
+        # Agregados del lote por serie
+        batch_count = np.bincount(positions, minlength=size).astype(np.float64)
+        batch_weight = np.bincount(positions, weights=w, minlength=size)
+        touched = batch_weight > 0
+        batch_mean = np.zeros(size)
+        batch_mean[touched] = (
+            np.bincount(positions, weights=w * y, minlength=size)[touched] / batch_weight[touched]
+        )
+        batch_m2 = np.bincount(
+            positions, weights=w * (y - batch_mean[positions]) ** 2, minlength=size
+        )
+
+        # Fusión de Chan/Welford con pesos
+        total = self.weight + batch_weight
+        delta = batch_mean - self.mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = np.where(touched, batch_weight / total, 0.0)
+            self.m2 += np.where(touched, batch_m2 + delta ** 2 * self.weight * share, 0.0)
+        self.mean += delta * share
+        self.weight = total
+        self.count += batch_count
+
+        self.sum_x += np.bincount(positions, weights=w * x, minlength=size)
+        self.sum_y += np.bincount(positions, weights=w * y, minlength=size)
+        self.sum_xy += np.bincount(positions, weights=w * x * y, minlength=size)
+        self.sum_xx += np.bincount(positions, weights=w * x * x, minlength=size)
+
+    def _positions(
+        self,
+        locations: np.ndarray,
+        item_ids: np.ndarray,
+        day: np.datetime64
+    ) -> np.ndarray:
+        """Posición de cada (ubicación, item), creando las series nuevas"""
+        positions = np.empty(len(locations), dtype=np.intp)
+        new_keys: List[Tuple[str, str]] = []
+        for i, key in enumerate(zip(locations, item_ids)):
+            position = self._index.get(key)
+            if position is None:
+                position = len(self._index)
+                self._index[key] = position
+                new_keys.append(key)
+            positions[i] = position
+
+        if new_keys:
+            added = len(new_keys)
+            self.locations = np.append(self.locations, [k[0] for k in new_keys])
+            self.item_ids = np.append(self.item_ids, [k[1] for k in new_keys])
+            for name in self._ARRAYS:
+                if name == 'origin':
+                    self.origin = np.append(self.origin, np.full(added, day))
+                else:
+                    setattr(self, name, np.append(getattr(self, name), np.zeros(added)))
+        return positions
+
+    def statistics(self, location: Optional[str] = None) -> pd.DataFrame:
+        """Media, desviación y tendencia actuales, con el formato de series_statistics"""
+        mask = np.ones(len(self), dtype=bool) if location is None else self.locations == location
+        count = self.count[mask]
+        weight = self.weight[mask]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Con decaimiento el peso efectivo puede quedar en 1 o menos
+            std = np.where(weight > 1, np.sqrt(self.m2[mask] / (weight - 1)), 0.0)
+            # Reescalar los pesos a conteos: la pendiente es invariante a la escala
+            scale = count / weight
+        std[count < 2] = np.nan
+        trend = self.tools._trend_from_sums(
+            count,
+            self.sum_x[mask] * scale,
+            self.sum_y[mask] * scale,
+            self.sum_xy[mask] * scale,
+            self.sum_xx[mask] * scale
+        )
+
+        if location is None:
+            index = pd.MultiIndex.from_arrays(
+                [self.locations, self.item_ids], names=['location', 'item_id']
+            )
+        else:
+            index = pd.Index(self.item_ids[mask], name='item_id')
+        return pd.DataFrame({
+            'mean': self.mean[mask],
+            'std': std,
+            'trend': trend,
+            'observations': count.astype(np.int64)
+        }, index=index)
+
+    def predict_demand(
+        self,
+        items: Dict[str, InventoryItem],
+        target_date: datetime,
+        location: str
+    ) -> Dict[str, InventoryPrediction]:
+        """Predicciones de una ubicación sin volver a leer el historial"""
+        return self.tools.build_predictions(
+            self.statistics(location), items, target_date
+        )
+
+    def save(self, path: str) -> None:
+        """Guarda el estado en un archivo .npz"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        last_date = self.last_date if self.last_date is not None else np.datetime64('NaT', 'D')
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                decay=np.array(self.decay),
+                last_date=np.array(last_date, dtype='datetime64[D]'),
+                locations=self.locations.astype(str),
+                item_ids=self.item_ids.astype(str),
+                **{name: getattr(self, name) for name in self._ARRAYS}
+            )
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        tools: Optional[DemandPredictionTools] = None
+    ) -> 'ForecastState':
+        """Restaura un estado guardado con save()"""
+        with np.load(path, allow_pickle=False) as stored:
+            state = cls(decay=float(stored['decay']), tools=tools)
+            last_date = stored['last_date'][()]
+            state.last_date = None if np.isnat(last_date) else last_date
+            state.locations = stored['locations']
+            state.item_ids = stored['item_ids']
+            for name in cls._ARRAYS:
+                setattr(state, name, stored[name])
+        state._index = {
+            key: i for i, key in enumerate(zip(state.locations, state.item_ids))
+        }
+        return state
@@ -0,0 +1,308 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from ..models.inventory_models import InventoryItem, InventoryPrediction
+from .prediction_tools import PredictionTools
+
+class HierarchyStructure:
+    """
+    Jerarquía cadena → cantón → ubicación → item, más los cruces por item
+    (cadena × item, cantón × item). Cada hoja (ubicación, item) pertenece a un
+    único nodo de cada nivel, así que la matriz de agregación S se guarda como
+    un vector de códigos por nivel y se aplica con bincount
+    """
+
+    LEVELS = ('chain', 'canton', 'location', 'item', 'canton_item', 'location_item')
+
+    def __init__(
+        self,
+        locations: np.ndarray,
+        item_ids: np.ndarray,
+        cantons: Optional[Dict[str, str]] = None
+    ):
+        self.locations = np.asarray(locations, dtype=object)
+        self.item_ids = np.asarray(item_ids, dtype=object)
+        cantons = cantons or {}
+        self.cantons = np.array(
+            [cantons.get(location, str(location).split('_')[0]) for location in self.locations],
+            dtype=object
+        )
+
+        columns = {
+            'chain': [np.zeros(len(self.locations), dtype=np.int64)],
+            'canton': [self.cantons],
+            'location': [self.locations],
+            'item': [self.item_ids],
+            'canton_item': [self.cantons, self.item_ids],
+            'location_item': [self.locations, self.item_ids]
+        }
+        self.codes: Dict[str, np.ndarray] = {}
+        self.sizes: Dict[str, int] = {}
+        self.offsets: Dict[str, int] = {}
+        labels = []
+        offset = 0
+        for level in self.LEVELS:
+            index = pd.MultiIndex.from_arrays(columns[level])
+            codes, uniques = index.factorize()
+            self.codes[level] = codes
+            self.sizes[level] = len(uniques)
+            self.offsets[level] = offset
+            offset += len(uniques)
+
+            first = np.unique(codes, return_index=True)[1]
+            labels.append(pd.DataFrame({
+                'level': level,
+                'canton': self.cantons[first] if level not in ('chain', 'item') else None,
+                'location': self.locations[first] if level in ('location', 'location_item') else None,
+                'item_id': self.item_ids[first] if level in ('item', 'canton_item', 'location_item') else None
+            }, index=np.arange(len(first))))
+        self.nodes = pd.concat(labels, ignore_index=True)
+        self.leaf_counts = self.aggregate(np.ones(self.n_leaves))
+
+    @classmethod
+    def from_history(
+        cls,
+        history: pd.DataFrame,
+        cantons: Optional[Dict[str, str]] = None
+    ) -> 'HierarchyStructure':
+        """Hojas = pares (ubicación, item) observados en el historial"""
+        leaves = history[['location', 'item_id']].drop_duplicates()
+        return cls(leaves['location'].to_numpy(), leaves['item_id'].to_numpy(), cantons)
+
+    @property
+    def n_leaves(self) -> int:
+        return len(self.locations)
+
+    @property
+    def n_nodes(self) -> int:
+        return sum(self.sizes.values())
+
+    def node_codes(self, level: str) -> np.ndarray:
+        """Índice global (fila de S) del nodo de cada hoja en un nivel"""
+        return self.codes[level] + self.offsets[level]
+
+    def aggregate(self, leaf_values: np.ndarray) -> np.ndarray:
+        """S · x: suma de las hojas en cada nodo de todos los niveles"""
+        return np.concatenate([
+            np.bincount(self.codes[level], weights=leaf_values, minlength=self.sizes[level])
+            for level in self.LEVELS
+        ])
+
+    def transpose(self, node_values: np.ndarray) -> np.ndarray:
+        """Sᵀ · v: suma, para cada hoja, de los valores de sus nodos"""
+        result = np.zeros(self.n_leaves)
+        for level in self.LEVELS:
+            result += node_values[self.node_codes(level)]
+        return result
+
+    def to_dense(self) -> np.ndarray:
+        matrix = np.zeros((self.n_nodes, self.n_leaves))
+        leaves = np.arange(self.n_leaves)
+        for level in self.LEVELS:
+            matrix[self.node_codes(level), leaves] = 1.0
+        return matrix
+
+    def reconcile(
+        self,
+        base: np.ndarray,
+        weights: str = 'wls',
+        tol: float = 1e-10,
+        max_iter: int = 500,
+        non_negative: bool = False
+    ) -> np.ndarray:
+        """
+        Reconciliación por mínimos cuadrados: resuelve (SᵀΛS) x = SᵀΛ ŷ con
+        gradiente conjugado precondicionado (Jacobi) y devuelve S · x.
+        'wls' pondera cada nodo por 1 / número de hojas (escalado estructural),
+        'ols' usa pesos iguales. Con non_negative las hojas se restringen a
+        x >= 0 por conjunto activo: las hojas negativas se fijan en 0 y se
+        vuelve a resolver, liberando las fijadas cuyo gradiente pide subir
+        """
+        if weights == 'wls':
+            precision = 1.0 / self.leaf_counts
+        elif weights == 'ols':
+            precision = np.ones(self.n_nodes)
+        else:
+            raise ValueError(f"Ponderación desconocida: {weights}")
+
+        base = np.asarray(base, dtype=np.float64)
+        rhs = self.transpose(precision * base)
+        diagonal = self.transpose(precision)
+        threshold = tol * max(np.linalg.norm(rhs), 1.0)
+
+        def operator(x: np.ndarray) -> np.ndarray:
+            return self.transpose(precision * self.aggregate(x))
+
+        # Punto de partida: las predicciones base de las hojas
+        x = base[self.node_codes('location_item')].copy()
+        free = np.ones(self.n_leaves, dtype=bool)
+        if non_negative:
+            x = np.maximum(x, 0.0)
+        for _ in range(2 * self.n_leaves + 1):
+            x = self._solve(operator, rhs, diagonal, x, free, threshold, max_iter)
+            if not non_negative:
+                break
+            negative = free & (x < 0)
+            if negative.any():
+                x[negative] = 0.0
+                free &= ~negative
+                continue
+            # Condición de optimalidad: ninguna hoja fijada en 0 mejoraría al subir
+            gradient = operator(x) - rhs
+            release = ~free & (gradient < -threshold)
+            if not release.any():
+                break
+            free[np.argmin(np.where(release, gradient, np.inf))] = True
+
+        return self.aggregate(x)
+
+    def _solve(
+        self,
+        operator,
+        rhs: np.ndarray,
+        diagonal: np.ndarray,
+        x: np.ndarray,
+        free: np.ndarray,
+        threshold: float,
+        max_iter: int
+    ) -> np.ndarray:
+        """Gradiente conjugado sobre las hojas libres (las demás quedan fijas)"""
+        x = x.copy()
+        residual = (rhs - operator(x)) * free
+        z = residual / diagonal
+        direction = z.copy()
+        rz = residual @ z
+        for _ in range(max_iter):
+            if np.linalg.norm(residual) <= threshold:
+                break
+            product = operator(direction) * free
+            step = rz / (direction @ product)
+            x += step * direction
+            residual -= step * product
+            z = residual / diagonal
+            rz_next = residual @ z
+            direction = z + (rz_next / rz) * direction
+            rz = rz_next
+        return x
+
+class HierarchicalForecaster:
+    """
+    Modo jerárquico sobre PredictionTools: pronostica cada nodo con su serie
+    diaria agregada y reconcilia todos los niveles para que sumen, sin
+    demanda negativa en las hojas
+    """
+
+    def __init__(
+        self,
+        tools: Optional[PredictionTools] = None,
+        cantons: Optional[Dict[str, str]] = None
+    ):
+        self.tools = tools or PredictionTools()
+        self.cantons = cantons
+
+    def structure(self, history: pd.DataFrame) -> HierarchyStructure:
+        return HierarchyStructure.from_history(history, self.cantons)
+
+    def forecast(
+        self,
+        history: pd.DataFrame,
+        target_date: datetime,
+        weights: str = 'wls',
+        structure: Optional[HierarchyStructure] = None
+    ) -> pd.DataFrame:
+        """
+        Predicción base y reconciliada de todos los nodos
+        (columnas level, canton, location, item_id, base, reconciled,
+        adjustment = reconciled / base, trend_factor de la predicción base...)
+        """
+        if history is None or history.empty:
+            raise ValueError("Se requiere historical_data válido")
+        structure = structure or self.structure(history)
+
+        node_history = self._node_history(history, structure)
+        forecasts = self.tools.series_forecast(node_history, ['node'], target_date)
+        forecasts = forecasts.reindex(np.arange(structure.n_nodes))
+
+        base = forecasts['predicted_demand'].to_numpy(dtype=np.float64)
+        # Series sin tendencia calculable (primer valor nulo): media × estacionalidad
+        fallback = (forecasts['mean_sales'] * forecasts['seasonality_factor']).to_numpy()
+        base = np.where(np.isfinite(base), base, fallback)
+        base = np.nan_to_num(base)
+
+        result = structure.nodes.copy()
+        result['base'] = base
+        result['reconciled'] = structure.reconcile(base, weights=weights, non_negative=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result['adjustment'] = np.where(base > 0, result['reconciled'] / base, 1.0)
+        result['trend_factor'] = forecasts['trend_factor'].fillna(1.0).to_numpy()
+        result['lower_bound'] = forecasts['lower_bound'].to_numpy()
+        result['upper_bound'] = forecasts['upper_bound'].to_numpy()
+        result['observations'] = forecasts['observations'].to_numpy()
+        return result
+
+    def location_predictions(
+        self,
+        history: pd.DataFrame,
+        items: Dict[str, InventoryItem],
+        target_date: datetime,
+        weights: str = 'wls'
+    ) -> Dict[str, Dict[str, InventoryPrediction]]:
+        """
+        Predicciones reconciliadas por ubicación con el formato de
+        predict_demand; el intervalo se desplaza con el ajuste de la media y
+        trend_factor es el de la predicción base de la hoja
+        """
+        history = history[history['item_id'].isin(list(items.keys()))]
+        frame = self.forecast(history, target_date, weights=weights)
+        leaves = frame[frame['level'] == 'location_item']
+        shift = leaves['reconciled'] - leaves['base']
+        lower = np.maximum(leaves['lower_bound'] + shift, 0.0)
+        upper = np.maximum(leaves['upper_bound'] + shift, 0.0)
+        seasonal_factor = self.tools.seasonal_factors.get(target_date.month, 1.0)
+
+        results: Dict[str, Dict[str, InventoryPrediction]] = {}
+        for location, item_id, reconciled, trend, low, high in zip(
+            leaves['location'], leaves['item_id'], leaves['reconciled'],
+            leaves['trend_factor'], lower, upper
+        ):
+            results.setdefault(location, {})[item_id] = InventoryPrediction(
+                predicted_demand=round(reconciled, 2),
+                confidence_range=(round(low, 2), round(high, 2)),
+                trend_factor=trend,
+                seasonality_factor=seasonal_factor
+            )
+        return results
+
+    def _node_history(
+        self,
+        history: pd.DataFrame,
+        structure: HierarchyStructure
+    ) -> pd.DataFrame:
+        """Totales diarios de cada nodo (node, date, units_sold) en formato largo"""
+        leaf_index = pd.MultiIndex.from_arrays([structure.locations, structure.item_ids])
+        leaf = leaf_index.get_indexer(pd.MultiIndex.from_frame(history[['location', 'item_id']]))
+        known = leaf >= 0
+        dates = pd.to_datetime(history['date']).to_numpy().astype('datetime64[D]')[known]
+        sales = history['units_sold'].to_numpy(dtype=np.float64)[known]
+        leaf = leaf[known]
+
+        first_day = dates.min()
+        day = (dates - first_day).astype(np.int64)
+        span = int(day.max()) + 1
+
+        nodes: List[np.ndarray] = []
+        days: List[np.ndarray] = []
+        totals: List[np.ndarray] = []
+        for level in structure.LEVELS:
+            keys = structure.node_codes(level)[leaf].astype(np.int64) * span + day
+            unique_keys, inverse = np.unique(keys, return_inverse=True)
+            nodes.append(unique_keys // span)
+            days.append(unique_keys % span)
+            totals.append(np.bincount(inverse, weights=sales))
+
+        return pd.DataFrame({
+            'node': np.concatenate(nodes),
+            'date': first_day + np.concatenate(days).astype('timedelta64[D]'),
+            'units_sold': np.concatenate(totals)
+        })
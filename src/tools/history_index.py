@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+class HistoryIndex:
+    """
+    Historial ordenado una sola vez por (ubicación, fecha) con los rangos de
+    filas de cada ubicación. Las consultas por ubicación y ventana de fechas
+    son búsquedas binarias que devuelven cortes contiguos del mismo DataFrame
+    (sin copiar: tratarlos como de solo lectura)
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        location_column: str = 'location',
+        date_column: str = 'date'
+    ):
+        dates = pd.to_datetime(data[date_column]).to_numpy()
+        codes, uniques = pd.factorize(data[location_column])
+        order = np.lexsort((dates, codes))
+        # Las filas sin ubicación (código -1) quedan al principio y fuera del índice
+        self.data = data.iloc[order]
+        self.dates = dates[order]
+        sorted_codes = codes[order]
+
+        counts = np.bincount(sorted_codes[sorted_codes >= 0], minlength=len(uniques))
+        starts = np.searchsorted(sorted_codes, np.arange(len(uniques)), side='left')
+        self.offsets: Dict[str, Tuple[int, int]] = {
+            location: (int(start), int(start + count))
+            for location, start, count in zip(uniques, starts, counts)
+        }
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def locations(self) -> List[str]:
+        return list(self.offsets)
+
+    def bounds(
+        self,
+        location: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Tuple[int, int]:
+        """Rango [inicio, fin) de las filas de la ubicación con start <= fecha <= end"""
+        start, end = self.offsets.get(location, (0, 0))
+        dates = self.dates[start:end]
+        low = start + (
+            np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date)), side='left')
+            if start_date is not None else 0
+        )
+        high = start + (
+            np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date)), side='right')
+            if end_date is not None else len(dates)
+        )
+        return int(low), int(max(low, high))
+
+    def slice(
+        self,
+        location: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        low, high = self.bounds(location, start_date, end_date)
+        return self.data.iloc[low:high]
@@ -0,0 +1,148 @@
+from typing import Dict, Iterable, List, Optional, Set
+from ..models.inventory_models import (
+    InventoryItem,
+    InventoryPrediction,
+    LocationRecommendation,
+    OrderRecommendation,
+    TransferOption
+)
+from .multi_location_tools import MultiLocationTools, SOLVERS
+from .planning_state import PlanningState
+
+class IncrementalPlanner:
+    """
+    Plan multi-local que se mantiene al día con cambios de stock o de
+    previsión. Cada item es un subproblema independiente (su columna del
+    estado), así que un cambio en (local, item) solo obliga a replanificar ese
+    item. El índice de dependencias guarda, por item, los locales cuyo plan lo
+    incluye: solo se reconstruyen las recomendaciones de esos locales y de los
+    que entran en el nuevo plan del item. Un local o item nuevo en el stock
+    cambia la forma del estado y provoca un plan completo
+    """
+
+    def __init__(self, tools: Optional[MultiLocationTools] = None, solver: str = 'greedy'):
+        if solver not in SOLVERS:
+            raise ValueError(f"Solver desconocido: {solver}")
+        self.tools = tools or MultiLocationTools()
+        self.solver = solver
+        self.state: Optional[PlanningState] = None
+        self.recommendations: Dict[str, LocationRecommendation] = {}
+        # Items replanificados y locales reconstruidos en la última actualización
+        self.last_replanned: List[str] = []
+        self.last_rebuilt: List[str] = []
+        self._inventory: Dict[str, Dict[str, float]] = {}
+        self._predictions: Dict[str, Dict[str, InventoryPrediction]] = {}
+        self._items: Dict[str, InventoryItem] = {}
+        self._orders: Dict[str, Dict[str, OrderRecommendation]] = {}
+        self._transfers: Dict[str, Dict[str, TransferOption]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+
+    def plan(
+        self,
+        locations_inventory: Dict[str, Dict[str, float]],
+        demand_predictions: Dict[str, Dict[str, InventoryPrediction]],
+        items: Dict[str, InventoryItem]
+    ) -> Dict[str, LocationRecommendation]:
+        """Plan completo; reinicia el estado y el índice de dependencias"""
+        self._inventory = {location: dict(inventory) for location, inventory in locations_inventory.items()}
+        self._predictions = {location: dict(predictions) for location, predictions in demand_predictions.items()}
+        self._items = dict(items)
+        self.state = PlanningState.from_inputs(self._inventory, self._predictions, self._items)
+        self._orders = {location: {} for location in self.state.locations}
+        self._transfers = {location: {} for location in self.state.locations}
+        self._dependents = {item_id: set() for item_id in self.state.item_ids}
+        self.recommendations = {}
+        self._replan(self.state.item_ids)
+        return self.recommendations
+
+    def update_stock(self, location: str, item_id: str, quantity: float) -> Dict[str, LocationRecommendation]:
+        """Stock contado de un item en un local (por ejemplo, un recuento a media jornada)"""
+        return self.apply(stock={location: {item_id: quantity}})
+
+    def update_forecast(
+        self,
+        location: str,
+        item_id: str,
+        prediction: InventoryPrediction
+    ) -> Dict[str, LocationRecommendation]:
+        return self.apply(forecasts={location: {item_id: prediction}})
+
+    def apply(
+        self,
+        stock: Optional[Dict[str, Dict[str, float]]] = None,
+        forecasts: Optional[Dict[str, Dict[str, InventoryPrediction]]] = None
+    ) -> Dict[str, LocationRecommendation]:
+        """
+        Aplica un lote de cambios de stock y de previsión y replanifica una sola
+        vez cada item afectado
+        """
+        if self.state is None:
+            raise RuntimeError("No hay plan: llamar antes a plan()")
+        stock = stock or {}
+        forecasts = forecasts or {}
+        # Igual que PlanningState.from_inputs: todo item en stock necesita su predicción
+        for location, inventory in stock.items():
+            for item_id in inventory:
+                if item_id not in forecasts.get(location, {}) and item_id not in self._predictions.get(location, {}):
+                    raise KeyError(f"Sin predicción de demanda para {item_id} en {location}")
+        for location, inventory in stock.items():
+            self._inventory.setdefault(location, {}).update(inventory)
+        for location, predictions in forecasts.items():
+            self._predictions.setdefault(location, {}).update(predictions)
+
+        state = self.state
+        if any(
+            location not in state.row or any(item_id not in state.column for item_id in inventory)
+            for location, inventory in stock.items()
+        ):
+            return self.plan(self._inventory, self._predictions, self._items)
+
+        changed: Dict[str, None] = {}
+        for location, inventory in stock.items():
+            for item_id, quantity in inventory.items():
+                state.set_stock(location, item_id, quantity)
+                changed[item_id] = None
+        for location, predictions in forecasts.items():
+            for item_id, prediction in predictions.items():
+                # Previsiones de locales o items fuera del inventario no intervienen en el plan
+                if location in state.row and item_id in state.column:
+                    state.set_prediction(location, item_id, prediction.predicted_demand)
+                    changed[item_id] = None
+        return self._replan(list(changed))
+
+    def _replan(self, item_ids: Iterable[str]) -> Dict[str, LocationRecommendation]:
+        state = self.state
+        item_ids = list(item_ids)
+        plans = self.tools.plan_items(state, [state.column[item_id] for item_id in item_ids], self.solver)
+
+        affected: Set[str] = set()
+        for item_id, (orders, transfers) in plans.items():
+            previous = self._dependents[item_id]
+            for location in previous:
+                self._orders[location].pop(item_id, None)
+                self._transfers[location].pop(item_id, None)
+            for location, order in orders.items():
+                self._orders[location][item_id] = order
+            for location, transfer in transfers.items():
+                self._transfers[location][item_id] = transfer
+            current = set(orders) | set(transfers)
+            self._dependents[item_id] = current
+            affected |= previous | current
+
+        # Locales sin recomendación todavía (plan completo) o cuyo plan cambió
+        rebuilt = [
+            location for location in state.locations
+            if location in affected or location not in self.recommendations
+        ]
+        recommendations = dict(self.recommendations)
+        for location in rebuilt:
+            # Los pedidos y transferencias ya están validados
+            recommendations[location] = LocationRecommendation.model_construct(
+                new_orders=dict(self._orders[location]),
+                transfers_in=dict(self._transfers[location]),
+                transfers_out={}
+            )
+        self.recommendations = recommendations
+        self.last_replanned = item_ids
+        self.last_rebuilt = rebuilt
+        return recommendations
@@ -0,0 +1,33 @@
+from typing import Dict, Tuple
+import pandas as pd
+from .parallel_forecast import partition_by_location
+
+class LocationPartition:
+    """Una fuente ordenada una vez por ubicación; cada vista es un corte contiguo"""
+
+    def __init__(self, data: pd.DataFrame):
+        self.data, self.offsets = partition_by_location(data)
+
+    def view(self, location: str) -> pd.DataFrame:
+        start, end = self.offsets.get(location, (0, 0))
+        return self.data.iloc[start:end]
+
+class SourcePartitions:
+    """
+    Particiones perezosas por ubicación de todas las fuentes cargadas
+    ({grupo: {fuente: DataFrame}}): cada fuente se agrupa la primera vez
+    que se pide y después cada ubicación cuesta un corte sin copia
+    """
+
+    def __init__(self, data: Dict[str, Dict[str, pd.DataFrame]]):
+        self.data = data
+        self._partitions: Dict[Tuple[str, str], LocationPartition] = {}
+
+    def partition(self, group: str, source: str) -> LocationPartition:
+        key = (group, source)
+        if key not in self._partitions:
+            self._partitions[key] = LocationPartition(self.data[group][source])
+        return self._partitions[key]
+
+    def view(self, group: str, source: str, location: str) -> pd.DataFrame:
+        return self.partition(group, source).view(location)
@@ -0,0 +1,371 @@
+import os
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from ..models.inventory_models import InventoryItem, InventoryPrediction
+from .series_stats import SeriesGroups
+from .demand_prediction_tools import DemandPredictionTools
+from .smoothing_tools import ExponentialSmoothingTools, SmoothingStates, SEASON
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 3
+KEYS = ['location', 'item_id']
+
+class ModelRegistry:
+    """
+    Parámetros ajustados por (ubicación, item, motor) persistidos en disco.
+    Cada serie guarda una huella de su historial y una versión; refresh()
+    solo vuelve a ajustar las series cuyo historial cambió; las que solo
+    recibieron días nuevos continúan desde su estado guardado (estados de
+    Holt-Winters o sumas suficientes de media, varianza y tendencia)
+    """
+
+    ENGINES = ('demand', 'holt_winters')
+    _PARAMETERS = {
+        'demand': [
+            'mean', 'std', 'trend', 'observations',
+            'm2', 'sum_x', 'sum_y', 'sum_xy', 'sum_xx', 'origin'
+        ],
+        'holt_winters': [
+            'level', 'trend', 'season', 'alpha', 'beta', 'gamma', 'sse', 'observations', 'step'
+        ]
+    }
+
+    def __init__(
+        self,
+        path: str = 'data/models',
+        engine: str = 'demand',
+        demand_tools: Optional[DemandPredictionTools] = None,
+        smoothing_tools: Optional[ExponentialSmoothingTools] = None
+    ):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Motor de predicción desconocido: {engine}")
+        self.path = path
+        self.engine = engine
+        self.demand_tools = demand_tools or DemandPredictionTools()
+        self.smoothing_tools = smoothing_tools or ExponentialSmoothingTools()
+        self.version = 0
+        self.updated_at: Optional[str] = None
+        self._reset()
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    @property
+    def arrays_path(self) -> str:
+        return os.path.join(self.path, f'{self.engine}.npz')
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.path, 'registry.json')
+
+    def _reset(self) -> None:
+        self.locations = np.array([], dtype=object)
+        self.item_ids = np.array([], dtype=object)
+        self.fingerprints = np.zeros(0, dtype=np.uint64)
+        self.rows = np.zeros(0, dtype=np.int64)
+        self.end = np.array([], dtype='datetime64[D]')
+        self.versions = np.zeros(0, dtype=np.int64)
+        self.parameters: Dict[str, np.ndarray] = {
+            name: np.zeros((0, SEASON)) if name == 'season' else np.zeros(0)
+            for name in self._PARAMETERS[self.engine]
+        }
+        self._index = pd.MultiIndex.from_arrays([self.locations, self.item_ids], names=KEYS)
+
+    def _engine_settings(self) -> Dict:
+        # Si cambia la configuración del motor, lo guardado deja de ser válido
+        if self.engine == 'holt_winters':
+            tools = self.smoothing_tools
+            return {'alphas': list(tools.alphas), 'betas': list(tools.betas), 'gammas': list(tools.gammas)}
+        return {}
+
+    def load(self) -> bool:
+        """Carga en caliente el registro guardado, si es compatible"""
+        if not (os.path.exists(self.meta_path) and os.path.exists(self.arrays_path)):
+            return False
+        with open(self.meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        entry = meta.get('engines', {}).get(self.engine)
+        if (
+            meta.get('format') != FORMAT_VERSION
+            or entry is None
+            or entry.get('settings') != self._engine_settings()
+        ):
+            logger.info(f"Registro de modelos incompatible para {self.engine}, se ajustará de nuevo")
+            return False
+
+        with np.load(self.arrays_path, allow_pickle=False) as stored:
+            self.locations = stored['locations'].astype(object)
+            self.item_ids = stored['item_ids'].astype(object)
+            self.fingerprints = stored['fingerprints']
+            self.rows = stored['rows']
+            self.end = stored['end']
+            self.versions = stored['versions']
+            self.parameters = {name: stored[name] for name in self._PARAMETERS[self.engine]}
+        self._index = pd.MultiIndex.from_arrays([self.locations, self.item_ids], names=KEYS)
+        self.version = entry.get('version', 0)
+        self.updated_at = entry.get('updated_at')
+        return True
+
+    def save(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        self.version += 1
+        self.updated_at = datetime.now().isoformat(timespec='seconds')
+        with open(self.arrays_path, 'wb') as f:
+            np.savez(
+                f,
+                locations=self.locations.astype(str),
+                item_ids=self.item_ids.astype(str),
+                fingerprints=self.fingerprints,
+                rows=self.rows,
+                end=self.end,
+                versions=self.versions,
+                **self.parameters
+            )
+
+        meta = {'format': FORMAT_VERSION, 'engines': {}}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        meta['format'] = FORMAT_VERSION
+        meta.setdefault('engines', {})[self.engine] = {
+            'version': self.version,
+            'updated_at': self.updated_at,
+            'series': len(self),
+            'settings': self._engine_settings()
+        }
+        with open(self.meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+    def refresh(self, history: pd.DataFrame, save: bool = True) -> Dict[str, int]:
+        """
+        Sincroniza el registro con el historial y devuelve cuántas series
+        quedaron sin cambios, se continuaron con días nuevos, se reajustaron o
+        se eliminaron por no aparecer en el historial
+        """
+        summary = {'unchanged': 0, 'appended': 0, 'refit': 0, 'removed': 0}
+        if history is None or history.empty:
+            return summary
+
+        groups = SeriesGroups(history, KEYS)
+        dates = groups.dates.astype('datetime64[D]')
+        sales = groups.values('units_sold')
+        keys = pd.MultiIndex.from_frame(groups.keys)
+        positions = self._index.get_indexer(keys)
+        known = positions >= 0
+
+        # Las series que ya no están en el historial no deben seguir prediciendo
+        stale = np.ones(len(self), dtype=bool)
+        stale[positions[known]] = False
+        summary['removed'] = int(stale.sum())
+        if stale.any():
+            self._select(np.flatnonzero(~stale))
+            positions = self._index.get_indexer(keys)
+
+        # Huella de cada serie: suma (módulo 2^64) de los hashes de sus filas
+        hashes = pd.util.hash_pandas_object(
+            pd.DataFrame({'date': dates.astype(np.int64), 'units_sold': sales}), index=False
+        ).to_numpy()
+        fingerprints = np.add.reduceat(hashes, groups.starts)
+
+        # Huella de la parte ya registrada (hasta el último día guardado)
+        lookup = np.maximum(positions, 0)
+        if len(self):
+            stored_end = np.where(known, self.end[lookup], np.datetime64('NaT', 'D'))
+            stored_fingerprints = self.fingerprints[lookup]
+            stored_rows = np.where(known, self.rows[lookup], -1)
+        else:
+            stored_end = np.full(len(groups), np.datetime64('NaT', 'D'))
+            stored_fingerprints = np.zeros(len(groups), dtype=np.uint64)
+            stored_rows = np.full(len(groups), -1)
+        previous = dates <= stored_end[groups.codes]
+        prefix = np.add.reduceat(np.where(previous, hashes, np.uint64(0)), groups.starts)
+        prefix_rows = np.add.reduceat(previous.astype(np.int64), groups.starts)
+
+        unchanged = known & (fingerprints == stored_fingerprints) & (groups.counts == stored_rows)
+        appended = (
+            known & ~unchanged
+            & (prefix == stored_fingerprints) & (prefix_rows == stored_rows)
+        )
+        refit = ~unchanged & ~appended
+
+        summary['unchanged'] = int(unchanged.sum())
+        summary['appended'] = int(appended.sum())
+        summary['refit'] = int(refit.sum())
+        if not (appended.any() or refit.any()):
+            if stale.any() and save:
+                self.save()
+            return summary
+
+        # Las series nuevas se agregan al final del registro
+        new = ~known
+        if new.any():
+            self._grow(groups.keys[new])
+            positions[new] = self._index.get_indexer(pd.MultiIndex.from_frame(groups.keys[new]))
+
+        row_series = groups.codes
+        if refit.any():
+            rows = groups.rows[refit[row_series]]
+            self._store_fit(history.iloc[rows], positions[refit])
+        if appended.any():
+            delta = appended[row_series] & ~previous
+            self._store_resume(history.iloc[groups.rows[delta]], positions[appended])
+
+        touched = appended | refit
+        self.fingerprints[positions[touched]] = fingerprints[touched]
+        self.rows[positions[touched]] = groups.counts[touched]
+        self.end[positions[touched]] = dates[groups.ends[touched]]
+        self.versions[positions[touched]] += 1
+
+        if save:
+            self.save()
+        return summary
+
+    def _select(self, positions: np.ndarray) -> None:
+        """Conserva solo las series de las posiciones dadas"""
+        self.locations = self.locations[positions]
+        self.item_ids = self.item_ids[positions]
+        self.fingerprints = self.fingerprints[positions]
+        self.rows = self.rows[positions]
+        self.end = self.end[positions]
+        self.versions = self.versions[positions]
+        self.parameters = {name: values[positions] for name, values in self.parameters.items()}
+        self._index = pd.MultiIndex.from_arrays([self.locations, self.item_ids], names=KEYS)
+
+    def _grow(self, keys: pd.DataFrame) -> None:
+        added = len(keys)
+        self.locations = np.append(self.locations, keys['location'].to_numpy(dtype=object))
+        self.item_ids = np.append(self.item_ids, keys['item_id'].to_numpy(dtype=object))
+        self.fingerprints = np.append(self.fingerprints, np.zeros(added, dtype=np.uint64))
+        self.rows = np.append(self.rows, np.zeros(added, dtype=np.int64))
+        self.end = np.append(self.end, np.full(added, np.datetime64('NaT', 'D')))
+        self.versions = np.append(self.versions, np.zeros(added, dtype=np.int64))
+        for name, values in self.parameters.items():
+            shape = (added, SEASON) if name == 'season' else (added,)
+            self.parameters[name] = np.concatenate([values, np.zeros(shape)])
+        self._index = pd.MultiIndex.from_arrays([self.locations, self.item_ids], names=KEYS)
+
+    def _positions_of(self, keys: pd.DataFrame) -> np.ndarray:
+        return self._index.get_indexer(pd.MultiIndex.from_frame(keys[KEYS]))
+
+    def _store_fit(self, data: pd.DataFrame, positions: np.ndarray) -> None:
+        if self.engine == 'demand':
+            stats = self.demand_tools.series_statistics(data, KEYS)
+            target = self._positions_of(stats.index.to_frame(index=False))
+            for name in ['mean', 'std', 'trend', 'observations']:
+                self.parameters[name][target] = stats[name].to_numpy(dtype=np.float64)
+
+            # Sumas suficientes para continuar la serie con días nuevos
+            groups = SeriesGroups(data, KEYS)
+            target = self._positions_of(groups.keys)
+            sales = groups.values('units_sold')
+            days = groups.day_offsets()
+            mean = groups.mean(sales)
+            origin = groups.first(groups.dates).astype('datetime64[D]')
+            self.parameters['m2'][target] = groups.sum((sales - mean[groups.codes]) ** 2)
+            self.parameters['sum_x'][target] = groups.sum(days)
+            self.parameters['sum_y'][target] = groups.sum(sales)
+            self.parameters['sum_xy'][target] = groups.sum(days * sales)
+            self.parameters['sum_xx'][target] = groups.sum(days * days)
+            self.parameters['origin'][target] = origin.astype(np.int64).astype(np.float64)
+            return
+
+        states = self.smoothing_tools.fit(data, KEYS)
+        self._store_states(states)
+
+    def _store_resume(self, data: pd.DataFrame, positions: np.ndarray) -> None:
+        if self.engine == 'demand':
+            self._resume_demand(data)
+            return
+        states = self.smoothing_tools.resume(self.states(positions), data, KEYS)
+        self._store_states(states)
+
+    def _resume_demand(self, data: pd.DataFrame) -> None:
+        """Combina las estadísticas guardadas con las de los días nuevos (Chan et al.)"""
+        groups = SeriesGroups(data, KEYS)
+        target = self._positions_of(groups.keys)
+        p = self.parameters
+        sales = groups.values('units_sold')
+        origin = p['origin'][target].astype(np.int64).astype('datetime64[D]')
+        days = (groups.dates.astype('datetime64[D]') - origin[groups.codes]) / np.timedelta64(1, 'D')
+
+        count_a = p['observations'][target]
+        count_b = groups.counts.astype(np.float64)
+        count = count_a + count_b
+        mean_b = groups.mean(sales)
+        delta = mean_b - p['mean'][target]
+        m2 = (
+            p['m2'][target] + groups.sum((sales - mean_b[groups.codes]) ** 2)
+            + delta * delta * count_a * count_b / count
+        )
+        for name, values in [
+            ('sum_x', days), ('sum_y', sales), ('sum_xy', days * sales), ('sum_xx', days * days)
+        ]:
+            p[name][target] += groups.sum(values)
+
+        p['mean'][target] += delta * count_b / count
+        p['m2'][target] = m2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p['std'][target] = np.where(count > 1, np.sqrt(m2 / (count - 1)), np.nan)
+        p['trend'][target] = self.demand_tools._trend_from_sums(
+            count, p['sum_x'][target], p['sum_y'][target], p['sum_xy'][target], p['sum_xx'][target]
+        )
+        p['observations'][target] = count
+
+    def _store_states(self, states: SmoothingStates) -> None:
+        target = self._positions_of(states.keys)
+        for name in self._PARAMETERS['holt_winters']:
+            self.parameters[name][target] = getattr(states, name)
+
+    def states(self, positions: Optional[np.ndarray] = None) -> SmoothingStates:
+        """Estados de Holt-Winters guardados (todos o solo las posiciones dadas)"""
+        if self.engine != 'holt_winters':
+            raise ValueError("states() requiere el motor 'holt_winters'")
+        if positions is None:
+            positions = np.arange(len(self))
+        values = {name: self.parameters[name][positions] for name in self._PARAMETERS['holt_winters']}
+        return SmoothingStates(
+            keys=pd.DataFrame({
+                'location': self.locations[positions],
+                'item_id': self.item_ids[positions]
+            }),
+            end=self.end[positions],
+            **values
+        )
+
+    def predict_demand(
+        self,
+        items: Dict[str, InventoryItem],
+        target_date: datetime,
+        location: str
+    ) -> Dict[str, InventoryPrediction]:
+        """Predicciones de una ubicación con los parámetros registrados, sin reajustar"""
+        positions = np.flatnonzero(self.locations == location)
+
+        if self.engine == 'demand':
+            stats = pd.DataFrame(
+                {name: self.parameters[name][positions] for name in ['mean', 'std', 'trend', 'observations']},
+                index=pd.Index(self.item_ids[positions], name='item_id')
+            )
+            return self.demand_tools.build_predictions(stats, items, target_date)
+
+        states = self.states(positions)
+        states.keys = states.keys[['item_id']]
+        frame = states.forecast(target_date)
+        predictions = {}
+        for item_id in items:
+            if item_id not in frame.index:
+                continue
+            row = frame.loc[item_id]
+            predictions[item_id] = InventoryPrediction(
+                predicted_demand=row['predicted_demand'],
+                confidence_range=(row['lower_bound'], row['upper_bound']),
+                trend_factor=row['trend_factor'],
+                seasonality_factor=row['seasonality_factor']
+            )
+        return predictions
@@ -1,5 +1,6 @@
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
+import numpy as np
 from langchain.tools import StructuredTool
 from ..models.inventory_models import (
     InventoryItem,
@@ -8,70 +9,261 @@ from ..models.inventory_models import (
     OrderRecommendation,
     InventoryPrediction
 )
+from .recipe_tools import RecipeTools
+from .transport_flow import solve_transportation
+from .transfer_network import TransferNetwork
+from .planning_state import PlanningState
+
+SOLVERS = ('greedy', 'flow')
+
+# Umbral del modo voraz: una transferencia se acepta si cuesta menos que 1.2 veces el pedido
+ORDER_PREMIUM = 1.2
+TRANSFER_GOODS_FACTOR = 0.8
+
+# Plan de un item: pedidos y transferencia entrante por local
+ItemPlan = Tuple[Dict[str, OrderRecommendation], Dict[str, TransferOption]]
 
 class MultiLocationTools:
-    def __init__(self):
-        self.transfer_costs = {
-            ('Zurich', 'Geneva'): 120,
-            ('Zurich', 'Basel'): 100,
-            ('Geneva', 'Basel'): 150,
-        }
+    def __init__(self, network: Optional[TransferNetwork] = None):
+        # Costes de transferencia desde transfer_network en config.yaml
+        self.network = network or TransferNetwork.load()
         self.min_transfer_value = 500
 
     def optimize_orders(self,
         locations_inventory: Dict[str, Dict[str, float]],
         demand_predictions: Dict[str, Dict[str, InventoryPrediction]],
-        items: Dict[str, InventoryItem]
+        items: Dict[str, InventoryItem],
+        solver: str = 'greedy'
     ) -> Dict[str, LocationRecommendation]:
-        recommendations = {}
-        
-        for location, inventory in locations_inventory.items():
-            new_orders = {}
-            transfers_in = {}
-            transfers_out = {}
-            
-            for item_id, current_stock in inventory.items():
-                item = items[item_id]
-                predicted_demand = demand_predictions[location][item_id].predicted_demand
-                
-                days_coverage = current_stock / (predicted_demand + 0.0001)
-                needed_quantity = max(0,
-                    item.reorder_point - current_stock +
-                    predicted_demand * item.lead_time_days
-                )
-                
-                if needed_quantity > 0:
-                    transfer_options = self._find_transfer_options(
-                        item_id, needed_quantity, location,
-                        locations_inventory, demand_predictions, item
-                    )
-                    
-                    if transfer_options:
-                        best_transfer = min(
-                            transfer_options,
-                            key=lambda x: x.total_cost
-                        )
-                        
-                        if best_transfer.total_cost < needed_quantity * item.cost_per_unit * 1.2:
-                            transfers_in[item_id] = best_transfer
-                            continue
-                    
-                    new_orders[item_id] = OrderRecommendation(
-                        item_id=item_id,
-                        quantity=needed_quantity,
-                        priority='high' if days_coverage < item.lead_time_days else 'medium',
-                        reason=f"Stock coverage: {days_coverage:.1f} days",
-                        estimated_cost=needed_quantity * item.cost_per_unit,
-                        suggested_order_date=datetime.now()
-                    )
-            
-            recommendations[location] = LocationRecommendation(
-                new_orders=new_orders,
-                transfers_in=transfers_in,
-                transfers_out=transfers_out
+        if solver not in SOLVERS:
+            raise ValueError(f"Solver desconocido: {solver}")
+        state = PlanningState.from_inputs(locations_inventory, demand_predictions, items)
+        return self.optimize_state(state, solver)
+
+    def optimize_state(self, state: PlanningState, solver: str = 'greedy') -> Dict[str, LocationRecommendation]:
+        """Plan completo de un estado de planificación ya construido"""
+        plans = self.plan_items(state, range(len(state.item_ids)), solver)
+        new_orders: Dict[str, Dict[str, OrderRecommendation]] = {location: {} for location in state.locations}
+        transfers_in: Dict[str, Dict[str, TransferOption]] = {location: {} for location in state.locations}
+        for item_id, (orders, transfers) in plans.items():
+            for location, order in orders.items():
+                new_orders[location][item_id] = order
+            for location, transfer in transfers.items():
+                transfers_in[location][item_id] = transfer
+        return {
+            location: LocationRecommendation(
+                new_orders=new_orders[location],
+                transfers_in=transfers_in[location],
+                transfers_out={}
             )
-        
-        return recommendations
+            for location in state.locations
+        }
+
+    def plan_items(
+        self,
+        state: PlanningState,
+        columns: Iterable[int],
+        solver: str = 'greedy'
+    ) -> Dict[str, ItemPlan]:
+        """
+        Plan de cada item indicado (columna del estado): pedidos y
+        transferencias por local. Los items son subproblemas independientes
+        """
+        if solver not in SOLVERS:
+            raise ValueError(f"Solver desconocido: {solver}")
+        columns = np.asarray(list(columns), dtype=np.intp)
+        needed, excess, coverage = state.metrics(columns)
+        base_costs = self.network.matrix(state.locations)
+        multipliers = self.network.multipliers([state.items[state.item_ids[column]] for column in columns])
+        plan_item = self._plan_item_flow if solver == 'flow' else self._plan_item_greedy
+
+        order_date = datetime.now()
+        return {
+            state.item_ids[column]: plan_item(
+                state, column, needed[:, k], excess[:, k], coverage[:, k],
+                base_costs, multipliers[k], order_date
+            )
+            for k, column in enumerate(columns)
+        }
+
+    def _plan_item_greedy(self,
+        state: PlanningState,
+        column: int,
+        needed: np.ndarray,
+        excess: np.ndarray,
+        coverage: np.ndarray,
+        base_costs: np.ndarray,
+        multiplier: float,
+        order_date: datetime
+    ) -> ItemPlan:
+        """
+        Para cada local con necesidad, la transferencia más barata desde un local
+        con excedente suficiente si cuesta menos que el pedido (con su umbral);
+        si no, un pedido. Todos los locales se evalúan a la vez y solo se crean
+        objetos para los que necesitan reposición
+        """
+        orders: Dict[str, OrderRecommendation] = {}
+        transfers: Dict[str, TransferOption] = {}
+        rows = np.flatnonzero(needed > 0)
+        if not len(rows):
+            return orders, transfers
+        item_id = state.item_ids[column]
+        item = state.items[item_id]
+        quantity = needed[rows]
+        targets = np.arange(len(rows))
+
+        # Orígenes (filas) x locales con necesidad (columnas)
+        candidates = excess[:, None] > quantity[None, :]
+        candidates[rows, targets] = False
+        transport = base_costs[:, rows] * multiplier * (1 + quantity / 1000)
+        total = np.where(
+            candidates,
+            transport + quantity * item.cost_per_unit * TRANSFER_GOODS_FACTOR,
+            np.inf
+        )
+        best = total.argmin(axis=0)
+        best_total = total[best, targets]
+        accepted = best_total < quantity * item.cost_per_unit * ORDER_PREMIUM
+
+        for target, row in enumerate(rows):
+            location = state.locations[row]
+            needed_quantity = float(quantity[target])
+            if accepted[target]:
+                transfers[location] = TransferOption(
+                    from_location=state.locations[best[target]],
+                    quantity=needed_quantity,
+                    transport_cost=float(transport[best[target], target]),
+                    total_cost=float(best_total[target]),
+                    available_immediately=True
+                )
+            else:
+                orders[location] = self._order(item_id, item, needed_quantity, coverage[row], order_date)
+        return orders, transfers
+
+    def _plan_item_flow(self,
+        state: PlanningState,
+        column: int,
+        needed: np.ndarray,
+        excess: np.ndarray,
+        coverage: np.ndarray,
+        base_costs: np.ndarray,
+        multiplier: float,
+        order_date: datetime
+    ) -> ItemPlan:
+        """
+        Pedidos y transferencias del item resueltos conjuntamente como un
+        problema de transporte: los orígenes son el excedente de cada local y el
+        proveedor, los destinos lo que necesita cada local. Cada excedente se
+        reparte una sola vez entre todos los locales que lo piden
+        """
+        orders: Dict[str, OrderRecommendation] = {}
+        transfers: Dict[str, TransferOption] = {}
+        item_id = state.item_ids[column]
+        item = state.items[item_id]
+        positions = np.flatnonzero(state.present[:, column])
+        needed = needed[positions]
+        excess = excess[positions]
+
+        sinks = np.flatnonzero(needed > 0)
+        if not len(sinks):
+            return orders, transfers
+        # Un local que necesita el item no cede su excedente
+        sources = np.flatnonzero((excess > 0) & (needed <= 0))
+        flow = self._solve_item_flow(item, positions, sources, sinks, excess, needed, base_costs, multiplier)
+
+        for target, sink in enumerate(sinks):
+            row = positions[sink]
+            location = state.locations[row]
+            remaining = needed[sink]
+            shipped = flow[1:, target]
+            if len(shipped) and shipped.max() > 0:
+                # Una transferencia por item y local: se queda la mayor y el resto se pide
+                best = int(shipped.argmax())
+                option = self._transfer_option(
+                    state.locations[positions[sources[best]]], location, shipped[best], item
+                )
+                if option.total_cost < option.quantity * item.cost_per_unit * ORDER_PREMIUM:
+                    transfers[location] = option
+                    remaining -= option.quantity
+            if remaining > 1e-9:
+                orders[location] = self._order(item_id, item, float(remaining), coverage[row], order_date)
+        return orders, transfers
+
+    def _order(self,
+        item_id: str,
+        item: InventoryItem,
+        quantity: float,
+        days_coverage: float,
+        order_date: datetime
+    ) -> OrderRecommendation:
+        return OrderRecommendation(
+            item_id=item_id,
+            quantity=quantity,
+            priority='high' if days_coverage < item.lead_time_days else 'medium',
+            reason=f"Stock coverage: {days_coverage:.1f} days",
+            estimated_cost=quantity * item.cost_per_unit,
+            suggested_order_date=order_date
+        )
+
+    def _solve_item_flow(self,
+        item: InventoryItem,
+        positions: np.ndarray,
+        sources: np.ndarray,
+        sinks: np.ndarray,
+        excess: np.ndarray,
+        needed: np.ndarray,
+        base_costs: np.ndarray,
+        multiplier: float
+    ) -> np.ndarray:
+        """Flujo (proveedor + orígenes) x destinos de un item"""
+        demand = needed[sinks]
+        # Fila 0: el proveedor, sin límite y al coste del pedido con el umbral del modo voraz
+        supply = np.concatenate(([demand.sum()], excess[sources]))
+        fixed = base_costs[np.ix_(positions[sources], positions[sinks])] * multiplier
+        # El coste fijo de cada ruta se reparte sobre la mayor cantidad que podría llevar
+        capacity = np.minimum(excess[sources][:, None], demand[None, :])
+        transfer_unit = fixed / 1000 + fixed / capacity + item.cost_per_unit * TRANSFER_GOODS_FACTOR
+        cost = np.vstack((np.full((1, len(sinks)), item.cost_per_unit * ORDER_PREMIUM), transfer_unit))
+        return solve_transportation(supply, demand, cost)
+
+    def _transfer_option(self,
+        from_loc: str,
+        to_loc: str,
+        quantity: float,
+        item: InventoryItem
+    ) -> TransferOption:
+        transfer_cost = self._calculate_transfer_cost(from_loc, to_loc, quantity, item)
+        return TransferOption(
+            from_location=from_loc,
+            quantity=quantity,
+            transport_cost=transfer_cost,
+            total_cost=transfer_cost + quantity * item.cost_per_unit * TRANSFER_GOODS_FACTOR,
+            available_immediately=True
+        )
+
+    def optimize_menu_orders(self,
+        locations_inventory: Dict[str, Dict[str, float]],
+        menu_predictions: Dict[str, Dict[str, InventoryPrediction]],
+        items: Dict[str, InventoryItem],
+        recipes: RecipeTools,
+        solver: str = 'greedy'
+    ) -> Dict[str, LocationRecommendation]:
+        """Optimiza pedidos a partir de predicciones de platos explotadas por receta"""
+        ingredient_ids = {
+            item_id
+            for inventory in locations_inventory.values()
+            for item_id in inventory
+        }
+        demand_predictions = recipes.ingredient_predictions(
+            menu_predictions,
+            ingredients=ingredient_ids
+        )
+        return self.optimize_orders(
+            locations_inventory=locations_inventory,
+            demand_predictions=demand_predictions,
+            items=items,
+            solver=solver
+        )
 
     def _find_transfer_options(self,
         item_id: str,
@@ -81,34 +273,35 @@ class MultiLocationTools:
         demand_predictions: Dict[str, Dict[str, InventoryPrediction]],
         item: InventoryItem
     ) -> List[TransferOption]:
-        options = []
-        
-        for source_loc, inventory in locations_inventory.items():
-            if source_loc == requesting_location:
-                continue
-                
-            current_stock = inventory.get(item_id, 0)
-            predicted_demand = demand_predictions[source_loc][item_id].predicted_demand
-            
-            excess_stock = current_stock - (
-                item.min_level + predicted_demand * item.lead_time_days
+        sources = [location for location in locations_inventory if location != requesting_location]
+        current_stock = np.array(
+            [locations_inventory[location].get(item_id, 0) for location in sources],
+            dtype=np.float64
+        )
+        predicted_demand = np.array(
+            [demand_predictions[location][item_id].predicted_demand for location in sources],
+            dtype=np.float64
+        )
+        excess_stock = current_stock - (item.min_level + predicted_demand * item.lead_time_days)
+        candidates = [location for location, excess in zip(sources, excess_stock) if excess > quantity_needed]
+        if not candidates:
+            return []
+
+        # Costes de todos los orígenes candidatos en una sola operación
+        transfer_costs = self.network.transfer_costs(
+            candidates, [requesting_location], [item], quantity_needed
+        )[:, 0, 0]
+        goods_cost = quantity_needed * item.cost_per_unit * TRANSFER_GOODS_FACTOR
+        return [
+            TransferOption(
+                from_location=location,
+                quantity=quantity_needed,
+                transport_cost=float(transfer_cost),
+                total_cost=float(transfer_cost) + goods_cost,
+                available_immediately=True
             )
-            
-            if excess_stock > quantity_needed:
-                transfer_cost = self._calculate_transfer_cost(
-                    source_loc, requesting_location,
-                    quantity_needed, item
-                )
-                
-                options.append(TransferOption(
-                    from_location=source_loc,
-                    quantity=quantity_needed,
-                    transport_cost=transfer_cost,
-                    total_cost=transfer_cost + quantity_needed * item.cost_per_unit * 0.8,
-                    available_immediately=True
-                ))
-        
-        return options
+            for location, transfer_cost in zip(candidates, transfer_costs)
+        ]
 
     def _calculate_transfer_cost(self,
         from_loc: str,
@@ -116,17 +309,8 @@ class MultiLocationTools:
         quantity: float,
         item: InventoryItem
     ) -> float:
-        base_cost = self.transfer_costs.get(
-            (from_loc, to_loc),
-            self.transfer_costs.get((to_loc, from_loc), 200)
-        )
-        
-        if item.storage == 'FROZEN':
-            base_cost *= 1.5
-        elif item.storage == 'REFRIGERATED':
-            base_cost *= 1.3
-            
-        return base_cost * (1 + quantity / 1000)
+        base_cost = self.network.base_cost(from_loc, to_loc) * self.network.multipliers([item])[0]
+        return float(base_cost * (1 + quantity / 1000))
 
     def get_tools(self) -> List[StructuredTool]:
         return [
@@ -0,0 +1,175 @@
+import os
+import logging
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from ..models.inventory_models import InventoryItem, InventoryPrediction
+from .prediction_tools import PredictionTools
+from .demand_prediction_tools import DemandPredictionTools
+from .smoothing_tools import ExponentialSmoothingTools
+from .demand_cube import DemandCube
+from .shared_history import SharedFrame, SharedFrameHandle
+
+logger = logging.getLogger(__name__)
+
+ENGINES = {
+    'prediction': PredictionTools,
+    'demand': DemandPredictionTools,
+    'holt_winters': ExponentialSmoothingTools
+}
+
+# Estado de solo lectura de cada proceso trabajador (se fija una vez al arrancar)
+_worker: Dict[str, object] = {}
+
+def partition_by_location(history: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Tuple[int, int]]]:
+    """Ordena el historial por ubicación (estable) y devuelve los rangos de cada una"""
+    codes, uniques = pd.factorize(history['location'])
+    order = np.argsort(codes, kind='stable')
+    ordered = history.iloc[order]
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])) + int((codes < 0).sum())
+    offsets = {
+        location: (int(start), int(start + count))
+        for location, start, count in zip(uniques, starts, counts)
+    }
+    return ordered, offsets
+
+def _init_worker(
+    history: Union[pd.DataFrame, SharedFrameHandle],
+    offsets: Dict[str, Tuple[int, int]],
+    engine: str,
+    items: Dict[str, InventoryItem]
+) -> None:
+    # Con memoria compartida el trabajador se adjunta a los arrays del proceso principal
+    if isinstance(history, SharedFrameHandle):
+        history = history.attach()
+    _worker['history'] = history
+    _worker['offsets'] = offsets
+    _worker['tools'] = ENGINES[engine]()
+    _worker['items'] = items
+
+def _location_slice(location: str) -> pd.DataFrame:
+    history = _worker['history']
+    start, end = _worker['offsets'].get(location, (0, 0))
+    return history.iloc[start:end]
+
+def _predict_location(location: str, target_date: datetime) -> Dict[str, InventoryPrediction]:
+    return _worker['tools'].predict_demand(
+        historical_data=_location_slice(location),
+        items=_worker['items'],
+        target_date=target_date,
+        location=location
+    )
+
+def _forecast_chunk(
+    locations: List[str],
+    start: datetime,
+    days: int
+) -> DemandCube:
+    history = pd.concat([_location_slice(location) for location in locations])
+    return _worker['tools'].forecast_horizon(
+        history=history,
+        items=_worker['items'],
+        start=start,
+        days=days,
+        locations=locations
+    )
+
+class ParallelForecaster:
+    """Reparte las predicciones por ubicación entre un pool de procesos"""
+
+    def __init__(
+        self,
+        engine: str = 'demand',
+        max_workers: Optional[int] = None,
+        shared_memory: bool = True
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Motor de predicción desconocido: {engine}")
+        self.engine = engine
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.shared_memory = shared_memory
+
+    def predict_locations(
+        self,
+        history: pd.DataFrame,
+        items: Dict[str, InventoryItem],
+        target_date: datetime,
+        locations: List[str]
+    ) -> Dict[str, Dict[str, InventoryPrediction]]:
+        """Mismo resultado que llamar predict_demand ubicación por ubicación"""
+        ordered, offsets = partition_by_location(history)
+        workers = min(self.max_workers, len(locations))
+
+        if workers <= 1:
+            _init_worker(ordered, offsets, self.engine, items)
+            try:
+                return {loc: _predict_location(loc, target_date) for loc in locations}
+            finally:
+                _worker.clear()
+
+        with self._pool(workers, ordered, offsets, items) as pool:
+            results = pool.map(
+                _predict_location,
+                locations,
+                [target_date] * len(locations),
+                chunksize=max(1, len(locations) // (workers * 4))
+            )
+            return dict(zip(locations, results))
+
+    def forecast_horizon(
+        self,
+        history: pd.DataFrame,
+        items: Dict[str, InventoryItem],
+        start: datetime,
+        days: int,
+        locations: List[str]
+    ) -> DemandCube:
+        """Cubo de demanda calculado por bloques de ubicaciones en paralelo"""
+        if self.engine != 'demand':
+            raise ValueError("forecast_horizon requiere el motor 'demand'")
+        ordered, offsets = partition_by_location(history)
+        workers = min(self.max_workers, len(locations))
+
+        if workers <= 1:
+            _init_worker(ordered, offsets, self.engine, items)
+            try:
+                return _forecast_chunk(locations, start, days)
+            finally:
+                _worker.clear()
+
+        chunks = [list(chunk) for chunk in np.array_split(np.array(locations, dtype=object), workers)]
+        with self._pool(workers, ordered, offsets, items) as pool:
+            cubes = list(pool.map(
+                _forecast_chunk,
+                chunks,
+                [start] * len(chunks),
+                [days] * len(chunks)
+            ))
+        return DemandCube.concat(cubes)
+
+    @contextmanager
+    def _pool(
+        self,
+        workers: int,
+        history: pd.DataFrame,
+        offsets: Dict[str, Tuple[int, int]],
+        items: Dict[str, InventoryItem]
+    ) -> Iterator[ProcessPoolExecutor]:
+        logger.debug(f"Pronóstico paralelo con {workers} procesos ({self.engine})")
+        # El historial se publica una vez en memoria compartida y cada proceso se
+        # adjunta sin copiarlo; sin ella viaja serializado en el inicializador
+        shared = SharedFrame(history) if self.shared_memory else None
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shared.handle if shared else history, offsets, self.engine, items)
+            ) as pool:
+                yield pool
+        finally:
+            if shared is not None:
+                shared.close()
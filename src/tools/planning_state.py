@@ -0,0 +1,113 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ..models.inventory_models import InventoryItem, InventoryPrediction
+
+class PlanningState:
+    """
+    Estado de planificación como matrices (locales x items): stock, demanda
+    prevista y qué celdas existen en el inventario de cada local. Los
+    parámetros de cada item (min_level, reorder_point, lead_time_days,
+    cost_per_unit) son vectores que se difunden sobre las columnas. Cobertura,
+    necesidad y excedente se calculan para toda la red de una vez o solo para
+    las columnas indicadas; set_stock y set_prediction modifican una celda
+    """
+
+    def __init__(
+        self,
+        locations: List[str],
+        item_ids: List[str],
+        stock: np.ndarray,
+        predicted: np.ndarray,
+        present: np.ndarray,
+        items: Dict[str, InventoryItem]
+    ):
+        self.locations = locations
+        self.item_ids = item_ids
+        self.items = items
+        self.stock = stock
+        self.predicted = predicted
+        self.present = present
+        self.row = {location: position for position, location in enumerate(locations)}
+        self.column = {item_id: position for position, item_id in enumerate(item_ids)}
+        catalog = [items[item_id] for item_id in item_ids]
+        self.min_level = np.array([item.min_level for item in catalog], dtype=np.float64)
+        self.reorder_point = np.array([item.reorder_point for item in catalog], dtype=np.float64)
+        self.lead_time_days = np.array([item.lead_time_days for item in catalog], dtype=np.float64)
+        self.cost_per_unit = np.array([item.cost_per_unit for item in catalog], dtype=np.float64)
+
+    @classmethod
+    def from_inputs(
+        cls,
+        locations_inventory: Dict[str, Dict[str, float]],
+        demand_predictions: Dict[str, Dict[str, InventoryPrediction]],
+        items: Dict[str, InventoryItem]
+    ) -> 'PlanningState':
+        locations = list(locations_inventory)
+        item_index: Dict[str, int] = {}
+        for inventory in locations_inventory.values():
+            for item_id in inventory:
+                item_index.setdefault(item_id, len(item_index))
+
+        shape = (len(locations), len(item_index))
+        stock = np.zeros(shape)
+        predicted = np.zeros(shape)
+        present = np.zeros(shape, dtype=bool)
+        for row, (location, inventory) in enumerate(locations_inventory.items()):
+            # Un item en stock sin predicción es un error (KeyError), no demanda 0
+            predictions = demand_predictions[location] if inventory else demand_predictions.get(location, {})
+            for item_id, quantity in inventory.items():
+                column = item_index[item_id]
+                stock[row, column] = quantity
+                present[row, column] = True
+                predicted[row, column] = predictions[item_id].predicted_demand
+            # La demanda prevista también cuenta en locales sin el item (son posibles orígenes)
+            for item_id, prediction in predictions.items():
+                column = item_index.get(item_id)
+                if column is not None and item_id not in inventory:
+                    predicted[row, column] = prediction.predicted_demand
+
+        return cls(locations, list(item_index), stock, predicted, present, items)
+
+    @property
+    def shape(self):
+        return self.stock.shape
+
+    @property
+    def days_coverage(self) -> np.ndarray:
+        return self.stock / (self.predicted + 0.0001)
+
+    @property
+    def lead_time_demand(self) -> np.ndarray:
+        return self.predicted * self.lead_time_days
+
+    @property
+    def needed(self) -> np.ndarray:
+        """Cantidad a reponer de cada celda del inventario (0 si no hace falta)"""
+        needed = np.maximum(0, self.reorder_point - self.stock + self.lead_time_demand)
+        return np.where(self.present, needed, 0.0)
+
+    @property
+    def excess(self) -> np.ndarray:
+        """Stock por encima del mínimo más la demanda del plazo de entrega (negativo si falta)"""
+        return self.stock - (self.min_level + self.lead_time_demand)
+
+    def metrics(self, columns: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Necesidad, excedente y cobertura de las columnas indicadas (todas por defecto)"""
+        if columns is None:
+            return self.needed, self.excess, self.days_coverage
+        stock = self.stock[:, columns]
+        predicted = self.predicted[:, columns]
+        lead_time_demand = predicted * self.lead_time_days[columns]
+        needed = np.maximum(0, self.reorder_point[columns] - stock + lead_time_demand)
+        needed = np.where(self.present[:, columns], needed, 0.0)
+        excess = stock - (self.min_level[columns] + lead_time_demand)
+        return needed, excess, stock / (predicted + 0.0001)
+
+    def set_stock(self, location: str, item_id: str, quantity: float) -> None:
+        """Stock de una celda; la celda pasa a formar parte del inventario del local"""
+        row, column = self.row[location], self.column[item_id]
+        self.stock[row, column] = quantity
+        self.present[row, column] = True
+
+    def set_prediction(self, location: str, item_id: str, predicted_demand: float) -> None:
+        self.predicted[self.row[location], self.column[item_id]] = predicted_demand
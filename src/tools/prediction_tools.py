@@ -1,4 +1,4 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -7,14 +7,28 @@ from ..models.inventory_models import (
     InventoryItem,
     InventoryPrediction
 )
+from .series_stats import SeriesGroups
+from .forecast_cache import ForecastCache, default_forecast_cache, history_fingerprint
+from .smoothing_tools import ExponentialSmoothingTools
 
 class PredictionTools:
+    METHODS = ('seasonal', 'holt_winters')
+
+    def __init__(self, cache: Optional[ForecastCache] = None):
+        self.cache = cache if cache is not None else default_forecast_cache
+        self.smoothing = ExponentialSmoothingTools(cache=self.cache)
+        self.seasonal_factors = {
+            1: 0.9, 2: 0.9, 3: 1.0, 4: 1.0, 5: 1.0, 6: 1.2,
+            7: 1.2, 8: 1.2, 9: 1.0, 10: 1.0, 11: 1.0, 12: 1.1
+        }
+
     def predict_demand(
         self,
         historical_data: pd.DataFrame,
         items: Dict[str, InventoryItem],
         target_date: datetime,
-        location: str
+        location: str,
+        method: str = 'seasonal'
     ) -> Dict[str, InventoryPrediction]:
         """
         Predice demanda basada en datos históricos
@@ -23,51 +37,122 @@ class PredictionTools:
             items: Diccionario de items con configuración
             target_date: Fecha objetivo para predicción
             location: Ubicación para predicción
+            method: 'seasonal' (media × factor mensual) o 'holt_winters'
         """
+        if method not in self.METHODS:
+            raise ValueError(f"Método de predicción desconocido: {method}")
         if historical_data is None or historical_data.empty:
             raise ValueError("Se requiere historical_data válido")
-            
+        if method == 'holt_winters':
+            return self.smoothing.predict_demand(historical_data, items, target_date, location)
+
+        key = self.cache.make_key(
+            'prediction',
+            location,
+            items.keys(),
+            target_date,
+            (method, tuple(sorted(self.seasonal_factors.items()))),
+            history_fingerprint(historical_data, ['item_id', 'units_sold', 'date'])
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        frame = self.predict_demand_frame(
+            historical_data=historical_data,
+            items=items,
+            target_date=target_date,
+            location=location
+        )
+
         predictions = {}
-        seasonal_factors = {
-            1: 0.9, 2: 0.9, 3: 1.0, 4: 1.0, 5: 1.0, 6: 1.2,
-            7: 1.2, 8: 1.2, 9: 1.0, 10: 1.0, 11: 1.0, 12: 1.1
-        }
-        
-        for item_id, item in items.items():
-            df = historical_data[historical_data['item_id'] == item_id].copy()
-            
-            if df.empty:
-                continue
-                
-            # Calcular métricas base
-            mean_sales = df['units_sold'].mean()
-            std_sales = df['units_sold'].std() or mean_sales * 0.1
-            
-            # Ajustar por estacionalidad
-            seasonal_factor = seasonal_factors.get(target_date.month, 1.0)
-            predicted_demand = mean_sales * seasonal_factor
-            
-            # Calcular tendencia
-            if len(df) >= 2:
-                df['date'] = pd.to_datetime(df['date'])
-                df = df.sort_values('date')
-                sales_change = (df['units_sold'].iloc[-1] - df['units_sold'].iloc[0]) / df['units_sold'].iloc[0]
-                trend_factor = 1 + (sales_change / len(df))
-            else:
-                trend_factor = 1.0
-            
-            predictions[item_id] = InventoryPrediction(
-                predicted_demand=round(predicted_demand * trend_factor, 2),
-                confidence_range=(
-                    round(max(0, predicted_demand - 2 * std_sales), 2),
-                    round(predicted_demand + 2 * std_sales, 2)
-                ),
-                trend_factor=round(trend_factor, 4),
-                seasonality_factor=seasonal_factor
+        for row in frame.itertuples():
+            predictions[row.Index] = InventoryPrediction(
+                predicted_demand=row.predicted_demand,
+                confidence_range=(row.lower_bound, row.upper_bound),
+                trend_factor=row.trend_factor,
+                seasonality_factor=row.seasonality_factor
             )
-        
+
+        self.cache.put(key, predictions)
         return predictions
 
+    def predict_demand_frame(
+        self,
+        historical_data: pd.DataFrame,
+        items: Dict[str, InventoryItem],
+        target_date: datetime,
+        location: str
+    ) -> pd.DataFrame:
+        """
+        Calcula la predicción de todos los items en una sola pasada agrupada
+        Retorna un DataFrame indexado por item_id con las mismas cifras
+        (ya redondeadas) que predict_demand
+        """
+        if historical_data is None or historical_data.empty:
+            raise ValueError("Se requiere historical_data válido")
+
+        data = historical_data[historical_data['item_id'].isin(list(items.keys()))]
+        frame = self.series_forecast(data, ['item_id'], target_date)
+
+        # Mismo orden que el diccionario de items
+        return frame.reindex([item_id for item_id in items if item_id in frame.index])
+
+    def series_forecast(
+        self,
+        data: pd.DataFrame,
+        keys: List[str],
+        target_date: datetime
+    ) -> pd.DataFrame:
+        """
+        Media × estacionalidad × tendencia de cada serie definida por `keys`
+        (p. ej. item_id, o nodos agregados de una jerarquía)
+        """
+        date_column = 'date' if 'date' in data.columns else None
+        groups = SeriesGroups(data, keys, date_column=date_column)
+
+        sales = groups.values('units_sold')
+        mean_sales = groups.mean(sales)
+        std_sales = groups.std(sales)
+        # std == 0 cae al 10% de la media; NaN (un solo punto) se conserva
+        std_sales = np.where(std_sales == 0, mean_sales * 0.1, std_sales)
+
+        seasonal_factor = self.seasonal_factors.get(target_date.month, 1.0)
+        predicted_demand = mean_sales * seasonal_factor
+
+        trend_factor = np.ones(len(groups))
+        if (groups.counts >= 2).any():
+            if groups.dates is None:
+                raise KeyError('date')
+            trend_factor = self.trend_factors(groups.first(sales), groups.last(sales), groups.counts)
+
+        lower = predicted_demand - 2 * std_sales
+        index = pd.MultiIndex.from_frame(groups.keys) if len(keys) > 1 else pd.Index(groups.keys[keys[0]])
+        return pd.DataFrame({
+            'predicted_demand': np.round(predicted_demand * trend_factor, 2),
+            'lower_bound': np.round(np.where(lower > 0, lower, 0.0), 2),
+            'upper_bound': np.round(predicted_demand + 2 * std_sales, 2),
+            'trend_factor': np.round(trend_factor, 4),
+            'seasonality_factor': seasonal_factor,
+            'mean_sales': mean_sales,
+            'std_sales': std_sales,
+            'observations': groups.counts
+        }, index=index)
+
+    def month_factors(self, months: np.ndarray) -> np.ndarray:
+        """Factor estacional de cada mes (1-12)"""
+        table = np.array([self.seasonal_factors.get(m, 1.0) for m in range(13)])
+        return table[months]
+
+    def trend_factors(self, first: np.ndarray, last: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Tendencia entre el primer y el último punto de cada serie: cambio
+        relativo repartido entre sus observaciones (1 con menos de dos)
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sales_change = (last - first) / first
+        return np.where(counts >= 2, 1 + sales_change / counts, 1.0)
+
     def get_tools(self) -> List[StructuredTool]:
         return [
             StructuredTool.from_function(
@@ -0,0 +1,187 @@
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from ..models.inventory_models import InventoryPrediction
+
+class RecipeTools:
+    """
+    Lista de materiales: compila las recetas (p. ej. BURGER_RECIPES) en una
+    matriz dispersa (plato × ingrediente) en formato CSR y convierte ventas o
+    predicciones de platos en demanda de ingredientes
+    """
+
+    def __init__(self, recipes: Dict[str, Dict[str, float]]):
+        self.menu_items: List[str] = []
+        self.ingredients: List[str] = []
+        self._menu_index: Dict[str, int] = {}
+        self._ingredient_index: Dict[str, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.data = np.zeros(0)
+        for menu_item, components in recipes.items():
+            self._set_row(menu_item, components)
+        self._compile_columns()
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self.menu_items), len(self.ingredients))
+
+    def update_recipe(self, menu_item: str, components: Dict[str, float]) -> None:
+        """
+        Reemplaza (o agrega) solo la fila de un plato, sin recompilar el resto:
+        en el orden por ingrediente se quitan las entradas anteriores del plato
+        y se insertan las nuevas en su columna, sin volver a ordenar
+        """
+        row, columns, quantities = self._set_row(menu_item, components)
+        self._rows = np.repeat(np.arange(len(self.menu_items)), np.diff(self.indptr))
+
+        keep = self._column_rows != row
+        sorted_columns = self._column_columns[keep]
+        positions = np.searchsorted(sorted_columns, columns, side='right')
+        self._column_columns = np.insert(sorted_columns, positions, columns)
+        self._column_rows = np.insert(self._column_rows[keep], positions, row)
+        self._column_data = np.insert(self._column_data[keep], positions, quantities)
+        self._column_segments()
+
+    def _set_row(self, menu_item: str, components: Dict[str, float]):
+        """Empalma la fila del plato en los arreglos CSR; devuelve (fila, columnas, cantidades)"""
+        columns = np.array(
+            [self._ingredient_position(ingredient) for ingredient in components],
+            dtype=np.int64
+        )
+        quantities = np.array(list(components.values()), dtype=np.float64)
+
+        row = self._menu_index.get(menu_item)
+        if row is None:
+            row = len(self.menu_items)
+            self._menu_index[menu_item] = row
+            self.menu_items.append(menu_item)
+            self.indices = np.concatenate([self.indices, columns])
+            self.data = np.concatenate([self.data, quantities])
+            self.indptr = np.append(self.indptr, self.indptr[-1] + len(columns))
+        else:
+            start, end = self.indptr[row], self.indptr[row + 1]
+            self.indices = np.concatenate([self.indices[:start], columns, self.indices[end:]])
+            self.data = np.concatenate([self.data[:start], quantities, self.data[end:]])
+            self.indptr[row + 1:] += len(columns) - (end - start)
+        return row, columns, quantities
+
+    def _ingredient_position(self, ingredient: str) -> int:
+        position = self._ingredient_index.get(ingredient)
+        if position is None:
+            position = len(self.ingredients)
+            self._ingredient_index[ingredient] = position
+            self.ingredients.append(ingredient)
+        return position
+
+    def _compile_columns(self) -> None:
+        # Orden por ingrediente de las entradas no nulas para sumar con reduceat
+        self._rows = np.repeat(np.arange(len(self.menu_items)), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind='stable')
+        self._column_rows = self._rows[order]
+        self._column_data = self.data[order]
+        self._column_columns = self.indices[order]
+        self._column_segments()
+
+    def _column_segments(self) -> None:
+        sorted_columns = self._column_columns
+        self._column_starts = np.flatnonzero(
+            np.r_[True, sorted_columns[1:] != sorted_columns[:-1]]
+        ) if len(sorted_columns) else np.zeros(0, dtype=np.int64)
+        self._column_ids = sorted_columns[self._column_starts]
+
+    def to_dense(self) -> np.ndarray:
+        matrix = np.zeros(self.shape)
+        matrix[self._rows, self.indices] = self.data
+        return matrix
+
+    def explode(self, sales: np.ndarray) -> np.ndarray:
+        """
+        Demanda de ingredientes de un bloque de ventas (filas × platos, en el
+        orden de menu_items) mediante un único producto disperso
+        """
+        sales = np.atleast_2d(np.asarray(sales, dtype=np.float64))
+        result = np.zeros((sales.shape[0], len(self.ingredients)))
+        if len(self._column_rows):
+            contributions = sales[:, self._column_rows] * self._column_data
+            result[:, self._column_ids] = np.add.reduceat(
+                contributions, self._column_starts, axis=1
+            )
+        return result
+
+    def explode_frame(
+        self,
+        sales: pd.DataFrame,
+        menu_column: str = 'item_id',
+        value_column: str = 'units_sold',
+        keys: List[str] = ['location', 'date']
+    ) -> pd.DataFrame:
+        """Convierte ventas (o pronósticos) por plato en demanda diaria de ingredientes"""
+        menu_position = pd.Index(self.menu_items).get_indexer(sales[menu_column])
+        known = menu_position >= 0
+        sales = sales[known]
+        menu_position = menu_position[known]
+
+        block_codes, blocks = pd.MultiIndex.from_frame(sales[keys]).factorize()
+        block_matrix = np.zeros((len(blocks), len(self.menu_items)))
+        np.add.at(block_matrix, (block_codes, menu_position), sales[value_column].to_numpy(dtype=np.float64))
+
+        demand = self.explode(block_matrix)
+        block, ingredient = np.nonzero(demand)
+        result = blocks.to_frame(index=False, name=keys).iloc[block].reset_index(drop=True)
+        result['ingredient_id'] = np.asarray(self.ingredients, dtype=object)[ingredient]
+        result['quantity'] = demand[block, ingredient]
+        return result
+
+    def ingredient_predictions(
+        self,
+        menu_predictions: Dict[str, Dict[str, InventoryPrediction]],
+        ingredients: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, InventoryPrediction]]:
+        """
+        Traduce predicciones por plato y ubicación en predicciones por
+        ingrediente, con el formato que espera MultiLocationTools.optimize_orders.
+        Los factores de tendencia y estacionalidad se ponderan por demanda
+        """
+        wanted = list(ingredients) if ingredients is not None else self.ingredients
+        positions = {ingredient: self._ingredient_index.get(ingredient) for ingredient in wanted}
+        results = {}
+
+        for location, predictions in menu_predictions.items():
+            block = np.zeros((5, len(self.menu_items)))
+            for menu_item, prediction in predictions.items():
+                row = self._menu_index.get(menu_item)
+                if row is None:
+                    continue
+                block[:, row] = (
+                    prediction.predicted_demand,
+                    prediction.confidence_range[0],
+                    prediction.confidence_range[1],
+                    prediction.predicted_demand * prediction.trend_factor,
+                    prediction.predicted_demand * prediction.seasonality_factor
+                )
+
+            demand, lower, upper, trend, seasonality = self.explode(block)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                trend = np.where(demand > 0, trend / demand, 1.0)
+                seasonality = np.where(demand > 0, seasonality / demand, 1.0)
+
+            location_predictions = {}
+            for ingredient, position in positions.items():
+                if position is None:
+                    location_predictions[ingredient] = InventoryPrediction(
+                        predicted_demand=0.0,
+                        confidence_range=(0.0, 0.0),
+                        trend_factor=1.0,
+                        seasonality_factor=1.0
+                    )
+                    continue
+                location_predictions[ingredient] = InventoryPrediction(
+                    predicted_demand=round(demand[position], 2),
+                    confidence_range=(round(lower[position], 2), round(upper[position], 2)),
+                    trend_factor=round(trend[position], 4),
+                    seasonality_factor=round(seasonality[position], 4)
+                )
+            results[location] = location_predictions
+
+        return results
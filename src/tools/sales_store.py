@@ -0,0 +1,347 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import pandas as pd
+from .columnar_cache import get_cache_dir
+from .data_schema import SCHEMAS, apply_schema
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+ITEM_COLUMNS = ('item_id', 'item')
+KIND_ORDER = ('bool', 'int', 'float', 'date', 'text')
+
+# Agrupación temporal: día natural o semana que empieza en lunes
+BUCKETS = {
+    'D': 'date({column})',
+    'W': "date({column}, 'weekday 0', '-6 days')"
+}
+AGGREGATES = {'sum': 'SUM', 'mean': 'AVG', 'min': 'MIN', 'max': 'MAX', 'count': 'COUNT'}
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def _table_name(path: str) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return ''.join(ch if ch.isalnum() else '_' for ch in stem)
+
+def _sql_date(value: Any) -> str:
+    """Fecha (datetime, date o texto) en el formato en que se guardan las columnas de fecha"""
+    return pd.Timestamp(value).strftime(DATE_FORMAT)
+
+def _is_date_only(value: Any) -> bool:
+    if isinstance(value, str):
+        return ':' not in value
+    return isinstance(value, date) and not isinstance(value, datetime)
+
+class SalesStore:
+    """
+    Almacén SQLite local de las fuentes CSV (ventas, inventario, personal...).
+    Cada CSV se importa por bloques a una tabla con índices sobre
+    (location, item_id, date) y se reimporta cuando cambia su mtime o tamaño.
+    Los filtros y los agregados diarios/semanales se resuelven en SQL, de modo
+    que solo se materializan las filas que pide cada herramienta
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        schemas: Optional[Dict[str, Dict[str, str]]] = None,
+        chunk_rows: int = 50_000
+    ):
+        self.path = path or os.path.join(get_cache_dir(), 'holy_cow.sqlite')
+        self.schemas = schemas if schemas is not None else SCHEMAS
+        self.chunk_rows = chunk_rows
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS _sources ("
+                "name TEXT PRIMARY KEY, source TEXT, format INTEGER, "
+                "mtime_ns INTEGER, size INTEGER, kinds TEXT)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def sync(self, source_path: str, table: Optional[str] = None) -> str:
+        """Importa el CSV si la tabla no existe o el archivo cambió; devuelve el nombre de la tabla"""
+        table = table or _table_name(source_path)
+        source = os.stat(source_path)
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT format, mtime_ns, size FROM _sources WHERE name = ?", (table,)
+            ).fetchone()
+            if row != (FORMAT_VERSION, source.st_mtime_ns, source.st_size):
+                self._import(source_path, table, source)
+        return table
+
+    def sync_sources(
+        self,
+        data_sources: Dict[str, Dict[str, str]],
+        source_dir: str
+    ) -> Dict[str, Dict[str, str]]:
+        """Sincroniza los CSV de data_sources (config.yaml); devuelve {grupo: {fuente: tabla}}"""
+        tables: Dict[str, Dict[str, str]] = {}
+        for group, sources in data_sources.items():
+            for key, filename in sources.items():
+                if filename.endswith('.csv'):
+                    tables.setdefault(group, {})[key] = self.sync(os.path.join(source_dir, filename))
+        return tables
+
+    def columns(self, table: str) -> List[str]:
+        with self._lock:
+            return [row[1] for row in self.connection.execute(f"PRAGMA table_info({_quote(table)})")]
+
+    def query(
+        self,
+        table: str,
+        columns: Optional[Sequence[str]] = None,
+        location: Optional[str] = None,
+        item_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Filas de la tabla que cumplen los filtros. Las fechas son inclusivas y
+        admiten datetime, date o texto; un end_date sin hora cubre el día entero
+        """
+        available = self.columns(table)
+        selected = list(columns) if columns else available
+        self._check_columns(table, selected, available)
+        where, params = self._where(available, location, item_id, start_date, end_date)
+        sql = f"SELECT {', '.join(map(_quote, selected))} FROM {_quote(table)}{where}"
+        if 'date' in available:
+            sql += f" ORDER BY {_quote('date')}"
+        return self._read(table, sql, params)
+
+    def aggregate(
+        self,
+        table: str,
+        values: Sequence[str],
+        by: Sequence[str] = ('location', 'item_id'),
+        freq: Optional[str] = 'D',
+        how: str = 'sum',
+        location: Optional[str] = None,
+        item_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        count: bool = False
+    ) -> pd.DataFrame:
+        """
+        Agregado por claves y periodo ('D' diario, 'W' semanas desde el lunes,
+        None sin fecha) calculado en SQL. Con count=True añade la columna rows
+        """
+        if how not in AGGREGATES:
+            raise ValueError(f"Agregación desconocida: {how}")
+        if freq is not None and freq not in BUCKETS:
+            raise ValueError(f"Frecuencia desconocida: {freq}")
+        available = self.columns(table)
+        self._check_columns(table, [*by, *values], available)
+
+        keys = [_quote(column) for column in by]
+        selected = list(keys)
+        if freq is not None:
+            bucket = BUCKETS[freq].format(column=_quote('date'))
+            keys.append(bucket)
+            selected.append(f"{bucket} AS {_quote('date')}")
+        selected += [f"{AGGREGATES[how]}({_quote(v)}) AS {_quote(v)}" for v in values]
+        if count:
+            selected.append(f"COUNT(*) AS {_quote('rows')}")
+
+        where, params = self._where(available, location, item_id, start_date, end_date)
+        sql = f"SELECT {', '.join(selected)} FROM {_quote(table)}{where}"
+        if keys:
+            sql += f" GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}"
+        return self._read(table, sql, params, raw_columns=by)
+
+    def _check_columns(self, table: str, requested: Iterable[str], available: List[str]) -> None:
+        if not available:
+            raise KeyError(f"Tabla no sincronizada: {table}")
+        missing = [column for column in requested if column not in available]
+        if missing:
+            raise KeyError(f"Columnas inexistentes en {table}: {missing}")
+
+    def _where(
+        self,
+        available: List[str],
+        location: Optional[str],
+        item_id: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Tuple[str, List[Any]]:
+        conditions: List[str] = []
+        params: List[Any] = []
+        if location is not None:
+            conditions.append(f"{_quote('location')} = ?")
+            params.append(location)
+        if item_id is not None:
+            item_column = next((c for c in ITEM_COLUMNS if c in available), 'item_id')
+            conditions.append(f"{_quote(item_column)} = ?")
+            params.append(item_id)
+        if start_date is not None:
+            conditions.append(f"{_quote('date')} >= ?")
+            params.append(_sql_date(start_date))
+        if end_date is not None:
+            if _is_date_only(end_date):
+                # Un día sin hora incluye todas sus filas: hasta el día siguiente, excluido
+                conditions.append(f"{_quote('date')} < ?")
+                params.append(_sql_date(pd.Timestamp(end_date) + pd.Timedelta(days=1)))
+            else:
+                conditions.append(f"{_quote('date')} <= ?")
+                params.append(_sql_date(end_date))
+        return (f" WHERE {' AND '.join(conditions)}" if conditions else ''), params
+
+    def _read(
+        self,
+        table: str,
+        sql: str,
+        params: List[Any],
+        raw_columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        with self._lock:
+            cursor = self.connection.execute(sql, params)
+            names = [description[0] for description in cursor.description]
+            frame = pd.DataFrame.from_records(cursor.fetchall(), columns=names)
+            source, kinds = self.connection.execute(
+                "SELECT source, kinds FROM _sources WHERE name = ?", (table,)
+            ).fetchone()
+
+        kinds = json.loads(kinds)
+        for column in frame.columns:
+            if column == 'date' or kinds.get(column) == 'date':
+                try:
+                    frame[column] = pd.to_datetime(frame[column])
+                except (ValueError, TypeError):
+                    logger.debug(f"Columna {column} de {table} no es una fecha")
+        # El esquema solo se aplica a columnas sin agregar (una media de enteros no es entera)
+        raw = set(frame.columns) if raw_columns is None else set(raw_columns)
+        schema = {column: 'bool' for column, kind in kinds.items() if kind == 'bool'}
+        schema.update(self.schemas.get(os.path.basename(source), {}))
+        return apply_schema(frame, {column: dtype for column, dtype in schema.items() if column in raw})
+
+    def _import(self, source_path: str, table: str, source: os.stat_result) -> None:
+        connection = self.connection
+        quoted = _quote(table)
+        staging = _quote(f'_import_{table}')
+        kinds: Dict[str, str] = {}
+        rows = 0
+        # Una sola transacción: la tabla anterior sigue visible hasta el commit
+        with connection:
+            connection.execute(f"DROP TABLE IF EXISTS {staging}")
+            # Primero a una tabla sin tipos: el tipo de cada columna se decide con todos los bloques
+            for chunk in pd.read_csv(source_path, chunksize=self.chunk_rows):
+                if not kinds:
+                    columns = list(chunk.columns)
+                    connection.execute(f"CREATE TABLE {staging} ({', '.join(map(_quote, columns))})")
+                chunk_kinds = self._column_kinds(chunk)
+                for column in columns:
+                    kinds[column] = _widen(kinds.get(column), chunk_kinds[column])
+                placeholders = ', '.join('?' * len(columns))
+                connection.executemany(
+                    f"INSERT INTO {staging} VALUES ({placeholders})",
+                    zip(*(self._column_values(chunk[column], chunk_kinds[column]) for column in columns))
+                )
+                rows += len(chunk)
+            if not kinds:
+                raise ValueError(f"{source_path} no tiene columnas")
+            # Columnas sin ningún valor en todo el archivo
+            kinds = {column: kind or 'float' for column, kind in kinds.items()}
+
+            definition = ', '.join(
+                f"{_quote(column)} {'INTEGER' if kind in ('int', 'bool') else 'REAL' if kind == 'float' else 'TEXT'}"
+                for column, kind in kinds.items()
+            )
+            connection.execute(f"DROP TABLE IF EXISTS {quoted}")
+            connection.execute(f"CREATE TABLE {quoted} ({definition})")
+            connection.execute(f"INSERT INTO {quoted} SELECT * FROM {staging}")
+            connection.execute(f"DROP TABLE {staging}")
+
+            item_column = next((c for c in ITEM_COLUMNS if c in kinds), None)
+            keys = [c for c in ('location', item_column, 'date') if c and c in kinds]
+            if keys:
+                connection.execute(
+                    f"CREATE INDEX {_quote(f'idx_{table}_keys')} ON {quoted} ({', '.join(map(_quote, keys))})"
+                )
+            if {'location', 'date'} <= set(keys) and item_column:
+                connection.execute(
+                    f"CREATE INDEX {_quote(f'idx_{table}_location_date')} ON {quoted} "
+                    f"({_quote('location')}, {_quote('date')})"
+                )
+            connection.execute(
+                "INSERT OR REPLACE INTO _sources VALUES (?, ?, ?, ?, ?, ?)",
+                (table, os.path.abspath(source_path), FORMAT_VERSION,
+                 source.st_mtime_ns, source.st_size, json.dumps(kinds))
+            )
+        logger.info(f"Tabla {table} importada desde {os.path.basename(source_path)} ({rows} filas)")
+
+    def _column_kinds(self, chunk: pd.DataFrame) -> Dict[str, Optional[str]]:
+        """Tipo de cada columna en un bloque (None si el bloque no tiene valores)"""
+        kinds: Dict[str, Optional[str]] = {}
+        for column in chunk.columns:
+            series = chunk[column]
+            if column == 'date' or column.endswith('_date'):
+                kinds[column] = 'date'
+            elif series.isna().all():
+                kinds[column] = None
+            elif pd.api.types.is_bool_dtype(series):
+                kinds[column] = 'bool'
+            elif pd.api.types.is_integer_dtype(series):
+                kinds[column] = 'int'
+            elif pd.api.types.is_float_dtype(series):
+                kinds[column] = 'float'
+            else:
+                kinds[column] = 'text'
+        return kinds
+
+    def _column_values(self, series: pd.Series, kind: str) -> List[Any]:
+        if kind == 'date':
+            parsed = pd.to_datetime(series, errors='coerce')
+            text = parsed.dt.strftime(DATE_FORMAT)
+            # Valores que no son fechas se guardan tal cual
+            return [t if isinstance(t, str) else (None if pd.isna(v) else str(v))
+                    for t, v in zip(text.tolist(), series.tolist())]
+        values = series.astype(object).where(series.notna(), None).tolist()
+        if kind == 'bool':
+            return [None if v is None else int(v) for v in values]
+        return values
+
+def _widen(current: Optional[str], kind: Optional[str]) -> Optional[str]:
+    """Tipo que admite los valores de ambos bloques (bool < int < float < text)"""
+    if current is None or current == kind:
+        return kind
+    if kind is None:
+        return current
+    return max(current, kind, key=KIND_ORDER.index)
+
+class StoreViews:
+    """
+    Misma interfaz que SourcePartitions (view(grupo, fuente, ubicación)) pero
+    cada vista es una consulta filtrada al almacén
+    """
+
+    def __init__(self, store: SalesStore, tables: Dict[str, Dict[str, str]]):
+        self.store = store
+        self.tables = tables
+
+    def view(self, group: str, source: str, location: str) -> pd.DataFrame:
+        return self.store.query(self.tables[group][source], location=location)
+
+# Almacén compartido por los cargadores de datos dentro de un proceso (se abre al primer uso)
+default_sales_store = SalesStore()
@@ -0,0 +1,73 @@
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+
+class SeriesGroups:
+    """Agrupa un DataFrame por series (claves) ordenadas por fecha en una sola pasada"""
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        keys: List[str],
+        date_column: Optional[str] = 'date'
+    ):
+        codes = data.groupby(keys, sort=False, observed=True).ngroup().to_numpy()
+        valid = codes >= 0
+        rows = np.flatnonzero(valid)
+        codes = codes[valid]
+
+        if date_column is not None and date_column in data.columns:
+            dates = pd.to_datetime(data[date_column]).to_numpy()[rows]
+            order = np.lexsort((dates, codes))
+            self.dates = dates[order]
+        else:
+            order = np.argsort(codes, kind='stable')
+            self.dates = None
+
+        self.rows = rows[order]
+        sorted_codes = codes[order]
+        boundaries = np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1
+        self.starts = np.concatenate(([0], boundaries)) if len(sorted_codes) else np.array([], dtype=np.intp)
+        self.counts = np.diff(np.append(self.starts, len(sorted_codes)))
+        self.ends = self.starts + self.counts - 1
+        # ngroup numera las series 0..n-1, por lo que el código es la posición del segmento
+        self.codes = sorted_codes
+        self.keys = data.iloc[self.rows[self.starts]][keys].reset_index(drop=True)
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def values(self, column: str) -> np.ndarray:
+        """Columna como float64 en el orden (serie, fecha)"""
+        return self._data[column].to_numpy(dtype=np.float64)[self.rows]
+
+    def day_offsets(self) -> np.ndarray:
+        """Días transcurridos desde la primera fecha de cada serie"""
+        if self.dates is None:
+            raise KeyError('date')
+        first = self.dates[self.starts][self.codes]
+        return (self.dates - first) / np.timedelta64(1, 'D')
+
+    def sum(self, values: np.ndarray) -> np.ndarray:
+        if not len(values):
+            return np.zeros(0)
+        return np.add.reduceat(values, self.starts)
+
+    def mean(self, values: np.ndarray) -> np.ndarray:
+        return self.sum(values) / self.counts
+
+    def std(self, values: np.ndarray) -> np.ndarray:
+        """Desviación estándar muestral (ddof=1), NaN para series de un punto"""
+        means = self.mean(values)
+        squares = (values - means[self.codes]) ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = self.sum(squares) / (self.counts - 1)
+        variance[self.counts < 2] = np.nan
+        return np.sqrt(variance)
+
+    def first(self, values: np.ndarray) -> np.ndarray:
+        return values[self.starts]
+
+    def last(self, values: np.ndarray) -> np.ndarray:
+        return values[self.ends]
@@ -0,0 +1,142 @@
+import logging
+from multiprocessing import shared_memory
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bloques abiertos por este proceso al adjuntarse (deben vivir tanto como los arrays)
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    block = _attached.get(name)
+    if block is None:
+        block = shared_memory.SharedMemory(name=name)
+        _attached[name] = block
+    return block
+
+def _view(spec: Dict[str, Any]) -> np.ndarray:
+    block = _attach_block(spec['block'])
+    values = np.ndarray(spec['shape'], dtype=np.dtype(spec['dtype']), buffer=block.buf)
+    # Solo lectura: una escritura en un trabajador no debe verse en los demás
+    values.flags.writeable = False
+    return values
+
+class SharedFrameHandle:
+    """
+    Descripción serializable (nombres de bloques, tipos y categorías) de un
+    DataFrame publicado en memoria compartida; es lo único que viaja a cada
+    proceso trabajador
+    """
+
+    def __init__(self, columns: List[Dict[str, Any]], index: Dict[str, Any], rows: int):
+        self.columns = columns
+        self.index = index
+        self.rows = rows
+
+    def attach(self) -> pd.DataFrame:
+        """
+        DataFrame de solo lectura cuyas columnas numéricas y los códigos de las
+        categóricas apuntan a la memoria compartida; las columnas de texto
+        llegan como categóricas
+        """
+        data = {}
+        for column in self.columns:
+            kind = column['kind']
+            if kind == 'array':
+                data[column['name']] = _view(column)
+            elif kind == 'category':
+                # Los códigos siguen en la memoria compartida; solo las categorías son locales
+                data[column['name']] = pd.Categorical.from_codes(_view(column), categories=column['categories'])
+            else:
+                data[column['name']] = column['values']
+        return pd.DataFrame(data, index=self._attach_index(), copy=False)
+
+    def _attach_index(self) -> pd.Index:
+        kind = self.index['kind']
+        if kind == 'range':
+            return pd.RangeIndex(self.index['start'], self.index['stop'], self.index['step'])
+        if kind == 'array':
+            return pd.Index(_view(self.index), copy=False)
+        return self.index['values']
+
+class SharedFrame:
+    """
+    Publica un DataFrame en bloques de multiprocessing.shared_memory: un bloque
+    por columna numérica, de fecha o booleana, y otro por los códigos de las
+    columnas de texto, que se adjuntan como categóricas (las categorías viajan
+    en el descriptor). El índice se publica igual. Los procesos trabajadores se
+    adjuntan con handle.attach() sin copiar los datos; el publicador libera los
+    bloques con close()
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        try:
+            columns = [self._publish_column(name, frame[name]) for name in frame.columns]
+            index = self._publish_index(frame.index)
+        except Exception:
+            self.close()
+            raise
+        self.handle = SharedFrameHandle(columns, index, len(frame))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.size for block in self._blocks)
+
+    def close(self) -> None:
+        """Libera los bloques publicados (los trabajadores deben haber terminado)"""
+        for block in self._blocks:
+            try:
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+
+    def __enter__(self) -> 'SharedFrame':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _publish_array(self, values: np.ndarray) -> Dict[str, Any]:
+        values = np.ascontiguousarray(values)
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        self._blocks.append(block)
+        target = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)
+        target[...] = values
+        del target
+        return {'block': block.name, 'shape': values.shape, 'dtype': values.dtype.str}
+
+    def _publish_column(self, name: str, series: pd.Series) -> Dict[str, Any]:
+        dtype = series.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+            return {'name': name, 'kind': 'array', **self._publish_array(series.to_numpy())}
+        if isinstance(dtype, pd.CategoricalDtype):
+            values = series.array
+            return {
+                'name': name,
+                'kind': 'category',
+                'categories': values.categories,
+                **self._publish_array(values.codes)
+            }
+        if pd.api.types.is_string_dtype(dtype) and not series.isna().any():
+            values = pd.Categorical(series)
+            return {
+                'name': name,
+                'kind': 'category',
+                'categories': values.categories,
+                **self._publish_array(values.codes)
+            }
+        # Tipos de extensión (enteros con nulos, fechas con zona...) viajan serializados
+        logger.debug(f"Columna {name} ({dtype}) no se publica en memoria compartida")
+        return {'name': name, 'kind': 'pickled', 'values': series.to_numpy()}
+
+    def _publish_index(self, index: pd.Index) -> Dict[str, Any]:
+        if isinstance(index, pd.RangeIndex):
+            return {'kind': 'range', 'start': index.start, 'stop': index.stop, 'step': index.step}
+        if isinstance(index.dtype, np.dtype) and index.dtype.kind in 'biufmM':
+            return {'kind': 'array', **self._publish_array(index.to_numpy())}
+        return {'kind': 'pickled', 'values': index}
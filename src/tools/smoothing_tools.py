@@ -0,0 +1,323 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from ..models.inventory_models import InventoryItem, InventoryPrediction
+from .series_stats import SeriesGroups
+from .forecast_cache import ForecastCache, default_forecast_cache, history_fingerprint
+
+SEASON = 7
+
+class SmoothingStates:
+    """
+    Estado final de Holt-Winters por serie: nivel, pendiente y estaciones
+    (series × día). La pendiente se actualiza una vez por observación, así que
+    el horizonte se mide en pasos de `step` días (separación media entre
+    observaciones de la serie)
+    """
+
+    def __init__(
+        self,
+        keys: pd.DataFrame,
+        level: np.ndarray,
+        trend: np.ndarray,
+        season: np.ndarray,
+        alpha: np.ndarray,
+        beta: np.ndarray,
+        gamma: np.ndarray,
+        sse: np.ndarray,
+        observations: np.ndarray,
+        end: np.ndarray,
+        step: Optional[np.ndarray] = None
+    ):
+        self.keys = keys
+        self.level = level
+        self.trend = trend
+        self.season = season
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.sse = sse
+        self.observations = observations
+        # Último día observado de cada serie
+        self.end = np.broadcast_to(np.asarray(end, dtype='datetime64[D]'), level.shape).copy()
+        self.step = np.ones(level.shape) if step is None else np.asarray(step, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.level)
+
+    @property
+    def sigma(self) -> np.ndarray:
+        """Error cuadrático medio a un paso, como desviación de los residuos"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.observations > 0, np.sqrt(self.sse / self.observations), 0.0)
+
+    def forecast(self, target_date: datetime) -> pd.DataFrame:
+        """Predicción h días después del último día observado de cada serie (h >= 1)"""
+        target = np.datetime64(pd.Timestamp(target_date).date(), 'D')
+        days = np.maximum((target - self.end) / np.timedelta64(1, 'D'), 1)
+        horizon = days / self.step
+        weekday = pd.Timestamp(target).weekday()
+
+        baseline = self.level + horizon * self.trend
+        predicted = np.maximum(baseline + self.season[:, weekday], 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            trend_factor = np.where(self.level > 0, baseline / self.level, 1.0)
+            seasonality_factor = np.where(baseline > 0, predicted / baseline, 1.0)
+        sigma = self.sigma
+        lower = predicted - 2 * sigma
+
+        index = (
+            pd.MultiIndex.from_frame(self.keys) if self.keys.shape[1] > 1
+            else pd.Index(self.keys.iloc[:, 0])
+        )
+        return pd.DataFrame({
+            'predicted_demand': np.round(predicted, 2),
+            'lower_bound': np.round(np.where(lower > 0, lower, 0.0), 2),
+            'upper_bound': np.round(predicted + 2 * sigma, 2),
+            'trend_factor': np.round(trend_factor, 4),
+            'seasonality_factor': np.round(seasonality_factor, 4),
+            'alpha': self.alpha,
+            'beta': self.beta,
+            'gamma': self.gamma,
+            'observations': self.observations
+        }, index=index)
+
+class ExponentialSmoothingTools:
+    """
+    Holt-Winters aditivo con estacionalidad semanal, ajustado a todas las
+    series a la vez: cada paso de tiempo actualiza arrays (series × rejilla) y
+    (series × rejilla × 7), y cada serie se queda con los parámetros de la
+    rejilla con menor error cuadrático a un paso
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ForecastCache] = None,
+        alphas: Sequence[float] = (0.1, 0.3, 0.6),
+        betas: Sequence[float] = (0.0, 0.05),
+        gammas: Sequence[float] = (0.1, 0.3)
+    ):
+        self.cache = cache if cache is not None else default_forecast_cache
+        self.alphas = tuple(alphas)
+        self.betas = tuple(betas)
+        self.gammas = tuple(gammas)
+
+    def predict_demand(
+        self,
+        historical_data: pd.DataFrame,
+        items: Dict[str, InventoryItem],
+        target_date: datetime,
+        location: str
+    ) -> Dict[str, InventoryPrediction]:
+        """Misma interfaz que PredictionTools.predict_demand"""
+        if historical_data is None or historical_data.empty:
+            raise ValueError("Se requiere historical_data válido")
+
+        key = self.cache.make_key(
+            'holt_winters',
+            location,
+            items.keys(),
+            target_date,
+            (self.alphas, self.betas, self.gammas),
+            history_fingerprint(historical_data, ['item_id', 'units_sold', 'date'])
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        frame = self.predict_demand_frame(historical_data, items, target_date)
+        predictions = {}
+        for row in frame.itertuples():
+            predictions[row.Index] = InventoryPrediction(
+                predicted_demand=row.predicted_demand,
+                confidence_range=(row.lower_bound, row.upper_bound),
+                trend_factor=row.trend_factor,
+                seasonality_factor=row.seasonality_factor
+            )
+
+        self.cache.put(key, predictions)
+        return predictions
+
+    def predict_demand_frame(
+        self,
+        historical_data: pd.DataFrame,
+        items: Dict[str, InventoryItem],
+        target_date: datetime
+    ) -> pd.DataFrame:
+        data = historical_data[historical_data['item_id'].isin(list(items.keys()))]
+        frame = self.fit(data, ['item_id']).forecast(target_date)
+        return frame.reindex([item_id for item_id in items if item_id in frame.index])
+
+    def fit(self, data: pd.DataFrame, keys: List[str]) -> SmoothingStates:
+        """Ajusta cada serie (definida por `keys`) sobre sus totales diarios"""
+        groups, first_day, totals, observed, weekdays = self._calendar(data, keys)
+        size = len(groups)
+
+        # Estado inicial: media diaria y desviación media por día de la semana
+        counts = observed.sum(axis=1)
+        first, last = _observed_bounds(observed)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            level0 = np.where(counts > 0, totals.sum(axis=1) / counts, 0.0)
+        rows, columns = np.nonzero(observed)
+        slot = rows * SEASON + weekdays[columns]
+        deviation = np.bincount(slot, weights=totals[rows, columns] - level0[rows], minlength=size * SEASON)
+        slot_counts = np.bincount(slot, minlength=size * SEASON)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            season0 = np.where(slot_counts > 0, deviation / slot_counts, 0.0).reshape(size, SEASON)
+
+        alpha, beta, gamma = (
+            grid.ravel() for grid in np.meshgrid(self.alphas, self.betas, self.gammas, indexing='ij')
+        )
+        level = np.repeat(level0[:, None], len(alpha), axis=1)
+        trend = np.zeros_like(level)
+        season = np.repeat(season0[:, None, :], len(alpha), axis=1)
+        sse = np.zeros_like(level)
+        _smooth(totals, observed, weekdays, level, trend, season, sse, alpha, beta, gamma)
+
+        best = np.argmin(sse, axis=1) if len(alpha) else np.zeros(size, dtype=int)
+        series = np.arange(size)
+        return SmoothingStates(
+            keys=groups.keys,
+            level=level[series, best],
+            trend=trend[series, best],
+            season=season[series, best],
+            alpha=alpha[best],
+            beta=beta[best],
+            gamma=gamma[best],
+            sse=sse[series, best],
+            observations=counts,
+            end=first_day + last,
+            step=np.where(counts > 1, (last - first) / np.maximum(counts - 1, 1), 1.0)
+        )
+
+    def resume(self, states: SmoothingStates, data: pd.DataFrame, keys: List[str]) -> SmoothingStates:
+        """
+        Continúa la recursión de estados ya ajustados con filas nuevas (posteriores
+        a su último día), manteniendo los parámetros elegidos de cada serie.
+        Las claves de `data` deben estar en `states`
+        """
+        groups, first_day, totals, observed, weekdays = self._calendar(data, keys)
+        index = (
+            pd.MultiIndex.from_frame(states.keys) if len(keys) > 1
+            else pd.Index(states.keys[keys[0]])
+        )
+        target = (
+            pd.MultiIndex.from_frame(groups.keys) if len(keys) > 1
+            else pd.Index(groups.keys[keys[0]])
+        )
+        positions = index.get_indexer(target)
+        if (positions < 0).any():
+            raise KeyError("resume solo admite series ya ajustadas")
+
+        # Días ya incorporados de cada serie quedan fuera del calendario nuevo
+        day = first_day + np.arange(totals.shape[1])
+        observed &= day[None, :] > states.end[positions][:, None]
+
+        level = states.level[positions][:, None].copy()
+        trend = states.trend[positions][:, None].copy()
+        season = states.season[positions][:, None, :].copy()
+        sse = states.sse[positions][:, None].copy()
+        _smooth(
+            totals, observed, weekdays, level, trend, season, sse,
+            states.alpha[positions][:, None],
+            states.beta[positions][:, None],
+            states.gamma[positions][:, None]
+        )
+
+        result = SmoothingStates(
+            keys=states.keys,
+            level=states.level.copy(),
+            trend=states.trend.copy(),
+            season=states.season.copy(),
+            alpha=states.alpha,
+            beta=states.beta,
+            gamma=states.gamma,
+            sse=states.sse.copy(),
+            observations=states.observations.copy(),
+            end=states.end,
+            step=states.step.copy()
+        )
+        result.level[positions] = level[:, 0]
+        result.trend[positions] = trend[:, 0]
+        result.season[positions] = season[:, 0]
+        result.sse[positions] = sse[:, 0]
+
+        # Separación media entre observaciones con los días nuevos
+        added = observed.sum(axis=1)
+        grown = np.flatnonzero(added > 0)
+        if len(grown):
+            _, last = _observed_bounds(observed[grown])
+            new_end = first_day + last
+            series = positions[grown]
+            before = states.observations[series]
+            span = states.step[series] * np.maximum(before - 1, 0) + (
+                (new_end - states.end[series]) / np.timedelta64(1, 'D')
+            )
+            total = before + added[grown]
+            result.step[series] = np.where(total > 1, span / np.maximum(total - 1, 1), 1.0)
+            result.end[series] = new_end
+        result.observations[positions] += added
+        return result
+
+    def _calendar(self, data: pd.DataFrame, keys: List[str]):
+        """Calendario denso (series × días) con totales diarios y máscara de observación"""
+        if 'date' not in data.columns:
+            raise ValueError("Holt-Winters requiere la columna date")
+        groups = SeriesGroups(data, keys)
+        size = len(groups)
+        if not size:
+            return groups, np.datetime64('NaT', 'D'), np.zeros((0, 0)), np.zeros((0, 0), dtype=bool), np.zeros(0, dtype=int)
+
+        sales = groups.values('units_sold')
+        days = groups.dates.astype('datetime64[D]')
+        first_day = days.min()
+        day = (days - first_day).astype(np.int64)
+        span = int(day.max()) + 1
+
+        cell = groups.codes * span + day
+        totals = np.bincount(cell, weights=sales, minlength=size * span).reshape(size, span)
+        observed = np.bincount(cell, minlength=size * span).reshape(size, span) > 0
+        weekdays = (pd.Timestamp(first_day).weekday() + np.arange(span)) % SEASON
+        return groups, first_day, totals, observed, weekdays
+
+def _observed_bounds(observed: np.ndarray):
+    """Primera y última columna observada de cada fila (cada fila tiene alguna)"""
+    span = observed.shape[1]
+    return observed.argmax(axis=1), span - 1 - observed[:, ::-1].argmax(axis=1)
+
+def _smooth(
+    totals: np.ndarray,
+    observed: np.ndarray,
+    weekdays: np.ndarray,
+    level: np.ndarray,
+    trend: np.ndarray,
+    season: np.ndarray,
+    sse: np.ndarray,
+    alpha: np.ndarray,
+    beta: np.ndarray,
+    gamma: np.ndarray
+) -> None:
+    """
+    Recursión aditiva de Holt-Winters, in situ sobre estados (series × rejilla)
+    y estaciones (series × rejilla × 7). Los días sin observación no actualizan
+    """
+    per_series = np.ndim(alpha) == 2
+    for t in range(totals.shape[1]):
+        present = observed[:, t]
+        if not present.any():
+            continue
+        rows = slice(None) if present.all() else np.flatnonzero(present)
+        a, b, g = (alpha[rows], beta[rows], gamma[rows]) if per_series else (alpha, beta, gamma)
+        w = weekdays[t]
+        y = totals[rows, t][:, None]
+        previous_level = level[rows]
+        previous_trend = trend[rows]
+        previous_season = season[rows, :, w]
+
+        error = y - (previous_level + previous_trend + previous_season)
+        sse[rows] += error * error
+        new_level = a * (y - previous_season) + (1 - a) * (previous_level + previous_trend)
+        trend[rows] = b * (new_level - previous_level) + (1 - b) * previous_trend
+        season[rows, :, w] = g * (y - new_level) + (1 - g) * previous_season
+        level[rows] = new_level
@@ -0,0 +1,150 @@
+import os
+import logging
+from typing import Iterator, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from .demand_prediction_tools import DemandPredictionTools
+from .forecast_state import ForecastState
+
+logger = logging.getLogger(__name__)
+
+class StreamingHistory:
+    """
+    Lectura por bloques de historiales que no caben en memoria: cada bloque se
+    reduce a totales diarios por (ubicación, item) y los parciales se compactan
+    cuando superan el presupuesto de memoria configurado. El mismo camino
+    sirve para los archivos de ejemplo y para exportaciones de varios GB.
+    El presupuesto es orientativo: fija el tamaño de los bloques y cuándo se
+    compacta, pero los totales compactados se mantienen en memoria aunque lo
+    superen (con un aviso)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        memory_budget_mb: float = 256,
+        keys: Sequence[str] = ('location', 'item_id'),
+        value_columns: Sequence[str] = ('units_sold',),
+        date_column: str = 'date'
+    ):
+        if memory_budget_mb <= 0:
+            raise ValueError("memory_budget_mb debe ser positivo")
+        self.path = path
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.keys = list(keys)
+        self.value_columns = list(value_columns)
+        self.date_column = date_column
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.date_column] + self.keys + self.value_columns
+
+    def chunk_rows(self, sample_rows: int = 1000) -> int:
+        """Filas por bloque según el tamaño en memoria de una muestra del archivo"""
+        sample = pd.read_csv(self.path, usecols=self.columns, nrows=sample_rows)
+        if sample.empty:
+            return sample_rows
+        row_bytes = sample.memory_usage(index=False, deep=True).sum() / len(sample)
+        # Margen para las copias temporales del parseo y la agregación del bloque
+        return max(1000, int(self.memory_budget / (4 * row_bytes)))
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        reader = pd.read_csv(self.path, usecols=self.columns, chunksize=self.chunk_rows())
+        for chunk in reader:
+            yield chunk
+
+    def daily_totals(self) -> pd.DataFrame:
+        """
+        Totales diarios por serie (date, claves, valores y rows = filas de origen),
+        ordenados por (claves, fecha)
+        """
+        group_columns = self.keys + [self.date_column]
+        # Memoria aproximada de una fila agregada: claves, fecha, valores y conteo
+        aggregate_row_bytes = 8 * (len(group_columns) + len(self.value_columns) + 1) + 32 * len(self.keys)
+        part_limit = max(1, self.memory_budget // (2 * aggregate_row_bytes))
+
+        parts: List[pd.DataFrame] = []
+        pending = 0
+        for chunk in self.chunks():
+            chunk[self.date_column] = pd.to_datetime(chunk[self.date_column]).dt.normalize()
+            parts.append(self._reduce(chunk.assign(rows=1), group_columns))
+            pending += len(parts[-1])
+            if pending > part_limit and len(parts) > 1:
+                parts = [self._reduce(pd.concat(parts, ignore_index=True), group_columns)]
+                pending = len(parts[0])
+                if pending > part_limit:
+                    # No hay dónde volcarlos: se sigue por encima del presupuesto,
+                    # compactando de nuevo cuando los parciales dupliquen los totales
+                    logger.warning(
+                        f"Los totales diarios de {os.path.basename(self.path)} superan el presupuesto de memoria"
+                    )
+                    part_limit = pending * 2
+
+        if not parts:
+            return pd.DataFrame(columns=group_columns + self.value_columns + ['rows'])
+        totals = self._reduce(pd.concat(parts, ignore_index=True), group_columns)
+        totals = totals.sort_values(group_columns, kind='stable').reset_index(drop=True)
+        for key in self.keys:
+            totals[key] = totals[key].astype('category')
+        return totals[[self.date_column] + self.keys + self.value_columns + ['rows']]
+
+    def _reduce(self, data: pd.DataFrame, group_columns: List[str]) -> pd.DataFrame:
+        return data.groupby(group_columns, sort=False, observed=True, as_index=False)[
+            self.value_columns + ['rows']
+        ].sum()
+
+    def series_statistics(
+        self,
+        tools: Optional[DemandPredictionTools] = None,
+        totals: Optional[pd.DataFrame] = None,
+        value_column: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Media, desviación y tendencia diarias de cada serie (formato de
+        series_statistics) sobre `value_column`, por defecto la primera columna
+        de valores
+        """
+        value_column = self._value_column(value_column)
+        tools = tools or DemandPredictionTools()
+        totals = totals if totals is not None else self.daily_totals()
+        data = pd.DataFrame({
+            'date': totals[self.date_column],
+            **{key: totals[key] for key in self.keys},
+            'units_sold': totals[value_column]
+        })
+        return tools.series_statistics(data, self.keys)
+
+    def _value_column(self, value_column: Optional[str]) -> str:
+        value_column = value_column or self.value_columns[0]
+        if value_column not in self.value_columns:
+            raise ValueError(f"Columna de valores desconocida: {value_column}")
+        return value_column
+
+    def update_state(
+        self,
+        state: Optional[ForecastState] = None,
+        totals: Optional[pd.DataFrame] = None,
+        value_column: Optional[str] = None
+    ) -> ForecastState:
+        """
+        Alimenta un ForecastState con los totales diarios, en orden cronológico.
+        Las dos claves hacen de (ubicación, item) y `value_column` (por defecto
+        la primera columna de valores) de ventas
+        """
+        if len(self.keys) != 2:
+            raise ValueError("ForecastState necesita exactamente dos claves (ubicación, item)")
+        value_column = self._value_column(value_column)
+        state = state or ForecastState()
+        totals = totals if totals is not None else self.daily_totals()
+        if totals.empty:
+            return state
+        location_key, item_key = self.keys
+        order = np.argsort(totals[self.date_column].to_numpy(), kind='stable')
+        ordered = totals.iloc[order]
+        state.update(pd.DataFrame({
+            'date': ordered[self.date_column].to_numpy(),
+            'location': ordered[location_key].to_numpy(dtype=object),
+            'item_id': ordered[item_key].to_numpy(dtype=object),
+            'units_sold': ordered[value_column].to_numpy(dtype=np.float64)
+        }))
+        return state
@@ -0,0 +1,183 @@
+import os
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import yaml
+from ..models.inventory_models import InventoryItem
+
+logger = logging.getLogger(__name__)
+
+# Red por defecto si config.yaml no define transfer_network
+DEFAULT_NETWORK = {
+    'default_cost': 200,
+    'multi_hop': True,
+    'storage_multipliers': {'FROZEN': 1.5, 'REFRIGERATED': 1.3},
+    'routes': [
+        {'from': 'Zurich', 'to': 'Geneva', 'cost': 120},
+        {'from': 'Zurich', 'to': 'Basel', 'cost': 100},
+        {'from': 'Geneva', 'to': 'Basel', 'cost': 150}
+    ]
+}
+
+def get_config_path() -> str:
+    root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    return os.path.join(root, 'data', 'config.yaml')
+
+class TransferNetwork:
+    """
+    Red de transferencias entre locales (y almacenes intermedios) compilada a
+    una matriz densa (L x L) de costes base. Una ruta vale en los dos sentidos
+    salvo que se declare también el inverso. Con multi_hop el coste de cada
+    par es el del camino más barato por la red (Floyd-Warshall); default_cost
+    solo se cobra entre locales sin ruta ni camino. La matriz se recalcula
+    solo cuando cambia alguna ruta. Los recargos por tipo de
+    almacenamiento se aplican como un vector por item
+    """
+
+    def __init__(
+        self,
+        routes: Dict[Tuple[str, str], float],
+        default_cost: float = 200,
+        storage_multipliers: Optional[Dict[str, float]] = None,
+        multi_hop: bool = True
+    ):
+        self.routes = dict(routes)
+        self.default_cost = float(default_cost)
+        self.storage_multipliers = dict(
+            DEFAULT_NETWORK['storage_multipliers'] if storage_multipliers is None else storage_multipliers
+        )
+        self.multi_hop = multi_hop
+        self._compile()
+
+    def set_route(self, from_loc: str, to_loc: str, cost: float) -> None:
+        self.routes[(from_loc, to_loc)] = float(cost)
+        self._compiled = False
+
+    def remove_route(self, from_loc: str, to_loc: str) -> None:
+        del self.routes[(from_loc, to_loc)]
+        self._compiled = False
+
+    def _compile(self) -> None:
+        self.locations: List[str] = []
+        for pair in self.routes:
+            for location in pair:
+                if location not in self.locations:
+                    self.locations.append(location)
+        self.index = {location: position for position, location in enumerate(self.locations)}
+
+        # Aristas declaradas; primero el sentido inverso para que la ruta declarada tenga prioridad
+        size = len(self.locations)
+        edges = np.full((size, size), np.inf)
+        pairs = [(self.index[a], self.index[b], cost) for (a, b), cost in self.routes.items()]
+        for a, b, cost in pairs:
+            edges[b, a] = cost
+        for a, b, cost in pairs:
+            edges[a, b] = cost
+
+        # Siguiente salto de cada camino (-1: sin camino por la red)
+        next_hop = np.where(np.isfinite(edges), np.arange(size)[None, :], -1)
+        if self.multi_hop:
+            np.fill_diagonal(edges, 0.0)
+            np.fill_diagonal(next_hop, np.arange(size))
+            for k in range(size):
+                through = edges[:, k, None] + edges[None, k, :]
+                better = through < edges
+                edges = np.where(better, through, edges)
+                next_hop = np.where(better, next_hop[:, k, None], next_hop)
+
+        # Sin ruta ni camino por la red se cobra default_cost
+        direct = ~np.isfinite(edges)
+        np.fill_diagonal(direct, True)
+        self._direct = direct
+        self._next_hop = next_hop
+
+        # Una fila y columna extra (la última) para locales fuera de la red
+        self._costs = np.full((size + 1, size + 1), self.default_cost)
+        self._costs[:size, :size] = np.where(direct, self.default_cost, edges)
+        self._compiled = True
+
+    def _ensure_compiled(self) -> None:
+        if not self._compiled:
+            self._compile()
+
+    @property
+    def costs(self) -> np.ndarray:
+        self._ensure_compiled()
+        return self._costs
+
+    def route(self, from_loc: str, to_loc: str) -> List[str]:
+        """Locales por los que pasa la transferencia más barata (origen y destino incluidos)"""
+        self._ensure_compiled()
+        a, b = self.index.get(from_loc), self.index.get(to_loc)
+        if a is None or b is None or self._direct[a, b]:
+            return [from_loc, to_loc]
+        path = [from_loc]
+        while a != b:
+            a = int(self._next_hop[a, b])
+            path.append(self.locations[a])
+        return path
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> 'TransferNetwork':
+        """Red a partir de la sección transfer_network de config.yaml"""
+        config = config or DEFAULT_NETWORK
+        routes = {(route['from'], route['to']): float(route['cost']) for route in config.get('routes', [])}
+        return cls(
+            routes,
+            default_cost=config.get('default_cost', DEFAULT_NETWORK['default_cost']),
+            storage_multipliers=config.get('storage_multipliers'),
+            multi_hop=config.get('multi_hop', DEFAULT_NETWORK['multi_hop'])
+        )
+
+    @classmethod
+    def load(cls, config_path: Optional[str] = None) -> 'TransferNetwork':
+        config_path = config_path or get_config_path()
+        try:
+            with open(config_path, 'r') as f:
+                config = yaml.safe_load(f) or {}
+        except OSError as e:
+            logger.warning(f"No se pudo leer {config_path}, se usa la red por defecto: {e}")
+            config = {}
+        return cls.from_config(config.get('transfer_network'))
+
+    def positions(self, locations: Iterable[str]) -> np.ndarray:
+        self._ensure_compiled()
+        outside = len(self.locations)
+        return np.array([self.index.get(location, outside) for location in locations], dtype=np.intp)
+
+    def matrix(
+        self,
+        sources: Sequence[str],
+        destinations: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """Costes base (orígenes x destinos); por defecto entre todos los locales dados"""
+        source_positions = self.positions(sources)
+        destination_positions = source_positions if destinations is None else self.positions(destinations)
+        return self.costs[np.ix_(source_positions, destination_positions)]
+
+    def base_cost(self, from_loc: str, to_loc: str) -> float:
+        costs = self.costs
+        outside = len(self.locations)
+        return float(costs[self.index.get(from_loc, outside), self.index.get(to_loc, outside)])
+
+    def multipliers(self, items: Iterable[InventoryItem]) -> np.ndarray:
+        """Recargo por almacenamiento de cada item"""
+        return np.array(
+            [self.storage_multipliers.get(getattr(item.storage, 'value', item.storage), 1.0) for item in items],
+            dtype=np.float64
+        )
+
+    def transfer_costs(
+        self,
+        sources: Sequence[str],
+        destinations: Sequence[str],
+        items: Sequence[InventoryItem],
+        quantities: Any
+    ) -> np.ndarray:
+        """
+        Coste de transferencia (orígenes x destinos x items) de una sola
+        expresión: base x recargo x (1 + cantidad / 1000). quantities debe
+        poder difundirse a esa forma
+        """
+        base = self.matrix(sources, destinations)
+        return base[:, :, None] * self.multipliers(items)[None, None, :] * (1 + np.asarray(quantities) / 1000)
@@ -0,0 +1,167 @@
+from typing import Tuple
+import numpy as np
+
+def _distances(
+    cost: np.ndarray,
+    flow: np.ndarray,
+    open_sources: np.ndarray,
+    flow_eps: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bellman-Ford vectorizado sobre el grafo residual bipartito: arcos origen ->
+    destino con su coste y arcos inversos destino -> origen (coste negativo)
+    donde ya hay flujo. Parte de los orígenes con oferta disponible
+    """
+    sources, sinks = cost.shape
+    to_source = np.where(open_sources, 0.0, np.inf)
+    to_sink = np.full(sinks, np.inf)
+    returns = flow > flow_eps
+    for _ in range(sources + sinks):
+        new_sink = (to_source[:, None] + cost).min(axis=0)
+        back = np.where(returns, new_sink[None, :] - cost, np.inf).min(axis=1)
+        new_source = np.minimum(to_source, back)
+        if np.array_equal(new_sink, to_sink) and np.array_equal(new_source, to_source):
+            break
+        to_source, to_sink = new_source, new_sink
+    return to_source, to_sink
+
+def solve_transportation(
+    supply: np.ndarray,
+    demand: np.ndarray,
+    cost: np.ndarray
+) -> np.ndarray:
+    """
+    Problema de transporte de coste mínimo (orígenes con oferta, destinos con
+    demanda, coste unitario por par) resuelto por caminos mínimos sucesivos.
+    En cada fase se calculan las distancias con Bellman-Ford y se satura el
+    grafo de arcos de coste reducido cero: primero los envíos directos y
+    después los caminos que desvían flujo ya asignado. Devuelve el flujo
+    (orígenes x destinos); si la oferta no alcanza, queda demanda sin cubrir
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    residual_supply = np.asarray(supply, dtype=np.float64).copy()
+    residual_demand = np.asarray(demand, dtype=np.float64).copy()
+    flow = np.zeros(cost.shape)
+    if not cost.size:
+        return flow
+
+    scale = max(1.0, float(np.abs(cost[np.isfinite(cost)]).max(initial=0.0)))
+    tolerance = 1e-9 * scale
+    flow_eps = 1e-9 * max(1.0, float(residual_demand.max(initial=0.0)))
+
+    while True:
+        open_sources = residual_supply > flow_eps
+        open_sinks = residual_demand > flow_eps
+        if not open_sources.any() or not open_sinks.any():
+            break
+        to_source, to_sink = _distances(cost, flow, open_sources, flow_eps)
+        target = to_sink[open_sinks].min()
+        if not np.isfinite(target):
+            break
+
+        # Arcos de coste reducido cero respecto de las distancias de esta fase
+        with np.errstate(invalid='ignore'):
+            tight = np.abs(to_source[:, None] + cost - to_sink[None, :]) <= tolerance
+        tight &= np.isfinite(cost) & np.isfinite(to_source)[:, None]
+        closest = open_sinks & (to_sink <= target + tolerance)
+
+        # Envíos directos desde orígenes a distancia cero hacia destinos a distancia mínima
+        pending = residual_demand.sum()
+        starts = open_sources & (to_source <= tolerance)
+        for sink in np.flatnonzero(closest):
+            for source in np.flatnonzero(tight[:, sink] & starts):
+                amount = min(residual_supply[source], residual_demand[sink])
+                if amount <= flow_eps:
+                    continue
+                flow[source, sink] += amount
+                residual_supply[source] -= amount
+                residual_demand[sink] -= amount
+                if residual_demand[sink] <= flow_eps:
+                    break
+
+        # Caminos más largos (desvían flujo existente) hasta agotar el grafo admisible
+        while _augment_path(tight, flow, residual_supply, residual_demand, to_source, to_sink,
+                            target, tolerance, flow_eps):
+            pass
+        if residual_demand.sum() >= pending:
+            # Sin avance por redondeo: la fase no encontró ningún camino admisible
+            break
+
+    return flow
+
+def _augment_path(
+    tight: np.ndarray,
+    flow: np.ndarray,
+    residual_supply: np.ndarray,
+    residual_demand: np.ndarray,
+    to_source: np.ndarray,
+    to_sink: np.ndarray,
+    target: float,
+    tolerance: float,
+    flow_eps: float
+) -> bool:
+    """Busca por anchura un camino admisible y envía por él el máximo posible"""
+    sources, sinks = tight.shape
+    frontier = (residual_supply > flow_eps) & (to_source <= tolerance)
+    closest = (residual_demand > flow_eps) & (to_sink <= target + tolerance)
+    if not frontier.any() or not closest.any():
+        return False
+
+    reached_source = frontier.copy()
+    reached_sink = np.zeros(sinks, dtype=bool)
+    source_parent = np.full(sources, -1)
+    sink_parent = np.full(sinks, -1)
+    returns = tight & (flow > flow_eps)
+
+    while frontier.any():
+        candidates = tight[frontier]
+        new_sinks = candidates.any(axis=0) & ~reached_sink
+        if not new_sinks.any():
+            return False
+        sink_parent[new_sinks] = np.flatnonzero(frontier)[candidates[:, new_sinks].argmax(axis=0)]
+        reached_sink |= new_sinks
+
+        found = np.flatnonzero(new_sinks & closest)
+        if len(found):
+            return _push(found[0], sink_parent, source_parent, flow, residual_supply, residual_demand, flow_eps)
+
+        back = returns[:, new_sinks]
+        frontier = back.any(axis=1) & ~reached_source
+        source_parent[frontier] = np.flatnonzero(new_sinks)[back[frontier].argmax(axis=1)]
+        reached_source |= frontier
+    return False
+
+def _push(
+    sink: int,
+    sink_parent: np.ndarray,
+    source_parent: np.ndarray,
+    flow: np.ndarray,
+    residual_supply: np.ndarray,
+    residual_demand: np.ndarray,
+    flow_eps: float
+) -> bool:
+    # Camino alternando arcos directos (origen -> destino) e inversos (destino -> origen)
+    forward = []
+    backward = []
+    current = sink
+    while True:
+        source = sink_parent[current]
+        forward.append((source, current))
+        previous = source_parent[source]
+        if previous < 0:
+            break
+        backward.append((source, previous))
+        current = previous
+
+    amount = min(residual_supply[source], residual_demand[sink])
+    for pair in backward:
+        amount = min(amount, flow[pair])
+    if amount <= flow_eps:
+        return False
+    for pair in forward:
+        flow[pair] += amount
+    for pair in backward:
+        flow[pair] -= amount
+    residual_supply[source] -= amount
+    residual_demand[sink] -= amount
+    return True
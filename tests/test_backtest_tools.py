@@ -0,0 +1,115 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from src.tools.backtest_tools import BacktestTools
+from src.tools.demand_prediction_tools import DemandPredictionTools
+from src.tools.prediction_tools import PredictionTools
+from src.models.sales_prediction import PredictionMetrics
+
+@pytest.fixture
+def sample_history():
+    dates = pd.date_range('2024-03-01', periods=28, freq='D')
+    flat = pd.DataFrame({
+        'date': dates,
+        'location': 'Zurich',
+        'item_id': 'BEEF001',
+        'units_sold': 100
+    })
+    growing = pd.DataFrame({
+        'date': dates,
+        'location': 'Geneva',
+        'item_id': 'BEEF001',
+        'units_sold': range(50, 78)
+    })
+    return pd.concat([flat, growing], ignore_index=True)
+
+def test_backtest_metrics(sample_history):
+    results = BacktestTools().backtest(
+        sample_history,
+        start=datetime(2024, 3, 14),
+        fold_days=7
+    )
+
+    flat = results['prediction'][('Zurich', 'BEEF001')]
+    assert isinstance(flat, PredictionMetrics)
+    assert flat.mae == 0
+    assert flat.accuracy == 1.0
+    assert flat.evaluation_period == '2024-03-15 - 2024-03-28'
+
+    # Los factores de fin de semana penalizan una serie constante
+    assert results['demand'][('Zurich', 'BEEF001')].mae > 0
+    assert results['demand'][('Geneva', 'BEEF001')].mape > 0
+
+def test_backtest_uses_data_up_to_origin(sample_history):
+    frame = BacktestTools().backtest_frame(
+        sample_history,
+        start=datetime(2024, 3, 21),
+        fold_days=7,
+        engines=('demand',)
+    )
+    geneva = frame[frame['location'] == 'Geneva'].iloc[0]
+
+    tools = DemandPredictionTools()
+    train = sample_history[
+        (sample_history['location'] == 'Geneva') & (sample_history['date'] <= '2024-03-21')
+    ]
+    stats = tools.series_statistics(train, ['item_id']).loc['BEEF001']
+    test = sample_history[
+        (sample_history['location'] == 'Geneva') & (sample_history['date'] > '2024-03-21')
+    ]
+    errors = [
+        abs(
+            stats['mean'] * stats['trend']
+            * tools.seasonality_factors.get(day.month, 1.0)
+            * tools.day_factors.get(day.weekday(), 1.0)
+            - actual
+        )
+        for day, actual in zip(test['date'], test['units_sold'])
+    ]
+
+    assert geneva['observations'] == 7
+    assert geneva['mae'] == pytest.approx(sum(errors) / len(errors))
+
+def test_backtest_prediction_matches_prediction_tools(sample_history):
+    frame = BacktestTools().backtest_frame(
+        sample_history,
+        start=datetime(2024, 3, 21),
+        fold_days=7,
+        engines=('prediction',)
+    )
+    geneva = frame[frame['location'] == 'Geneva'].iloc[0]
+
+    train = sample_history[
+        (sample_history['location'] == 'Geneva') & (sample_history['date'] <= '2024-03-21')
+    ]
+    test = sample_history[
+        (sample_history['location'] == 'Geneva') & (sample_history['date'] > '2024-03-21')
+    ]
+    forecast = PredictionTools().series_forecast(train, ['item_id'], datetime(2024, 3, 22)).loc['BEEF001']
+    expected = forecast['mean_sales'] * forecast['seasonality_factor'] * forecast['trend_factor']
+    # series_forecast redondea la tendencia a cuatro decimales
+    assert geneva['mae'] == pytest.approx((test['units_sold'] - expected).abs().mean(), abs=0.01)
+
+def test_backtest_zero_actuals_have_no_mape(sample_history):
+    history = sample_history.copy()
+    zero = (history['location'] == 'Geneva') & (history['date'] > '2024-03-14')
+    history.loc[zero, 'units_sold'] = 0
+
+    results = BacktestTools().backtest(history, start=datetime(2024, 3, 14), fold_days=7)
+
+    for engine in ('prediction', 'demand'):
+        geneva = results[engine][('Geneva', 'BEEF001')]
+        # Predicciones grandes contra ventas nulas: error sin porcentaje definido
+        assert geneva.mae > 0
+        assert np.isnan(geneva.mape)
+        assert np.isnan(geneva.accuracy)
+    assert results['prediction'][('Zurich', 'BEEF001')].accuracy == 1.0
+
+def test_backtest_unknown_engine(sample_history):
+    with pytest.raises(ValueError):
+        BacktestTools().backtest(sample_history, engines=('arima',))
+
+def test_backtest_requires_training_rows(sample_history):
+    with pytest.raises(ValueError):
+        BacktestTools().backtest(sample_history, start=datetime(2024, 2, 20), min_train=0)
@@ -0,0 +1,143 @@
+import os
+import pickle
+import pytest
+from src.tools.catalog_snapshot import CatalogSnapshot, CatalogCompileError, compile_catalog, _parse_source
+from src.models.inventory_models import InventoryItem
+
+CATALOG = '''
+from src.models.inventory_models import InventoryItem, ItemCategory, StorageCondition
+
+INVENTORY_ITEMS = {
+    "BUN001": InventoryItem(
+        id="BUN001",
+        name="Classic Burger Buns",
+        category=ItemCategory.PERISHABLE,
+        storage=StorageCondition.ROOM_TEMP,
+        unit="piece",
+        min_level=200,
+        max_level=800,
+        reorder_point=300,
+        lead_time_days=2,
+        shelf_life_days=5,
+        cost_per_unit=0.75,
+        supplier_id="LOCAL_BAKERY"
+    ),
+    "SUP001": InventoryItem(
+        id="SUP001",
+        name="Eco Packaging",
+        category="SUPPLIES",
+        storage="ROOM_TEMP",
+        unit="piece",
+        min_level=500,
+        max_level=2000,
+        reorder_point=750,
+        lead_time_days=5,
+        shelf_life_days=None,
+        cost_per_unit=0.45,
+        supplier_id="ECO_SUPPLIES"
+    )
+}
+
+BURGER_RECIPES = {
+    "CLASSIC": {"BUN001": 1, "SUP001": 1}
+}
+'''
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = tmp_path / 'catalog.py'
+    path.write_text(CATALOG)
+    return str(path)
+
+def test_compile_without_executing(catalog_path):
+    compiled = compile_catalog(catalog_path)
+
+    assert compiled['keys'] == ['BUN001', 'SUP001']
+    assert compiled['columns']['storage'] == ['ROOM_TEMP', 'ROOM_TEMP']
+    assert compiled['columns']['shelf_life_days'] == [5, None]
+    assert compiled['recipes'] == {'CLASSIC': {'BUN001': 1, 'SUP001': 1}}
+
+def test_items_are_built_lazily(catalog_path, tmp_path):
+    snapshot = CatalogSnapshot.load(catalog_path, str(tmp_path / 'cache'))
+
+    assert snapshot.items._built == {}
+    item = snapshot.items['SUP001']
+    assert isinstance(item, InventoryItem)
+    assert item.shelf_life_days is None
+    assert item.lead_time_days == 5 and isinstance(item.lead_time_days, int)
+    assert list(snapshot.items._built) == ['SUP001']
+    assert snapshot.items['SUP001'] is item
+    assert list(snapshot.column('cost_per_unit')) == [0.75, 0.45]
+
+def test_snapshot_reused_until_source_changes(catalog_path, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    CatalogSnapshot.load(catalog_path, cache_dir)
+    stored = os.listdir(cache_dir)
+    assert len(stored) == 1
+
+    assert CatalogSnapshot.load(catalog_path, cache_dir).recipes == {'CLASSIC': {'BUN001': 1, 'SUP001': 1}}
+
+    with open(catalog_path, 'w') as f:
+        f.write(CATALOG.replace('"CLASSIC": {"BUN001": 1, "SUP001": 1}', '"PLAIN": {"BUN001": 1}'))
+    stat = os.stat(catalog_path)
+    os.utime(catalog_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    snapshot = CatalogSnapshot.load(catalog_path, cache_dir)
+    assert snapshot.recipes == {'PLAIN': {'BUN001': 1}}
+    assert os.listdir(cache_dir) == stored
+
+def test_non_literal_catalog_falls_back_to_import(tmp_path):
+    path = tmp_path / 'dynamic.py'
+    path.write_text(
+        'from src.models.inventory_models import InventoryItem\n'
+        'INVENTORY_ITEMS = {}\n'
+        'for i in range(3):\n'
+        '    INVENTORY_ITEMS[f"ITEM{i}"] = InventoryItem(id=f"ITEM{i}", name="x", category="c", '
+        'storage="FROZEN", unit="kg", min_level=1, max_level=2, reorder_point=1, '
+        'lead_time_days=1, cost_per_unit=1.0, supplier_id="s")\n'
+    )
+    snapshot = CatalogSnapshot.load(str(path), str(tmp_path / 'cache'))
+
+    assert snapshot.keys == ['ITEM0', 'ITEM1', 'ITEM2']
+    assert snapshot.recipes == {}
+
+@pytest.mark.parametrize('suffix, keys', [
+    (
+        'INVENTORY_ITEMS.update({"BUN002": INVENTORY_ITEMS["BUN001"].model_copy(update={"id": "BUN002"})})\n',
+        ['BUN001', 'SUP001', 'BUN002']
+    ),
+    ('INVENTORY_ITEMS.pop("SUP001")\n', ['BUN001'])
+])
+def test_mutating_statements_fall_back_to_import(tmp_path, suffix, keys):
+    path = tmp_path / 'catalog.py'
+    # Sin los enums del catálogo de ejemplo, para que importlib pueda ejecutarlo
+    source = (
+        CATALOG.replace(', ItemCategory, StorageCondition', '')
+        .replace('ItemCategory.PERISHABLE', '"PERISHABLE"')
+        .replace('StorageCondition.ROOM_TEMP', '"ROOM_TEMP"')
+    )
+    path.write_text('"""Catálogo"""\n' + source + suffix)
+
+    with pytest.raises(CatalogCompileError):
+        _parse_source(str(path))
+    assert CatalogSnapshot.load(str(path), str(tmp_path / 'cache')).keys == keys
+
+def test_items_must_be_inventory_item_calls(tmp_path):
+    path = tmp_path / 'catalog.py'
+    path.write_text(CATALOG.replace('"SUP001": InventoryItem(', '"SUP001": dict('))
+
+    with pytest.raises(CatalogCompileError):
+        _parse_source(str(path))
+
+def test_docstrings_are_allowed(tmp_path):
+    path = tmp_path / 'catalog.py'
+    path.write_text('"""Catálogo"""\n' + CATALOG)
+
+    assert list(_parse_source(str(path))['items']) == ['BUN001', 'SUP001']
+
+def test_lazy_items_pickle_as_dict(catalog_path, tmp_path):
+    snapshot = CatalogSnapshot.load(catalog_path, str(tmp_path / 'cache'))
+    restored = pickle.loads(pickle.dumps(snapshot.items))
+
+    assert type(restored) is dict
+    assert restored['BUN001'] == snapshot.items['BUN001']
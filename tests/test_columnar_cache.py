@@ -0,0 +1,60 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+from src.tools.columnar_cache import ColumnarCache
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'inventory_data.csv'
+    pd.DataFrame({
+        'date': ['2024-11-01', '2024-11-01', '2024-11-02'],
+        'location': ['Zurich', 'Geneva', 'Zurich'],
+        'item_id': ['BEEF001', 'BEEF002', 'BEEF001'],
+        'units_sold': [120, 40, 95],
+        'stock_value': [2025.0, 410.5, 1800.0],
+        'supplier': ['Swiss Meats', None, 'Swiss Meats']
+    }).to_csv(path, index=False)
+    return str(path)
+
+@pytest.fixture
+def cache(tmp_path):
+    return ColumnarCache(str(tmp_path / 'cache'))
+
+def test_first_load_converts_and_second_hits(cache, csv_path):
+    first = cache.load(csv_path)
+    second = cache.load(csv_path)
+
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hits'] == 1
+    pd.testing.assert_frame_equal(first, second)
+
+def test_typed_columns(cache, csv_path):
+    frame = cache.load(csv_path)
+
+    assert pd.api.types.is_datetime64_any_dtype(frame['date'])
+    assert isinstance(frame['location'].dtype, pd.CategoricalDtype)
+    assert isinstance(frame['item_id'].dtype, pd.CategoricalDtype)
+    assert frame['units_sold'].tolist() == [120, 40, 95]
+    assert frame['supplier'].isna().tolist() == [False, True, False]
+    assert list(frame.loc[frame['location'] == 'Zurich', 'units_sold']) == [120, 95]
+
+def test_source_change_invalidates(cache, csv_path):
+    cache.load(csv_path)
+    with open(csv_path, 'a') as f:
+        f.write('2024-11-03,Basel,BEEF002,12,100.0,Plant Foods\n')
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    frame = cache.load(csv_path)
+
+    assert cache.stats()['misses'] == 2
+    assert len(frame) == 4
+    assert 'Basel' in frame['location'].cat.categories
+
+def test_loaded_frame_is_writable(cache, csv_path):
+    cache.load(csv_path)
+    frame = cache.load(csv_path)
+    frame.loc[0, 'units_sold'] = 0
+
+    assert cache.load(csv_path).loc[0, 'units_sold'] == 120
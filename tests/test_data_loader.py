@@ -0,0 +1,44 @@
+import copy
+import pickle
+import pytest
+from src.tools import data_loader
+from src.models.inventory_models import InventoryItem, InventoryLevel
+
+@pytest.fixture
+def scenarios():
+    return data_loader.load_test_scenarios()
+
+def test_scenarios_are_loaded_once(scenarios):
+    assert data_loader.load_test_scenarios() is scenarios
+    assert data_loader.get_scenario('Zurich') is scenarios['Zurich']
+
+def test_scenarios_hold_models(scenarios):
+    sales_data = scenarios['Zurich']['sales_data']
+    levels = sales_data['inventory_levels']
+    items = sales_data['items']
+
+    assert isinstance(levels['meat'], InventoryLevel)
+    assert levels['meat'].current_quantity == 4.5
+    assert levels['meat'].available_quantity == 4.5
+    assert isinstance(items['meat'], InventoryItem)
+    assert items['meat'].id == 'meat_id'
+    # Una sola marca de tiempo por carga
+    assert len({level.last_updated for level in levels.values()}) == 1
+
+def test_location_views_are_read_only(scenarios):
+    zurich = scenarios['Zurich']
+    with pytest.raises(TypeError):
+        zurich['sales_data'] = {}
+    with pytest.raises(TypeError):
+        zurich['sales_data']['peak_hours'].append('22:00')
+    with pytest.raises(TypeError):
+        scenarios.pop('Basel')
+
+def test_copies_are_plain_and_mutable(scenarios):
+    editable = copy.deepcopy(scenarios['Zurich'])
+    editable['sales_data']['peak_hours'].append('22:00')
+
+    assert type(editable) is dict
+    assert '22:00' not in scenarios['Zurich']['sales_data']['peak_hours']
+    assert pickle.loads(pickle.dumps(scenarios['Geneva'])) == scenarios['Geneva']
+    assert str(scenarios['Zurich']).startswith('{')
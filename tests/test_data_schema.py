@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.tools.data_schema import SCHEMAS, apply_schema, memory_report
+from src.tools.columnar_cache import ColumnarCache
+
+@pytest.fixture
+def staff():
+    return pd.DataFrame({
+        'location': ['Zurich', 'Geneva', 'Zurich'],
+        'staff_count': [12, 8, 10],
+        'efficiency_score': [0.85, 0.9, 0.8],
+        'training_completed': [True, False, True],
+        'department': ['kitchen', 'service', 'kitchen']
+    })
+
+def test_apply_schema_dtypes(staff):
+    typed = apply_schema(staff, SCHEMAS['staff_metrics.csv'])
+
+    assert isinstance(typed['location'].dtype, pd.CategoricalDtype)
+    assert isinstance(typed['department'].dtype, pd.CategoricalDtype)
+    assert typed['staff_count'].dtype == np.int32
+    assert typed['efficiency_score'].dtype == np.float32
+    assert typed['training_completed'].dtype == bool
+    # El DataFrame original no se modifica
+    assert staff['staff_count'].dtype == np.int64
+
+def test_unconvertible_columns_are_kept():
+    frame = pd.DataFrame({
+        'units': [1.0, np.nan, 3.0],
+        'big': [1, 2, 2 ** 40],
+        'flag': [0, 1, 2]
+    })
+    typed = apply_schema(frame, {'units': 'int32', 'big': 'int32', 'flag': 'bool'})
+
+    assert typed.dtypes.tolist() == frame.dtypes.tolist()
+
+def test_fractional_values_are_not_truncated():
+    frame = pd.DataFrame({'hours_worked': [160.5, 152.0], 'overtime_hours': [8.0, 12.0], 'units': [1.25, 2.0], 'whole': [3.0, 4.0]})
+    typed = apply_schema(frame, {**SCHEMAS['staff_metrics.csv'], 'units': 'int32', 'whole': 'int32'})
+
+    assert typed['hours_worked'].tolist() == [160.5, 152.0]
+    assert typed['hours_worked'].dtype == np.float32
+    assert typed['units'].tolist() == [1.25, 2.0]
+    assert typed['units'].dtype == np.float64
+    # Decimales exactos sí caben en un entero
+    assert typed['whole'].dtype == np.int32
+
+def test_memory_report(staff):
+    report = memory_report(staff, apply_schema(staff, SCHEMAS['staff_metrics.csv']))
+
+    assert report['rows'] == 3
+    assert report['bytes_after'] < report['bytes_before']
+    assert report['saved_pct'] > 0
+
+def test_cache_applies_schema_and_reports(tmp_path, staff):
+    path = tmp_path / 'staff_metrics.csv'
+    staff.to_csv(path, index=False)
+    cache = ColumnarCache(str(tmp_path / 'cache'))
+
+    cache.load(str(path))
+    frame = cache.load(str(path))
+
+    assert frame['staff_count'].dtype == np.int32
+    assert isinstance(frame['department'].dtype, pd.CategoricalDtype)
+    report = cache.memory_report()
+    assert report.loc['staff_metrics.csv', 'bytes_after'] < report.loc['staff_metrics.csv', 'bytes_before']
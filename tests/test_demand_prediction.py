@@ -1,5 +1,6 @@
 import pytest
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from src.tools.demand_prediction_tools import DemandPredictionTools
 from src.models.inventory_models import InventoryItem
@@ -52,4 +53,60 @@ def test_predict_demand(sample_historical_data, sample_items):
 def test_calculate_trend(sample_historical_data):
     tools = DemandPredictionTools()
     trend = tools._calculate_trend(sample_historical_data)
-    assert 0.5 <= trend <= 1.5
\ No newline at end of file
+    assert 0.5 <= trend <= 1.5
+def test_calculate_trends_batched(sample_historical_data):
+    tools = DemandPredictionTools()
+    other = sample_historical_data.assign(
+        location='Geneva',
+        units_sold=[140, 120, 100]
+    )
+    flat = sample_historical_data.assign(item_id='BUN001', units_sold=[50, 50, 50])
+    data = pd.concat([sample_historical_data, other, flat], ignore_index=True)
+
+    trends = tools.calculate_trends(data)
+
+    assert trends[('Zurich', 'BEEF001')] == pytest.approx(
+        tools._calculate_trend(sample_historical_data)
+    )
+    assert trends[('Geneva', 'BEEF001')] < 1.0
+    assert trends[('Zurich', 'BUN001')] == 1.0
+
+def test_trend_matches_polyfit(sample_historical_data):
+    tools = DemandPredictionTools()
+    dates = pd.to_datetime(sample_historical_data['date'])
+    days = (dates - dates.min()).dt.days
+    slope = np.polyfit(days, sample_historical_data['units_sold'], 1)[0]
+    expected = 1 + slope * 30 / sample_historical_data['units_sold'].mean()
+
+    assert tools._calculate_trend(sample_historical_data) == pytest.approx(expected)
+
+def test_forecast_horizon_matches_daily_predictions(sample_historical_data, sample_items):
+    tools = DemandPredictionTools()
+    history = pd.concat([
+        sample_historical_data,
+        sample_historical_data.assign(location='Geneva', units_sold=[60, 55, 50])
+    ], ignore_index=True)
+    start = datetime(2024, 12, 1)
+
+    cube = tools.forecast_horizon(
+        history=history,
+        items=sample_items,
+        start=start,
+        days=7,
+        locations=['Zurich', 'Geneva', 'Basel']
+    )
+
+    assert cube.shape == (3, 1, 7)
+    for offset in range(7):
+        day = cube.dates[offset]
+        expected = tools.predict_demand(
+            historical_data=history[history['location'] == 'Geneva'],
+            items=sample_items,
+            target_date=day,
+            location='Geneva'
+        )
+        assert cube.predictions('Geneva', day) == expected
+
+    # Sin historial no hay predicción
+    assert cube.predictions('Basel', start) == {}
+    assert cube.total_demand(2)[0, 0] == pytest.approx(cube.sel('Zurich', 'BEEF001')[:2].sum())
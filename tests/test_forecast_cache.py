@@ -0,0 +1,93 @@
+import pytest
+import pandas as pd
+from datetime import datetime
+from src.tools.forecast_cache import ForecastCache, history_fingerprint
+from src.tools.prediction_tools import PredictionTools
+from src.tools.demand_prediction_tools import DemandPredictionTools
+from src.models.inventory_models import InventoryItem
+
+@pytest.fixture
+def sample_history():
+    return pd.DataFrame({
+        'date': ['2024-11-01', '2024-11-15', '2024-11-30'],
+        'item_id': ['BEEF001'] * 3,
+        'units_sold': [120, 135, 140]
+    })
+
+@pytest.fixture
+def sample_items():
+    return {
+        'BEEF001': InventoryItem(
+            id="BEEF001",
+            name="Swiss Beef Patty",
+            category="MEAT",
+            storage="REFRIGERATED",
+            unit="piece",
+            min_level=150,
+            max_level=600,
+            reorder_point=250,
+            lead_time_days=2,
+            shelf_life_days=4,
+            cost_per_unit=4.50,
+            supplier_id="SWISS_MEAT"
+        )
+    }
+
+def test_shared_cache_hits(sample_history, sample_items):
+    cache = ForecastCache()
+    tools = PredictionTools(cache=cache)
+    demand_tools = DemandPredictionTools(cache=cache)
+
+    for hour in (9, 18):
+        first = tools.predict_demand(sample_history, sample_items, datetime(2024, 12, 1, hour), 'Zurich')
+        demand_tools.predict_demand(sample_history, sample_items, datetime(2024, 12, 1, hour), 'Zurich')
+
+    assert cache.stats()['misses'] == 2
+    assert cache.stats()['hits'] == 2
+    assert first == tools.predict_demand(sample_history, sample_items, datetime(2024, 12, 1), 'Zurich')
+
+def test_history_change_invalidates(sample_history, sample_items):
+    cache = ForecastCache()
+    tools = PredictionTools(cache=cache)
+    before = tools.predict_demand(sample_history, sample_items, datetime(2024, 12, 1), 'Zurich')
+
+    changed = sample_history.copy()
+    changed.loc[2, 'units_sold'] = 200
+    after = tools.predict_demand(changed, sample_items, datetime(2024, 12, 1), 'Zurich')
+
+    assert history_fingerprint(changed) != history_fingerprint(sample_history)
+    assert after['BEEF001'].predicted_demand != before['BEEF001'].predicted_demand
+    assert cache.stats() == {'hits': 0, 'misses': 2, 'entries': 2, 'hit_rate': 0.0}
+
+    # Alternar entre historiales recientes no los desaloja
+    assert tools.predict_demand(sample_history, sample_items, datetime(2024, 12, 1), 'Zurich') == before
+    assert cache.stats()['hits'] == 1
+
+def test_oldest_history_is_evicted(sample_history, sample_items):
+    cache = ForecastCache(fingerprints_per_location=2)
+    tools = PredictionTools(cache=cache)
+    for value in (200, 210, 220):
+        changed = sample_history.copy()
+        changed.loc[2, 'units_sold'] = value
+        tools.predict_demand(changed, sample_items, datetime(2024, 12, 1), 'Zurich')
+
+    assert cache.stats()['entries'] == 2
+
+def test_hits_are_copies(sample_history, sample_items):
+    tools = PredictionTools(cache=ForecastCache())
+    first = tools.predict_demand(sample_history, sample_items, datetime(2024, 12, 1), 'Zurich')
+    demand = first['BEEF001'].predicted_demand
+    first['BEEF001'].predicted_demand = -1
+
+    second = tools.predict_demand(sample_history, sample_items, datetime(2024, 12, 1), 'Zurich')
+    assert second['BEEF001'].predicted_demand == demand
+    second['BEEF001'].predicted_demand = -1
+    assert tools.predict_demand(sample_history, sample_items, datetime(2024, 12, 1), 'Zurich')['BEEF001'].predicted_demand == demand
+
+def test_lru_and_ttl():
+    cache = ForecastCache(max_entries=2, ttl_seconds=0)
+    for i in range(3):
+        cache.put(('engine', f'loc{i}', (), None, (), 'fp'), i)
+
+    assert cache.stats()['entries'] == 2
+    assert cache.get(('engine', 'loc2', (), None, (), 'fp')) is None
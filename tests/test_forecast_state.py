@@ -0,0 +1,97 @@
+import pytest
+import pandas as pd
+from datetime import datetime
+from src.tools.forecast_state import ForecastState
+from src.tools.demand_prediction_tools import DemandPredictionTools
+from src.models.inventory_models import InventoryItem
+
+@pytest.fixture
+def sample_history():
+    return pd.DataFrame({
+        'date': ['2024-11-01', '2024-11-01', '2024-11-02', '2024-11-02', '2024-11-04', '2024-11-04'],
+        'location': ['Zurich', 'Geneva'] * 3,
+        'item_id': ['BEEF001'] * 6,
+        'units_sold': [120, 80, 135, 75, 150, 90]
+    })
+
+@pytest.fixture
+def sample_items():
+    return {
+        'BEEF001': InventoryItem(
+            id="BEEF001",
+            name="Swiss Beef Patty",
+            category="MEAT",
+            storage="REFRIGERATED",
+            unit="piece",
+            min_level=150,
+            max_level=600,
+            reorder_point=250,
+            lead_time_days=2,
+            shelf_life_days=4,
+            cost_per_unit=4.50,
+            supplier_id="SWISS_MEAT"
+        )
+    }
+
+def test_daily_updates_match_batch(sample_history, sample_items):
+    state = ForecastState()
+    for _, day in sample_history.groupby('date'):
+        state.update(day)
+
+    target = datetime(2024, 11, 8)
+    expected = DemandPredictionTools().predict_demand(
+        historical_data=sample_history[sample_history['location'] == 'Zurich'],
+        items=sample_items,
+        target_date=target,
+        location='Zurich'
+    )
+
+    assert len(state) == 2
+    assert state.predict_demand(sample_items, target, 'Zurich') == expected
+
+def test_save_and_load(tmp_path, sample_history, sample_items):
+    state = ForecastState(decay=0.9)
+    state.update(sample_history)
+    path = str(tmp_path / 'state.npz')
+    state.save(path)
+
+    restored = ForecastState.load(path)
+    target = datetime(2024, 11, 8)
+
+    assert restored.decay == 0.9
+    assert restored.last_date == state.last_date
+    assert restored.predict_demand(sample_items, target, 'Geneva') == \
+        state.predict_demand(sample_items, target, 'Geneva')
+
+def test_decay_weights_recent_days(sample_history):
+    state = ForecastState(decay=0.5)
+    state.update(sample_history)
+    stats = state.statistics('Zurich')
+
+    # Con decaimiento la media se acerca a los días recientes
+    assert stats.loc['BEEF001', 'mean'] > sample_history.query("location == 'Zurich'")['units_sold'].mean()
+    assert stats.loc['BEEF001', 'observations'] == 3
+
+def test_unsorted_frame_matches_daily_updates(sample_history):
+    daily = ForecastState()
+    for _, day in sample_history.groupby('date'):
+        daily.update(day)
+    shuffled = ForecastState()
+    shuffled.update(sample_history.iloc[[5, 0, 3, 1, 4, 2]])
+
+    pd.testing.assert_frame_equal(shuffled.statistics(), daily.statistics())
+
+def test_std_is_finite_when_decayed_weight_is_small(sample_history):
+    # Tras 20 días sin datos el peso efectivo de las dos observaciones queda < 1
+    state = ForecastState(decay=0.5)
+    state.update(sample_history[sample_history['date'] == '2024-11-01'])
+    state.update(pd.DataFrame({
+        'date': ['2024-11-21'], 'location': ['Zurich'], 'item_id': ['BEEF001'], 'units_sold': [100]
+    }))
+    state.update(pd.DataFrame({
+        'date': ['2024-11-01'], 'location': ['Geneva'], 'item_id': ['BEEF001'], 'units_sold': [90]
+    }))
+
+    stats = state.statistics('Geneva')
+    assert stats.loc['BEEF001', 'observations'] == 2
+    assert stats.loc['BEEF001', 'std'] == 0
@@ -0,0 +1,139 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from src.tools.hierarchy_tools import HierarchyStructure, HierarchicalForecaster
+from src.models.inventory_models import InventoryItem
+
+@pytest.fixture
+def history():
+    dates = pd.date_range('2024-01-01', periods=6)
+    rows = []
+    for day, date in enumerate(dates):
+        rows.append({'date': date, 'location': 'Zurich_01', 'item_id': 'BEEF001', 'units_sold': 100 + day})
+        rows.append({'date': date, 'location': 'Zurich_01', 'item_id': 'BEEF002', 'units_sold': 20 + day % 3})
+        rows.append({'date': date, 'location': 'Zurich_02', 'item_id': 'BEEF001', 'units_sold': 80 - day})
+        rows.append({'date': date, 'location': 'Geneva_01', 'item_id': 'BEEF001', 'units_sold': 90})
+        if day % 2 == 0:
+            # Serie escasa, como la hamburguesa vegetal de Basel
+            rows.append({'date': date, 'location': 'Basel_01', 'item_id': 'BEEF002', 'units_sold': 4 + day})
+    return pd.DataFrame(rows)
+
+@pytest.fixture
+def sample_items():
+    return {
+        'BEEF001': InventoryItem(
+            id="BEEF001",
+            name="Swiss Beef Patty",
+            category="MEAT",
+            storage="REFRIGERATED",
+            unit="piece",
+            min_level=150,
+            max_level=600,
+            reorder_point=250,
+            lead_time_days=2,
+            shelf_life_days=4,
+            cost_per_unit=4.50,
+            supplier_id="SWISS_MEAT"
+        ),
+        'BEEF002': InventoryItem(
+            id="BEEF002",
+            name="Plant-Based Patty",
+            category="MEAT",
+            storage="FROZEN",
+            unit="piece",
+            min_level=50,
+            max_level=300,
+            reorder_point=80,
+            lead_time_days=3,
+            shelf_life_days=30,
+            cost_per_unit=5.20,
+            supplier_id="PLANT_FOODS"
+        )
+    }
+
+def test_structure_matches_dense_matrix(history):
+    structure = HierarchyStructure.from_history(history)
+    dense = structure.to_dense()
+    leaves = np.arange(1, structure.n_leaves + 1, dtype=float)
+    nodes = np.linspace(0, 1, structure.n_nodes)
+
+    assert structure.n_leaves == 5
+    assert structure.sizes['canton'] == 3
+    assert np.allclose(structure.aggregate(leaves), dense @ leaves)
+    assert np.allclose(structure.transpose(nodes), dense.T @ nodes)
+
+@pytest.mark.parametrize('weights', ['wls', 'ols'])
+def test_reconcile_matches_dense_solution(history, weights):
+    structure = HierarchyStructure.from_history(history)
+    dense = structure.to_dense()
+    base = np.random.default_rng(0).uniform(1, 50, structure.n_nodes)
+    precision = np.diag(1 / dense.sum(axis=1)) if weights == 'wls' else np.eye(structure.n_nodes)
+
+    leaves = np.linalg.solve(dense.T @ precision @ dense, dense.T @ precision @ base)
+
+    assert np.allclose(structure.reconcile(base, weights=weights), dense @ leaves)
+
+def test_forecast_is_coherent(history):
+    result = HierarchicalForecaster().forecast(history, datetime(2024, 1, 7))
+    leaves = result[result['level'] == 'location_item']
+
+    chain = result.loc[result['level'] == 'chain', 'reconciled'].item()
+    zurich = result.loc[(result['level'] == 'canton') & (result['canton'] == 'Zurich'), 'reconciled'].item()
+    zurich_leaves = leaves.loc[leaves['canton'] == 'Zurich', 'reconciled'].sum()
+
+    assert chain == pytest.approx(leaves['reconciled'].sum())
+    assert zurich == pytest.approx(zurich_leaves)
+    assert set(result['level']) == set(HierarchyStructure.LEVELS)
+
+def test_location_predictions_format(history, sample_items):
+    predictions = HierarchicalForecaster().location_predictions(
+        history, sample_items, datetime(2024, 1, 7)
+    )
+
+    assert set(predictions) == {'Zurich_01', 'Zurich_02', 'Geneva_01', 'Basel_01'}
+    basel = predictions['Basel_01']['BEEF002']
+    assert basel.predicted_demand >= 0
+    assert basel.confidence_range[0] <= basel.predicted_demand <= basel.confidence_range[1]
+
+def test_invalid_weights(history):
+    structure = HierarchyStructure.from_history(history)
+    with pytest.raises(ValueError):
+        structure.reconcile(np.zeros(structure.n_nodes), weights='mint')
+
+def test_non_negative_reconcile_matches_enumeration(history):
+    structure = HierarchyStructure.from_history(history)
+    dense = structure.to_dense()
+    precision = np.diag(1 / dense.sum(axis=1))
+    # Hojas con predicción base muy negativa fuerzan la restricción
+    base = np.random.default_rng(4).uniform(1, 50, structure.n_nodes)
+    base[structure.node_codes('location_item')[:2]] = -200
+
+    def objective(leaves):
+        error = dense @ leaves - base
+        return error @ precision @ error
+
+    # Mínimo con x >= 0: el mejor de los óptimos sin restricción sobre cada conjunto de hojas libres
+    best = None
+    for mask in range(1, 2 ** structure.n_leaves):
+        free = np.array([(mask >> i) & 1 for i in range(structure.n_leaves)], dtype=bool)
+        reduced = dense[:, free]
+        leaves = np.zeros(structure.n_leaves)
+        leaves[free] = np.linalg.solve(reduced.T @ precision @ reduced, reduced.T @ precision @ base)
+        if (leaves >= -1e-9).all() and (best is None or objective(leaves) < objective(best)):
+            best = leaves
+
+    reconciled = structure.reconcile(base, non_negative=True)
+    assert (reconciled >= 0).all()
+    assert np.allclose(reconciled, dense @ best)
+
+def test_location_predictions_keep_base_trend(history, sample_items):
+    target = datetime(2024, 1, 7)
+    forecaster = HierarchicalForecaster()
+    frame = forecaster.forecast(history, target)
+    leaf = frame[(frame['level'] == 'location_item') & (frame['location'] == 'Basel_01')
+                 & (frame['item_id'] == 'BEEF002')].iloc[0]
+
+    prediction = forecaster.location_predictions(history, sample_items, target)['Basel_01']['BEEF002']
+    assert prediction.trend_factor == pytest.approx(leaf['trend_factor'])
+    assert leaf['adjustment'] == pytest.approx(leaf['reconciled'] / leaf['base'])
@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from src.tools.history_index import HistoryIndex
+from src.tools.columnar_cache import ColumnarCache
+from src.tools import data_loader
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(11)
+    size = 500
+    return pd.DataFrame({
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 60, size), unit='D'),
+        'location': rng.choice(['Zurich', 'Geneva', 'Basel'], size),
+        'item_id': rng.choice(['BEEF001', 'BEEF002'], size),
+        'units_sold': rng.integers(0, 100, size)
+    })
+
+def masked(history, location, start_date=None, end_date=None):
+    df = history[history['location'] == location]
+    if start_date:
+        df = df[df['date'] >= start_date]
+    if end_date:
+        df = df[df['date'] <= end_date]
+    return df
+
+@pytest.mark.parametrize('start_date,end_date', [
+    (None, None),
+    (datetime(2024, 1, 10), None),
+    (None, datetime(2024, 2, 1)),
+    (datetime(2024, 1, 15), datetime(2024, 1, 15)),
+    (datetime(2024, 3, 1), datetime(2024, 3, 5))
+])
+def test_slice_matches_boolean_masks(history, start_date, end_date):
+    index = HistoryIndex(history)
+    for location in ['Zurich', 'Geneva', 'Basel']:
+        result = index.slice(location, start_date, end_date)
+        expected = masked(history, location, start_date, end_date)
+        assert sorted(result.index) == sorted(expected.index)
+        assert result['date'].is_monotonic_increasing
+
+def test_offsets_are_contiguous(history):
+    index = HistoryIndex(history)
+    ranges = sorted(index.offsets.values())
+
+    assert ranges[0][0] == 0
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert index.slice('Bern').empty
+
+def test_get_historical_data_loads_once(tmp_path, monkeypatch):
+    # Cache y historial indexado propios de la prueba (nada se escribe en data/cache)
+    monkeypatch.setattr(data_loader, 'default_columnar_cache', ColumnarCache(str(tmp_path / 'cache')))
+    monkeypatch.setattr(data_loader, '_history_index', {})
+    first = data_loader.get_history_index()
+    second = data_loader.get_history_index()
+    df = data_loader.get_historical_data('Zurich')
+
+    assert first is second
+    assert set(df['location']) <= {'Zurich'}
+    assert any((tmp_path / 'cache').iterdir())
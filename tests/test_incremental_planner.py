@@ -0,0 +1,122 @@
+import pytest
+import numpy as np
+from src.tools.incremental_planner import IncrementalPlanner
+from src.tools.multi_location_tools import MultiLocationTools
+from src.tools.transfer_network import TransferNetwork
+from src.models.inventory_models import InventoryItem, InventoryPrediction
+
+def _prediction(demand):
+    return InventoryPrediction(
+        predicted_demand=demand,
+        confidence_range=(0, 0),
+        trend_factor=1.0,
+        seasonality_factor=1.0
+    )
+
+@pytest.fixture
+def network_inputs():
+    rng = np.random.default_rng(21)
+    locations = ['Zurich', 'Geneva', 'Basel', 'Bern', 'Lugano', 'Chur']
+    items = {
+        f"ITEM{i}": InventoryItem(
+            id=f"ITEM{i}",
+            name=f"Item {i}",
+            category="MEAT",
+            storage=['FROZEN', 'REFRIGERATED', 'ROOM_TEMP'][i % 3],
+            unit="piece",
+            min_level=100,
+            max_level=600,
+            reorder_point=250,
+            lead_time_days=1 + i % 3,
+            cost_per_unit=float(rng.uniform(1, 10)),
+            supplier_id="SUPPLIER"
+        )
+        for i in range(10)
+    }
+    inventory = {
+        location: {item_id: float(rng.integers(0, 900)) for item_id in items if rng.random() < 0.9}
+        for location in locations
+    }
+    predictions = {
+        location: {item_id: _prediction(float(rng.uniform(5, 120))) for item_id in items}
+        for location in locations
+    }
+    return inventory, predictions, items
+
+@pytest.fixture
+def tools():
+    return MultiLocationTools(TransferNetwork.from_config(None))
+
+def _normalize(recommendations):
+    # Sin fechas de pedido, que dependen del momento del cálculo
+    return {
+        location: (
+            {item_id: (order.quantity, order.priority) for item_id, order in recommendation.new_orders.items()},
+            {item_id: (transfer.from_location, transfer.quantity) for item_id, transfer in recommendation.transfers_in.items()}
+        )
+        for location, recommendation in recommendations.items()
+    }
+
+@pytest.mark.parametrize('solver', ['greedy', 'flow'])
+def test_deltas_match_full_replan(network_inputs, tools, solver):
+    inventory, predictions, items = network_inputs
+    planner = IncrementalPlanner(tools, solver=solver)
+    planner.plan(inventory, predictions, items)
+
+    planner.update_stock('Geneva', 'ITEM3', 20)
+    planner.update_forecast('Basel', 'ITEM7', _prediction(300))
+    planner.apply(stock={'Zurich': {'ITEM1': 850, 'ITEM2': 0}}, forecasts={'Chur': {'ITEM1': _prediction(5)}})
+
+    inventory['Geneva']['ITEM3'] = 20
+    inventory['Zurich'].update({'ITEM1': 850, 'ITEM2': 0})
+    predictions['Basel']['ITEM7'] = _prediction(300)
+    predictions['Chur']['ITEM1'] = _prediction(5)
+    expected = tools.optimize_orders(inventory, predictions, items, solver=solver)
+    assert _normalize(planner.recommendations) == _normalize(expected)
+
+def test_only_affected_item_and_locations_are_rebuilt(network_inputs, tools):
+    inventory, predictions, items = network_inputs
+    planner = IncrementalPlanner(tools)
+    before = planner.plan(inventory, predictions, items)
+
+    after = planner.update_stock('Bern', 'ITEM4', 0)
+
+    assert planner.last_replanned == ['ITEM4']
+    assert 'Bern' in planner.last_rebuilt
+    for location in after:
+        if location in planner.last_rebuilt:
+            assert after[location] is not before[location]
+            # Los demás items del local conservan sus recomendaciones
+            for item_id, order in before[location].new_orders.items():
+                if item_id != 'ITEM4':
+                    assert after[location].new_orders[item_id] is order
+        else:
+            assert after[location] is before[location]
+    assert 'ITEM4' in after['Bern'].new_orders or 'ITEM4' in after['Bern'].transfers_in
+
+def test_new_cells_and_locations(network_inputs, tools):
+    inventory, predictions, items = network_inputs
+    planner = IncrementalPlanner(tools)
+    planner.plan(inventory, predictions, items)
+
+    # Un item conocido que el local no tenía: sigue siendo una sola columna
+    location, missing = next(
+        (location, item_id) for location in inventory for item_id in items if item_id not in inventory[location]
+    )
+    planner.update_stock(location, missing, 0)
+    assert planner.last_replanned == [missing]
+
+    # Un local nuevo cambia la forma del estado: plan completo
+    with pytest.raises(KeyError):
+        planner.update_stock('Sion', 'ITEM0', 0)
+    planner.apply(stock={'Sion': {'ITEM0': 0}}, forecasts={'Sion': {'ITEM0': _prediction(40)}})
+    assert set(planner.last_replanned) == set(planner.state.item_ids)
+    assert 'Sion' in planner.recommendations
+
+    # Previsiones fuera del inventario no replanifican nada
+    planner.update_forecast('Thun', 'ITEM0', _prediction(50))
+    assert planner.last_replanned == []
+
+def test_apply_requires_plan(tools):
+    with pytest.raises(RuntimeError):
+        IncrementalPlanner(tools).update_stock('Zurich', 'BEEF001', 10)
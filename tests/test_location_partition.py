@@ -0,0 +1,45 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.tools.location_partition import LocationPartition, SourcePartitions
+
+LOCATIONS = [f'Store_{i:03d}' for i in range(120)]
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(2)
+    def source(size):
+        return pd.DataFrame({
+            'location': rng.choice(LOCATIONS, size),
+            'value': rng.integers(0, 100, size)
+        })
+    return {
+        'inventory': {'current': source(800), 'historical': source(3000)},
+        'support': {'staff': source(200)}
+    }
+
+def test_views_match_boolean_masks(data):
+    partitions = SourcePartitions(data)
+    for group, sources in data.items():
+        for name, frame in sources.items():
+            for location in LOCATIONS:
+                view = partitions.view(group, name, location)
+                expected = frame[frame['location'] == location]
+                pd.testing.assert_frame_equal(view, expected)
+
+def test_partitions_are_built_lazily_once(data):
+    partitions = SourcePartitions(data)
+    partitions.view('inventory', 'current', LOCATIONS[0])
+    first = partitions.partition('inventory', 'current')
+    partitions.view('inventory', 'current', LOCATIONS[1])
+
+    assert partitions.partition('inventory', 'current') is first
+    assert list(partitions._partitions) == [('inventory', 'current')]
+
+def test_unknown_and_missing_locations():
+    frame = pd.DataFrame({'location': ['Zurich', None, 'Basel', 'Zurich'], 'value': [1, 2, 3, 4]})
+    partition = LocationPartition(frame)
+
+    assert partition.view('Zurich')['value'].tolist() == [1, 4]
+    assert partition.view('Basel')['value'].tolist() == [3]
+    assert partition.view('Bern').empty
@@ -0,0 +1,152 @@
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from src.tools.model_registry import ModelRegistry
+from src.tools.demand_prediction_tools import DemandPredictionTools
+from src.tools.smoothing_tools import ExponentialSmoothingTools
+from src.models.inventory_models import InventoryItem
+
+@pytest.fixture
+def history():
+    dates = pd.date_range('2024-01-01', periods=28)
+    rng = np.random.default_rng(7)
+    frames = []
+    for location in ['Zurich_01', 'Geneva_01']:
+        for item_id, base in [('BEEF001', 100), ('BEEF002', 25)]:
+            frames.append(pd.DataFrame({
+                'date': dates,
+                'location': location,
+                'item_id': item_id,
+                'units_sold': rng.poisson(base, len(dates)).astype(float)
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+@pytest.fixture
+def sample_items():
+    return {
+        'BEEF001': InventoryItem(
+            id="BEEF001",
+            name="Swiss Beef Patty",
+            category="MEAT",
+            storage="REFRIGERATED",
+            unit="piece",
+            min_level=150,
+            max_level=600,
+            reorder_point=250,
+            lead_time_days=2,
+            shelf_life_days=4,
+            cost_per_unit=4.50,
+            supplier_id="SWISS_MEAT"
+        )
+    }
+
+def test_refresh_fits_then_warm_loads(tmp_path, history):
+    registry = ModelRegistry(str(tmp_path), engine='demand')
+    assert registry.refresh(history) == {'unchanged': 0, 'appended': 0, 'refit': 4, 'removed': 0}
+
+    reloaded = ModelRegistry(str(tmp_path), engine='demand')
+    assert len(reloaded) == 4
+    assert reloaded.version == 1
+    assert reloaded.refresh(history) == {'unchanged': 4, 'appended': 0, 'refit': 0, 'removed': 0}
+
+    with open(tmp_path / 'registry.json') as f:
+        meta = json.load(f)
+    assert meta['engines']['demand']['series'] == 4
+
+def test_only_changed_series_are_refit(tmp_path, history):
+    registry = ModelRegistry(str(tmp_path), engine='demand')
+    registry.refresh(history)
+
+    changed = history.copy()
+    row = changed.index[(changed['location'] == 'Geneva_01') & (changed['item_id'] == 'BEEF002')][3]
+    changed.loc[row, 'units_sold'] += 5
+
+    assert registry.refresh(changed) == {'unchanged': 3, 'appended': 0, 'refit': 1, 'removed': 0}
+    versions = dict(zip(zip(registry.locations, registry.item_ids), registry.versions))
+    assert versions[('Geneva_01', 'BEEF002')] == 2
+    assert versions[('Zurich_01', 'BEEF001')] == 1
+
+def test_series_missing_from_history_are_removed(tmp_path, history, sample_items):
+    registry = ModelRegistry(str(tmp_path), engine='demand')
+    registry.refresh(history)
+
+    zurich = history[history['location'] == 'Zurich_01']
+    assert registry.refresh(zurich) == {'unchanged': 2, 'appended': 0, 'refit': 0, 'removed': 2}
+    assert len(registry) == 2
+    assert registry.predict_demand(sample_items, datetime(2024, 1, 30), 'Geneva_01') == {}
+
+    reloaded = ModelRegistry(str(tmp_path), engine='demand')
+    assert set(reloaded.locations) == {'Zurich_01'}
+    assert reloaded.refresh(history) == {'unchanged': 2, 'appended': 0, 'refit': 2, 'removed': 0}
+
+def test_demand_predictions_match_direct_fit(tmp_path, history, sample_items):
+    registry = ModelRegistry(str(tmp_path), engine='demand')
+    registry.refresh(history)
+    target = datetime(2024, 1, 30)
+
+    expected = DemandPredictionTools().predict_demand(
+        history[history['location'] == 'Zurich_01'], sample_items, target, 'Zurich_01'
+    )
+    assert registry.predict_demand(sample_items, target, 'Zurich_01') == expected
+
+def test_holt_winters_appends_new_days(tmp_path, history, sample_items):
+    cutoff = pd.Timestamp('2024-01-22')
+    registry = ModelRegistry(str(tmp_path), engine='holt_winters')
+    registry.refresh(history[history['date'] < cutoff])
+
+    summary = ModelRegistry(str(tmp_path), engine='holt_winters').refresh(history)
+    assert summary == {'unchanged': 0, 'appended': 4, 'refit': 0, 'removed': 0}
+
+    # Continuar la recursión equivale a ajustar con los parámetros ya elegidos
+    resumed = ModelRegistry(str(tmp_path), engine='holt_winters')
+    states = resumed.states()
+    i = int(np.flatnonzero((states.keys['location'] == 'Zurich_01') & (states.keys['item_id'] == 'BEEF001'))[0])
+    early = ExponentialSmoothingTools().fit(history[history['date'] < cutoff], ['location', 'item_id'])
+    j = int(np.flatnonzero((early.keys['location'] == 'Zurich_01') & (early.keys['item_id'] == 'BEEF001'))[0])
+    reference = ExponentialSmoothingTools(
+        alphas=(early.alpha[j],), betas=(early.beta[j],), gammas=(early.gamma[j],)
+    )
+    series = history[(history['location'] == 'Zurich_01') & (history['item_id'] == 'BEEF001')]
+    tail = reference.resume(early, series[series['date'] >= cutoff], ['location', 'item_id'])
+    assert states.level[i] == pytest.approx(tail.level[j])
+    assert states.end[i] == np.datetime64('2024-01-28')
+
+    predictions = resumed.predict_demand(sample_items, datetime(2024, 1, 30), 'Zurich_01')
+    assert predictions['BEEF001'].predicted_demand > 0
+
+def test_incompatible_settings_are_ignored(tmp_path, history):
+    ModelRegistry(str(tmp_path), engine='holt_winters').refresh(history)
+    other = ModelRegistry(
+        str(tmp_path), engine='holt_winters',
+        smoothing_tools=ExponentialSmoothingTools(alphas=(0.5,))
+    )
+    assert len(other) == 0
+
+def test_holt_winters_registry_matches_direct_fit(tmp_path, history, sample_items):
+    # Una serie que terminó antes que el resto conserva su propio último día
+    history = history[~((history['item_id'] == 'BEEF001') & (history['date'] > '2024-01-14'))]
+    registry = ModelRegistry(str(tmp_path), engine='holt_winters')
+    registry.refresh(history)
+    target = datetime(2024, 1, 30)
+
+    expected = ExponentialSmoothingTools().predict_demand_frame(
+        history[history['location'] == 'Zurich_01'], sample_items, target
+    )
+    predictions = registry.predict_demand(sample_items, target, 'Zurich_01')
+    assert predictions['BEEF001'].predicted_demand == pytest.approx(expected.loc['BEEF001', 'predicted_demand'])
+    assert predictions['BEEF001'].trend_factor == pytest.approx(expected.loc['BEEF001', 'trend_factor'])
+
+def test_demand_appends_new_days(tmp_path, history, sample_items):
+    cutoff = pd.Timestamp('2024-01-22')
+    ModelRegistry(str(tmp_path), engine='demand').refresh(history[history['date'] < cutoff])
+
+    registry = ModelRegistry(str(tmp_path), engine='demand')
+    assert registry.refresh(history) == {'unchanged': 0, 'appended': 4, 'refit': 0, 'removed': 0}
+
+    # Combinar las sumas equivale a ajustar con todo el historial
+    expected = DemandPredictionTools().series_statistics(history, ['location', 'item_id'])
+    positions = registry._positions_of(expected.index.to_frame(index=False))
+    for name in ['mean', 'std', 'trend', 'observations']:
+        assert registry.parameters[name][positions] == pytest.approx(expected[name].to_numpy())
@@ -85,4 +85,42 @@ def test_transfer_cost():
     )
     
     assert cost > 0
-    assert isinstance(cost, float)
\ No newline at end of file
+    assert isinstance(cost, float)
+def test_flow_solver_shares_surplus(sample_predictions, sample_items):
+    tools = MultiLocationTools()
+    inventory = {
+        'Zurich': {'BEEF001': 200},
+        'Geneva': {'BEEF001': 800},
+        'Basel': {'BEEF001': 150}
+    }
+
+    greedy = tools.optimize_orders(inventory, sample_predictions, sample_items)
+    flow = tools.optimize_orders(inventory, sample_predictions, sample_items, solver='flow')
+
+    # El voraz asigna el mismo excedente de Geneva (450) a los dos locales
+    assert greedy['Zurich'].transfers_in['BEEF001'].quantity == 250
+    assert greedy['Basel'].transfers_in['BEEF001'].quantity == 300
+
+    assert flow['Zurich'].transfers_in['BEEF001'].from_location == 'Geneva'
+    assert flow['Zurich'].transfers_in['BEEF001'].quantity == pytest.approx(250)
+    assert flow['Basel'].transfers_in['BEEF001'].quantity == pytest.approx(200)
+    assert flow['Basel'].new_orders['BEEF001'].quantity == pytest.approx(100)
+    assert flow['Geneva'].new_orders == {} and flow['Geneva'].transfers_in == {}
+
+def test_flow_solver_orders_without_surplus(sample_inventory, sample_predictions, sample_items):
+    tools = MultiLocationTools()
+    recommendations = tools.optimize_orders(
+        locations_inventory={location: {'BEEF001': 100} for location in sample_inventory},
+        demand_predictions=sample_predictions,
+        items=sample_items,
+        solver='flow'
+    )
+
+    for recommendation in recommendations.values():
+        assert recommendation.transfers_in == {}
+        assert recommendation.new_orders['BEEF001'].quantity == pytest.approx(350)
+        assert recommendation.new_orders['BEEF001'].priority == 'high'
+
+def test_unknown_solver(sample_inventory, sample_predictions, sample_items):
+    with pytest.raises(ValueError):
+        MultiLocationTools().optimize_orders(sample_inventory, sample_predictions, sample_items, solver='lp')
@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from src.tools.parallel_forecast import ParallelForecaster, partition_by_location
+from src.tools.demand_prediction_tools import DemandPredictionTools
+from src.models.inventory_models import InventoryItem
+
+@pytest.fixture
+def sample_history():
+    return pd.DataFrame({
+        'date': ['2024-11-01', '2024-11-01', '2024-11-01', '2024-11-15', '2024-11-15', '2024-11-30', '2024-11-30'],
+        'location': ['Zurich', 'Geneva', 'Basel', 'Geneva', 'Zurich', 'Zurich', 'Basel'],
+        'item_id': ['BEEF001'] * 7,
+        'units_sold': [120, 80, 40, 95, 135, 140, 35]
+    })
+
+@pytest.fixture
+def sample_items():
+    return {
+        'BEEF001': InventoryItem(
+            id="BEEF001",
+            name="Swiss Beef Patty",
+            category="MEAT",
+            storage="REFRIGERATED",
+            unit="piece",
+            min_level=150,
+            max_level=600,
+            reorder_point=250,
+            lead_time_days=2,
+            shelf_life_days=4,
+            cost_per_unit=4.50,
+            supplier_id="SWISS_MEAT"
+        )
+    }
+
+def test_partition_by_location(sample_history):
+    ordered, offsets = partition_by_location(sample_history)
+    start, end = offsets['Zurich']
+    assert list(ordered.iloc[start:end]['units_sold']) == [120, 135, 140]
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parallel_matches_serial(sample_history, sample_items, workers):
+    locations = ['Zurich', 'Geneva', 'Basel']
+    target = datetime(2024, 12, 6)
+    tools = DemandPredictionTools()
+
+    parallel = ParallelForecaster('demand', max_workers=workers).predict_locations(
+        history=sample_history,
+        items=sample_items,
+        target_date=target,
+        locations=locations
+    )
+    serial = {
+        location: tools.predict_demand(
+            historical_data=sample_history[sample_history['location'] == location],
+            items=sample_items,
+            target_date=target,
+            location=location
+        )
+        for location in locations
+    }
+
+    assert list(parallel) == locations
+    assert parallel == serial
+
+def test_parallel_forecast_horizon(sample_history, sample_items):
+    locations = ['Basel', 'Zurich', 'Geneva']
+    serial = DemandPredictionTools().forecast_horizon(
+        sample_history, sample_items, datetime(2024, 12, 1), 5, locations
+    )
+    parallel = ParallelForecaster('demand', max_workers=2).forecast_horizon(
+        sample_history, sample_items, datetime(2024, 12, 1), 5, locations
+    )
+
+    assert parallel.locations == locations
+    assert np.array_equal(parallel.demand, serial.demand, equal_nan=True)
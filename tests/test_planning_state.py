@@ -0,0 +1,93 @@
+import pytest
+import numpy as np
+from src.tools.planning_state import PlanningState
+from src.tools.multi_location_tools import MultiLocationTools, ORDER_PREMIUM
+from src.tools.transfer_network import TransferNetwork
+from src.models.inventory_models import InventoryItem, InventoryPrediction
+
+@pytest.fixture
+def network_inputs():
+    rng = np.random.default_rng(8)
+    locations = ['Zurich', 'Geneva', 'Basel', 'Bern', 'Lugano', 'Chur']
+    items = {
+        f"ITEM{i}": InventoryItem(
+            id=f"ITEM{i}",
+            name=f"Item {i}",
+            category="MEAT",
+            storage=['FROZEN', 'REFRIGERATED', 'ROOM_TEMP'][i % 3],
+            unit="piece",
+            min_level=100,
+            max_level=600,
+            reorder_point=250,
+            lead_time_days=1 + i % 3,
+            cost_per_unit=float(rng.uniform(1, 10)),
+            supplier_id="SUPPLIER"
+        )
+        for i in range(12)
+    }
+    inventory = {
+        location: {item_id: float(rng.integers(0, 900)) for item_id in items if rng.random() < 0.9}
+        for location in locations
+    }
+    predictions = {
+        location: {
+            item_id: InventoryPrediction(
+                predicted_demand=float(rng.uniform(5, 120)),
+                confidence_range=(0, 0),
+                trend_factor=1.0,
+                seasonality_factor=1.0
+            )
+            for item_id in items
+        }
+        for location in locations
+    }
+    return inventory, predictions, items
+
+def test_matrices_match_scalar_formulas(network_inputs):
+    inventory, predictions, items = network_inputs
+    state = PlanningState.from_inputs(inventory, predictions, items)
+
+    for row, location in enumerate(state.locations):
+        for column, item_id in enumerate(state.item_ids):
+            item = items[item_id]
+            stock = inventory[location].get(item_id, 0)
+            demand = predictions[location][item_id].predicted_demand
+            assert state.present[row, column] == (item_id in inventory[location])
+            assert state.excess[row, column] == stock - (item.min_level + demand * item.lead_time_days)
+            if item_id in inventory[location]:
+                assert state.days_coverage[row, column] == stock / (demand + 0.0001)
+                assert state.needed[row, column] == max(0, item.reorder_point - stock + demand * item.lead_time_days)
+            else:
+                assert state.needed[row, column] == 0
+
+def test_fast_greedy_matches_per_cell_search(network_inputs):
+    inventory, predictions, items = network_inputs
+    tools = MultiLocationTools(TransferNetwork.load())
+    recommendations = tools.optimize_orders(inventory, predictions, items)
+
+    for location, stock in inventory.items():
+        recommendation = recommendations[location]
+        for item_id, current_stock in stock.items():
+            item = items[item_id]
+            demand = predictions[location][item_id].predicted_demand
+            needed = max(0, item.reorder_point - current_stock + demand * item.lead_time_days)
+            if needed <= 0:
+                assert item_id not in recommendation.new_orders and item_id not in recommendation.transfers_in
+                continue
+            options = tools._find_transfer_options(item_id, needed, location, inventory, predictions, item)
+            best = min(options, key=lambda option: option.total_cost) if options else None
+            if best is not None and best.total_cost < needed * item.cost_per_unit * ORDER_PREMIUM:
+                assert recommendation.transfers_in[item_id] == best
+                assert item_id not in recommendation.new_orders
+            else:
+                assert recommendation.new_orders[item_id].quantity == needed
+                assert item_id not in recommendation.transfers_in
+
+def test_stocked_item_without_prediction_raises(network_inputs):
+    inventory, predictions, items = network_inputs
+    location = next(iter(inventory))
+    item_id = next(iter(inventory[location]))
+    del predictions[location][item_id]
+
+    with pytest.raises(KeyError):
+        PlanningState.from_inputs(inventory, predictions, items)
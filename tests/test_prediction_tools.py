@@ -47,4 +47,52 @@ def test_predict_demand(tools, sample_data, sample_items):
 def test_prediction_tools_structure(tools):
     tool_list = tools.get_tools()
     assert len(tool_list) > 0
-    assert tool_list[0].name == "predict_demand"
\ No newline at end of file
+    assert tool_list[0].name == "predict_demand"
+@pytest.fixture
+def multi_item_data():
+    return pd.DataFrame({
+        'date': ['2024-11-03', '2024-11-01', '2024-11-02', '2024-11-01', '2024-11-02'],
+        'item_id': ['BEEF001', 'BEEF001', 'BEEF001', 'BUN001', 'BUN001'],
+        'units_sold': [140, 100, 120, 50, 50]
+    })
+
+def test_predict_demand_grouped_trend(tools, multi_item_data, sample_items):
+    items = {
+        **sample_items,
+        'BUN001': sample_items['BEEF001'].model_copy(update={'id': 'BUN001'})
+    }
+    predictions = tools.predict_demand(
+        historical_data=multi_item_data,
+        items=items,
+        target_date=datetime(2024, 7, 1),
+        location='Zurich'
+    )
+
+    beef = predictions['BEEF001']
+    # media 120, estacionalidad 1.2, tendencia 1 + (140 - 100) / 100 / 3
+    assert beef.seasonality_factor == 1.2
+    assert beef.trend_factor == round(1 + 0.4 / 3, 4)
+    assert beef.predicted_demand == round(120 * 1.2 * (1 + 0.4 / 3), 2)
+    assert beef.confidence_range == (round(144 - 40, 2), round(144 + 40, 2))
+
+    # Desviación cero cae al 10% de la media
+    bun = predictions['BUN001']
+    assert bun.confidence_range == (round(60 - 10, 2), round(60 + 10, 2))
+
+def test_predict_demand_frame_matches_predictions(tools, multi_item_data, sample_items):
+    frame = tools.predict_demand_frame(
+        historical_data=multi_item_data,
+        items=sample_items,
+        target_date=datetime(2024, 12, 1),
+        location='Zurich'
+    )
+    predictions = tools.predict_demand(
+        historical_data=multi_item_data,
+        items=sample_items,
+        target_date=datetime(2024, 12, 1),
+        location='Zurich'
+    )
+
+    assert list(frame.index) == ['BEEF001']
+    assert frame.loc['BEEF001', 'predicted_demand'] == predictions['BEEF001'].predicted_demand
+    assert frame.loc['BEEF001', 'observations'] == 3
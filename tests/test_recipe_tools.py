@@ -0,0 +1,107 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.tools.recipe_tools import RecipeTools
+from src.tools.multi_location_tools import MultiLocationTools
+from src.models.inventory_models import InventoryItem, InventoryPrediction
+
+@pytest.fixture
+def sample_recipes():
+    return {
+        "CLASSIC": {"BUN001": 1, "BEEF001": 1, "VEG001": 0.1},
+        "VEGGIE": {"BUN001": 1, "BEEF002": 1, "VEG001": 0.15}
+    }
+
+@pytest.fixture
+def sample_items():
+    return {
+        'BEEF001': InventoryItem(
+            id="BEEF001",
+            name="Swiss Beef Patty",
+            category="MEAT",
+            storage="REFRIGERATED",
+            unit="piece",
+            min_level=150,
+            max_level=600,
+            reorder_point=250,
+            lead_time_days=2,
+            shelf_life_days=4,
+            cost_per_unit=4.50,
+            supplier_id="SWISS_MEAT"
+        )
+    }
+
+def test_explode_matches_dense_product(sample_recipes):
+    recipes = RecipeTools(sample_recipes)
+    sales = np.array([[10, 4], [0, 2]])
+
+    demand = recipes.explode(sales)
+
+    assert recipes.shape == (2, 4)
+    assert np.allclose(demand, sales @ recipes.to_dense())
+    assert demand[0, recipes.ingredients.index('BUN001')] == 14
+    assert demand[0, recipes.ingredients.index('VEG001')] == pytest.approx(1.6)
+
+def test_update_recipe_is_incremental(sample_recipes):
+    recipes = RecipeTools(sample_recipes)
+    recipes.update_recipe("CLASSIC", {"BUN001": 2, "SAUCE001": 0.03})
+
+    demand = recipes.explode(np.array([[1, 1]]))[0]
+    dense = recipes.to_dense()
+
+    assert recipes.ingredients[-1] == 'SAUCE001'
+    assert demand[recipes.ingredients.index('BUN001')] == 3
+    assert demand[recipes.ingredients.index('BEEF001')] == 0
+    assert np.allclose(demand, dense.sum(axis=0))
+
+def test_explode_frame(sample_recipes):
+    sales = pd.DataFrame({
+        'location': ['Zurich', 'Zurich', 'Geneva', 'Zurich'],
+        'date': ['2024-11-01'] * 4,
+        'item_id': ['CLASSIC', 'VEGGIE', 'CLASSIC', 'UNKNOWN'],
+        'units_sold': [10, 5, 3, 7]
+    })
+    demand = RecipeTools(sample_recipes).explode_frame(sales)
+    zurich = demand[demand['location'] == 'Zurich'].set_index('ingredient_id')['quantity']
+
+    assert zurich['BUN001'] == 15
+    assert zurich['BEEF002'] == 5
+
+def test_menu_orders_use_ingredient_demand(sample_recipes, sample_items):
+    prediction = InventoryPrediction(
+        predicted_demand=100,
+        confidence_range=(80, 120),
+        trend_factor=1.0,
+        seasonality_factor=1.0
+    )
+    menu_predictions = {'Zurich': {'CLASSIC': prediction}}
+
+    ingredients = RecipeTools(sample_recipes).ingredient_predictions(menu_predictions)
+    assert ingredients['Zurich']['VEG001'].predicted_demand == 10
+    assert ingredients['Zurich']['BEEF002'].predicted_demand == 0
+
+    recommendations = MultiLocationTools().optimize_menu_orders(
+        locations_inventory={'Zurich': {'BEEF001': 200}},
+        menu_predictions=menu_predictions,
+        items=sample_items,
+        recipes=RecipeTools(sample_recipes)
+    )
+    # 250 - 200 + 100 × 2 días de lead time
+    assert recommendations['Zurich'].new_orders['BEEF001'].quantity == 250
+
+def test_empty_recipes_then_updates(sample_recipes):
+    recipes = RecipeTools({})
+    assert recipes.explode(np.zeros((1, 0))).shape == (1, 0)
+    assert recipes.to_dense().shape == (0, 0)
+
+    for menu_item, components in sample_recipes.items():
+        recipes.update_recipe(menu_item, components)
+    recipes.update_recipe("CLASSIC", {"BUN001": 2, "SAUCE001": 0.03})
+    compiled = RecipeTools({**sample_recipes, "CLASSIC": {"BUN001": 2, "SAUCE001": 0.03}})
+
+    # El ingrediente que deja de usarse conserva su columna, vacía
+    sales = np.array([[3, 5]])
+    columns = [recipes.ingredients.index(ingredient) for ingredient in compiled.ingredients]
+    assert np.allclose(recipes.explode(sales)[:, columns], compiled.explode(sales))
+    assert np.allclose(recipes.to_dense()[:, columns], compiled.to_dense())
+    assert recipes.explode(sales)[0, recipes.ingredients.index('BEEF001')] == 0
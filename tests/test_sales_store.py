@@ -0,0 +1,127 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from src.tools.sales_store import SalesStore, StoreViews
+
+@pytest.fixture
+def history_path(tmp_path):
+    rng = np.random.default_rng(5)
+    size = 400
+    history = pd.DataFrame({
+        'date': (pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 42, size), unit='D')).strftime('%Y-%m-%d'),
+        'location': rng.choice(['Zurich', 'Geneva', 'Basel'], size),
+        'item_id': rng.choice(['BEEF001', 'BUN001'], size),
+        'units_sold': rng.integers(0, 100, size),
+        'revenue': rng.uniform(0, 500, size).round(2)
+    })
+    path = tmp_path / 'sales_history.csv'
+    history.to_csv(path, index=False)
+    return str(path)
+
+@pytest.fixture
+def store(tmp_path, history_path):
+    store = SalesStore(str(tmp_path / 'store.sqlite'), chunk_rows=64)
+    store.sync(history_path)
+    yield store
+    store.close()
+
+def test_query_filters_match_pandas(store, history_path):
+    history = pd.read_csv(history_path, parse_dates=['date'])
+    result = store.query('sales_history', location='Geneva', item_id='BUN001',
+                         start_date=datetime(2024, 1, 10), end_date=datetime(2024, 1, 31))
+    expected = history[
+        (history['location'] == 'Geneva') & (history['item_id'] == 'BUN001')
+        & (history['date'] >= '2024-01-10') & (history['date'] <= '2024-01-31')
+    ]
+
+    assert len(result) == len(expected)
+    assert result['units_sold'].sum() == expected['units_sold'].sum()
+    assert result['date'].is_monotonic_increasing
+    assert isinstance(result['location'].dtype, pd.CategoricalDtype)
+    assert result['units_sold'].dtype == np.int32
+
+def test_date_filters_accept_strings_and_whole_days(store, history_path):
+    history = pd.read_csv(history_path, parse_dates=['date'])
+    expected = history[(history['date'] >= '2024-01-10') & (history['date'] <= '2024-01-31')]
+
+    by_string = store.query('sales_history', start_date='2024-01-10', end_date='2024-01-31')
+    by_date = store.query('sales_history', start_date=datetime(2024, 1, 10).date(),
+                          end_date=datetime(2024, 1, 31).date())
+    assert len(by_string) == len(by_date) == len(expected)
+    assert (by_string['date'].dt.normalize() == pd.Timestamp('2024-01-31')).any()
+
+    noon = store.query('sales_history', end_date='2024-01-31 12:00:00')
+    assert len(noon) == (history['date'] <= '2024-01-31').sum()
+
+def test_daily_and_weekly_aggregates(store, history_path):
+    history = pd.read_csv(history_path, parse_dates=['date'])
+
+    daily = store.aggregate('sales_history', ['units_sold'], count=True)
+    expected = history.groupby(['location', 'item_id', 'date'])['units_sold'].agg(['sum', 'size'])
+    assert len(daily) == len(expected)
+    assert daily['units_sold'].tolist() == expected['sum'].tolist()
+    assert daily['rows'].tolist() == expected['size'].tolist()
+
+    weekly = store.aggregate('sales_history', ['units_sold'], freq='W', location='Zurich')
+    zurich = history[history['location'] == 'Zurich']
+    week = zurich['date'] - pd.to_timedelta(zurich['date'].dt.dayofweek, unit='D')
+    expected = zurich.groupby(['item_id', week])['units_sold'].sum()
+    assert (weekly['date'].dt.dayofweek == 0).all()
+    assert weekly['units_sold'].tolist() == expected.tolist()
+
+def test_mean_of_integers_is_not_truncated(store):
+    result = store.aggregate('sales_history', ['units_sold'], by=['location'], freq=None, how='mean')
+
+    assert result['units_sold'].dtype == np.float64
+    assert list(result['location']) == ['Basel', 'Geneva', 'Zurich']
+
+def test_indexes_serve_filters(store):
+    plan = store.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM sales_history WHERE location = ? AND item_id = ? AND date >= ?",
+        ('Zurich', 'BEEF001', '2024-01-05')
+    ).fetchall()
+
+    assert 'USING INDEX' in plan[0][-1]
+
+def test_resync_only_when_source_changes(store, history_path):
+    store.sync(history_path)
+    assert len(store.query('sales_history')) == 400
+
+    with open(history_path, 'a') as f:
+        f.write('2024-03-01,Bern,BEEF001,7,70.0\n')
+    stat = os.stat(history_path)
+    os.utime(history_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    store.sync(history_path)
+    assert store.query('sales_history', location='Bern')['units_sold'].tolist() == [7]
+
+def test_store_views_and_unknown_columns(store):
+    views = StoreViews(store, {'sales': {'current': 'sales_history'}})
+
+    assert set(views.view('sales', 'current', 'Basel')['location']) == {'Basel'}
+    with pytest.raises(KeyError):
+        store.aggregate('sales_history', ['price'])
+
+def test_column_kinds_cover_every_chunk(tmp_path):
+    # Los primeros bloques parecen enteros; los últimos traen decimales y nulos
+    path = tmp_path / 'inventory_data.csv'
+    frame = pd.DataFrame({
+        'location': ['Zurich'] * 6,
+        'units_sold': ['1', '2', '3', '4', '5.5', ''],
+        'stock_value': ['', '', '', '', '7', '8'],
+        'flag': ['True', 'False', 'True', 'False', 'unknown', 'True']
+    })
+    frame.to_csv(path, index=False)
+    store = SalesStore(str(tmp_path / 'store.sqlite'), chunk_rows=2)
+    table = store.sync(str(path))
+
+    result = store.query(table)
+    declared = {row[1]: row[2] for row in store.connection.execute(f"PRAGMA table_info({table})")}
+    store.close()
+    assert declared == {'location': 'TEXT', 'units_sold': 'REAL', 'stock_value': 'INTEGER', 'flag': 'TEXT'}
+    assert result['flag'].iloc[4] == 'unknown'
+    assert result['units_sold'].iloc[4] == 5.5
+    assert result['units_sold'].isna().iloc[5]
+    assert result['stock_value'].tolist()[4:] == [7, 8]
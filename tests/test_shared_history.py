@@ -0,0 +1,60 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+import numpy as np
+import pandas as pd
+from src.tools.shared_history import SharedFrame
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(3)
+    size = 1000
+    frame = pd.DataFrame({
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 60, size), unit='D'),
+        'location': rng.choice(['Zurich', 'Geneva', 'Basel'], size),
+        'item_id': pd.Categorical(rng.choice(['BEEF001', 'BUN001'], size)),
+        'units_sold': rng.integers(0, 100, size),
+        'revenue': rng.uniform(0, 500, size),
+        'is_holiday': rng.random(size) < 0.1,
+        'note': rng.choice(['a', 'b'], size)
+    })
+    # Índice no contiguo, como el de un historial ordenado por ubicación
+    return frame.iloc[np.argsort(frame['location'].to_numpy(), kind='stable')]
+
+def _worker_sum(handle):
+    frame = handle.attach()
+    return int(frame['units_sold'].sum()), list(frame.index[:3])
+
+def test_attach_round_trip(history):
+    with SharedFrame(history) as shared:
+        attached = shared.handle.attach()
+
+        assert list(attached.index) == list(history.index)
+        assert attached['date'].equals(history['date'])
+        assert np.array_equal(attached['revenue'], history['revenue'])
+        assert attached['is_holiday'].dtype == bool
+        assert isinstance(attached['location'].dtype, pd.CategoricalDtype)
+        assert isinstance(attached['note'].dtype, pd.CategoricalDtype)
+        assert list(attached['location']) == list(history['location'])
+        assert list(attached['note']) == list(history['note'])
+
+def test_attach_is_zero_copy_and_read_only(history):
+    with SharedFrame(history) as shared:
+        first = shared.handle.attach()
+        second = shared.handle.attach()
+
+        assert np.shares_memory(first['units_sold'].to_numpy(), second['units_sold'].to_numpy())
+        assert np.shares_memory(first['item_id'].array.codes, second['item_id'].array.codes)
+        # Las columnas de texto tampoco se decodifican en cada trabajador
+        assert np.shares_memory(first['note'].array.codes, second['note'].array.codes)
+        with pytest.raises(ValueError):
+            first['units_sold'].to_numpy()[0] = -1
+        assert shared.nbytes >= history['units_sold'].to_numpy().nbytes
+
+def test_spawned_workers_attach(history):
+    context = multiprocessing.get_context('spawn')
+    with SharedFrame(history) as shared:
+        with ProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+            results = list(pool.map(_worker_sum, [shared.handle] * 2))
+
+    assert results == [(int(history['units_sold'].sum()), list(history.index[:3]))] * 2
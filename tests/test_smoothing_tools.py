@@ -0,0 +1,124 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from src.tools.smoothing_tools import ExponentialSmoothingTools
+from src.tools.prediction_tools import PredictionTools
+from src.tools.forecast_cache import ForecastCache
+from src.models.inventory_models import InventoryItem
+
+WEEKLY = np.array([1.0, 1.0, 1.0, 1.1, 1.4, 1.6, 0.9])
+
+@pytest.fixture
+def history():
+    dates = pd.date_range('2024-01-01', periods=42)
+    rng = np.random.default_rng(3)
+    frames = []
+    for item_id, base in [('BEEF001', 100), ('BEEF002', 20)]:
+        frames.append(pd.DataFrame({
+            'date': dates,
+            'item_id': item_id,
+            'units_sold': np.round(base * WEEKLY[dates.weekday] + rng.normal(0, 1, len(dates)))
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+@pytest.fixture
+def sample_items():
+    return {
+        'BEEF001': InventoryItem(
+            id="BEEF001",
+            name="Swiss Beef Patty",
+            category="MEAT",
+            storage="REFRIGERATED",
+            unit="piece",
+            min_level=150,
+            max_level=600,
+            reorder_point=250,
+            lead_time_days=2,
+            shelf_life_days=4,
+            cost_per_unit=4.50,
+            supplier_id="SWISS_MEAT"
+        )
+    }
+
+def reference_fit(y, weekdays, alpha, beta, gamma):
+    """Holt-Winters aditivo escalar, serie por serie"""
+    level = y.mean()
+    season = np.array([(y[weekdays == w] - level).mean() for w in range(7)])
+    trend = 0.0
+    for value, w in zip(y, weekdays):
+        new_level = alpha * (value - season[w]) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[w] = gamma * (value - new_level) + (1 - gamma) * season[w]
+        level = new_level
+    return level, trend, season
+
+def test_fit_matches_scalar_recursion(history):
+    tools = ExponentialSmoothingTools(alphas=(0.3,), betas=(0.05,), gammas=(0.2,))
+    states = tools.fit(history, ['item_id'])
+
+    for i, item_id in enumerate(states.keys['item_id']):
+        series = history[history['item_id'] == item_id]
+        level, trend, season = reference_fit(
+            series['units_sold'].to_numpy(dtype=float),
+            series['date'].dt.weekday.to_numpy(),
+            0.3, 0.05, 0.2
+        )
+        assert states.level[i] == pytest.approx(level)
+        assert states.trend[i] == pytest.approx(trend)
+        assert np.allclose(states.season[i], season)
+
+def test_forecast_follows_weekly_pattern(history):
+    states = ExponentialSmoothingTools().fit(history, ['item_id'])
+    saturday = states.forecast(datetime(2024, 2, 17)).loc['BEEF001', 'predicted_demand']
+    monday = states.forecast(datetime(2024, 2, 12)).loc['BEEF001', 'predicted_demand']
+
+    assert saturday == pytest.approx(160, rel=0.05)
+    assert monday == pytest.approx(100, rel=0.05)
+
+def test_fit_skips_missing_days(history):
+    sparse = history.drop(index=history.index[::3])
+    states = ExponentialSmoothingTools().fit(sparse, ['item_id'])
+
+    assert list(states.observations) == [28, 28]
+    assert np.isfinite(states.level).all()
+
+def test_prediction_tools_method_selection(history, sample_items):
+    tools = PredictionTools(cache=ForecastCache())
+    seasonal = tools.predict_demand(history, sample_items, datetime(2024, 2, 17), 'Zurich')
+    smoothed = tools.predict_demand(
+        history, sample_items, datetime(2024, 2, 17), 'Zurich', method='holt_winters'
+    )
+
+    assert smoothed['BEEF001'].predicted_demand != seasonal['BEEF001'].predicted_demand
+    assert tools.cache.stats()['entries'] == 2
+
+    with pytest.raises(ValueError):
+        tools.predict_demand(history, sample_items, datetime(2024, 2, 17), 'Zurich', method='arima')
+
+def test_requires_dates(sample_items):
+    with pytest.raises(ValueError):
+        ExponentialSmoothingTools().fit(pd.DataFrame({'item_id': ['BEEF001'], 'units_sold': [100]}), ['item_id'])
+
+def test_end_is_last_observed_day_per_series(history):
+    # BEEF002 deja de venderse dos semanas antes que BEEF001
+    truncated = history[(history['item_id'] == 'BEEF001') | (history['date'] <= '2024-01-28')]
+    states = ExponentialSmoothingTools().fit(truncated, ['item_id'])
+    end = dict(zip(states.keys['item_id'], states.end))
+
+    assert end['BEEF001'] == np.datetime64('2024-02-11')
+    assert end['BEEF002'] == np.datetime64('2024-01-28')
+
+def test_sparse_series_trend_is_scaled_by_observation_step():
+    # Una venta cada 15 días que crece 15 unidades por observación
+    dates = pd.date_range('2024-01-01', periods=12, freq='15D')
+    data = pd.DataFrame({'date': dates, 'item_id': 'BEEF001', 'units_sold': 100.0 + 15 * np.arange(12)})
+    tools = ExponentialSmoothingTools(alphas=(0.6,), betas=(0.3,), gammas=(0.0,))
+    states = tools.fit(data, ['item_id'])
+
+    assert states.step[0] == pytest.approx(15)
+    # Un paso (15 días) después de la última observación aplica la pendiente una vez
+    one_step = states.forecast(dates[-1] + pd.Timedelta(days=15))
+    assert one_step.loc['BEEF001', 'trend_factor'] == pytest.approx(
+        (states.level[0] + states.trend[0]) / states.level[0], abs=1e-4
+    )
@@ -0,0 +1,90 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.tools.streaming_ingest import StreamingHistory
+from src.tools.forecast_state import ForecastState
+from src.tools.demand_prediction_tools import DemandPredictionTools
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(5)
+    size = 6000
+    # Varias ventas por día y serie, en orden arbitrario como un export de caja
+    return pd.DataFrame({
+        'date': (pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 30, size), unit='D')).strftime('%Y-%m-%d'),
+        'location': rng.choice(['Zurich_01', 'Geneva_01', 'Basel_01'], size),
+        'item_id': rng.choice(['BEEF001', 'BEEF002', 'BUN001'], size),
+        'units_sold': rng.integers(0, 20, size),
+        'revenue': rng.uniform(0, 100, size)
+    })
+
+@pytest.fixture
+def csv_path(tmp_path, history):
+    path = tmp_path / 'pos_export.csv'
+    history.to_csv(path, index=False)
+    return str(path)
+
+def expected_totals(history):
+    data = history.assign(date=pd.to_datetime(history['date']), rows=1)
+    return data.groupby(['location', 'item_id', 'date'], as_index=False)[['units_sold', 'rows']].sum()
+
+def test_daily_totals_with_small_budget(csv_path, history):
+    stream = StreamingHistory(csv_path, memory_budget_mb=0.01)
+    totals = stream.daily_totals()
+
+    assert stream.chunk_rows() < len(history)
+    expected = expected_totals(history)
+    merged = totals.astype({'location': object, 'item_id': object}).merge(
+        expected, on=['location', 'item_id', 'date'], suffixes=('', '_expected')
+    )
+    assert len(merged) == len(expected) == len(totals)
+    assert (merged['units_sold'] == merged['units_sold_expected']).all()
+    assert (merged['rows'] == merged['rows_expected']).all()
+
+def test_budget_does_not_change_result(csv_path):
+    small = StreamingHistory(csv_path, memory_budget_mb=0.01).daily_totals()
+    large = StreamingHistory(csv_path, memory_budget_mb=512).daily_totals()
+
+    pd.testing.assert_frame_equal(small, large)
+
+def test_statistics_and_state(csv_path):
+    stream = StreamingHistory(csv_path, memory_budget_mb=0.01)
+    totals = stream.daily_totals()
+
+    stats = stream.series_statistics(totals=totals)
+    state = stream.update_state(totals=totals)
+    direct = DemandPredictionTools().series_statistics(totals, ['location', 'item_id'])
+
+    assert len(stats) == len(state) == 9
+    zurich = state.statistics('Zurich_01')
+    assert zurich.loc['BEEF001', 'mean'] == pytest.approx(direct.loc[('Zurich_01', 'BEEF001'), 'mean'])
+    assert zurich.loc['BEEF001', 'trend'] == pytest.approx(direct.loc[('Zurich_01', 'BEEF001'), 'trend'])
+
+def test_state_with_custom_columns(tmp_path, history):
+    path = tmp_path / 'renamed.csv'
+    history.rename(columns={'date': 'day', 'location': 'store', 'item_id': 'sku'}).to_csv(path, index=False)
+    stream = StreamingHistory(
+        str(path), keys=('store', 'sku'), value_columns=('revenue', 'units_sold'), date_column='day'
+    )
+    totals = stream.daily_totals()
+
+    state = stream.update_state(totals=totals, value_column='units_sold')
+    direct = DemandPredictionTools().series_statistics(
+        totals.rename(columns={'day': 'date', 'store': 'location', 'sku': 'item_id'}),
+        ['location', 'item_id']
+    )
+    stats = stream.series_statistics(totals=totals, value_column='units_sold')
+    assert len(state) == len(stats) == 9
+    assert stats.loc[('Zurich_01', 'BEEF001'), 'mean'] == pytest.approx(direct.loc[('Zurich_01', 'BEEF001'), 'mean'])
+    assert state.statistics('Zurich_01').loc['BEEF001', 'mean'] == pytest.approx(
+        direct.loc[('Zurich_01', 'BEEF001'), 'mean']
+    )
+    # Por defecto se usa la primera columna de valores
+    revenue = stream.update_state(totals=totals)
+    assert revenue.statistics('Zurich_01').loc['BEEF001', 'mean'] != pytest.approx(
+        direct.loc[('Zurich_01', 'BEEF001'), 'mean']
+    )
+
+def test_invalid_budget(csv_path):
+    with pytest.raises(ValueError):
+        StreamingHistory(csv_path, memory_budget_mb=0)
@@ -0,0 +1,130 @@
+import heapq
+import pytest
+import numpy as np
+from src.tools.transfer_network import TransferNetwork
+from src.tools.multi_location_tools import MultiLocationTools
+from src.models.inventory_models import InventoryItem
+
+def make_item(item_id, storage):
+    return InventoryItem(
+        id=item_id,
+        name=item_id,
+        category="MEAT",
+        storage=storage,
+        unit="piece",
+        min_level=100,
+        max_level=500,
+        reorder_point=200,
+        lead_time_days=2,
+        cost_per_unit=4.0,
+        supplier_id="SUPPLIER"
+    )
+
+ROUTES = [
+    {'from': 'Zurich', 'to': 'Geneva', 'cost': 120},
+    {'from': 'Geneva', 'to': 'Zurich', 'cost': 90},
+    {'from': 'Zurich', 'to': 'Bern', 'cost': 60}
+]
+
+@pytest.fixture
+def network():
+    return TransferNetwork.from_config({'default_cost': 250, 'routes': ROUTES})
+
+def test_matrix_symmetric_fallback_and_default():
+    network = TransferNetwork.from_config({'default_cost': 250, 'routes': ROUTES, 'multi_hop': False})
+    matrix = network.matrix(['Zurich', 'Geneva', 'Bern', 'Lugano'])
+
+    assert matrix[0, 1] == 120 and matrix[1, 0] == 90
+    assert matrix[0, 2] == 60 and matrix[2, 0] == 60
+    assert matrix[1, 2] == 250
+    assert matrix[3, 0] == 250 and matrix[3, 3] == 250
+
+def test_multi_hop_routes(network):
+    # Geneva -> Bern por Zurich (90 + 60) en lugar de la tarifa directa
+    assert network.base_cost('Geneva', 'Bern') == 150
+    assert network.route('Geneva', 'Bern') == ['Geneva', 'Zurich', 'Bern']
+    assert network.base_cost('Bern', 'Geneva') == 180
+    assert network.route('Zurich', 'Geneva') == ['Zurich', 'Geneva']
+    assert network.route('Lugano', 'Bern') == ['Lugano', 'Bern']
+    assert network.base_cost('Lugano', 'Bern') == 250
+
+    # Rutas y caminos declarados valen aunque superen default_cost
+    network.set_route('Bern', 'Chur', 300)
+    assert network.base_cost('Bern', 'Chur') == 300
+    assert network.base_cost('Geneva', 'Chur') == 450
+    assert network.route('Geneva', 'Chur') == ['Geneva', 'Zurich', 'Bern', 'Chur']
+
+def test_recompiled_only_when_routes_change(network):
+    costs = network.costs
+    assert network.costs is costs
+
+    network.set_route('Geneva', 'Bern', 100)
+    assert network.costs is not costs
+    assert network.route('Geneva', 'Bern') == ['Geneva', 'Bern']
+    network.remove_route('Geneva', 'Bern')
+    assert network.base_cost('Geneva', 'Bern') == 150
+
+def test_floyd_warshall_matches_dijkstra():
+    rng = np.random.default_rng(2)
+    names = [f"S{i}" for i in range(120)]
+    routes = {}
+    for i in range(1, len(names)):
+        # Árbol conexo más aristas aleatorias
+        routes[(names[i], names[rng.integers(0, i)])] = float(rng.integers(20, 120))
+    for a, b in rng.integers(0, len(names), (200, 2)):
+        if a != b:
+            routes[(names[a], names[b])] = float(rng.integers(20, 120))
+    network = TransferNetwork(routes, default_cost=10_000)
+
+    graph = {name: {} for name in names}
+    for (a, b), cost in routes.items():
+        graph[b].setdefault(a, cost)
+    for (a, b), cost in routes.items():
+        graph[a][b] = cost
+
+    source = names[0]
+    distance = {source: 0.0}
+    queue = [(0.0, source)]
+    while queue:
+        d, node = heapq.heappop(queue)
+        if d > distance[node]:
+            continue
+        for other, cost in graph[node].items():
+            if d + cost < distance.get(other, np.inf):
+                distance[other] = d + cost
+                heapq.heappush(queue, (d + cost, other))
+
+    for target in names[1:]:
+        assert network.base_cost(source, target) == pytest.approx(distance[target])
+        path = network.route(source, target)
+        assert sum(graph[a][b] for a, b in zip(path, path[1:])) == pytest.approx(distance[target])
+
+def test_broadcast_matches_scalar_cost(network):
+    tools = MultiLocationTools(network)
+    items = [make_item('A', 'FROZEN'), make_item('B', 'REFRIGERATED'), make_item('C', 'ROOM_TEMP')]
+    sources = ['Zurich', 'Geneva', 'Lugano']
+    destinations = ['Bern', 'Zurich']
+    quantities = np.array([50.0, 200.0, 1000.0])
+
+    costs = network.transfer_costs(sources, destinations, items, quantities)
+
+    assert costs.shape == (3, 2, 3)
+    for s, source in enumerate(sources):
+        for d, destination in enumerate(destinations):
+            for i, item in enumerate(items):
+                expected = tools._calculate_transfer_cost(source, destination, quantities[i], item)
+                assert costs[s, d, i] == expected
+
+def test_default_config_keeps_previous_costs():
+    network = TransferNetwork.load()
+    tools = MultiLocationTools(network)
+    item = make_item('A', 'REFRIGERATED')
+
+    assert network.base_cost('Basel', 'Zurich') == 100
+    assert network.base_cost('Geneva', 'Bern') == 200
+    assert tools._calculate_transfer_cost('Zurich', 'Geneva', 100, item) == 120 * 1.3 * 1.1
+
+def test_missing_config_uses_defaults(tmp_path):
+    network = TransferNetwork.load(str(tmp_path / 'missing.yaml'))
+    assert network.base_cost('Geneva', 'Basel') == 150
+    assert list(network.multipliers([make_item('A', 'FROZEN')])) == [1.5]
@@ -0,0 +1,60 @@
+import itertools
+import pytest
+import numpy as np
+from src.tools.transport_flow import solve_transportation
+
+def brute_force(supply, demand, cost):
+    """Coste óptimo enumerando flujos enteros (solo para problemas diminutos)"""
+    sources, sinks = cost.shape
+    best = np.inf
+    ranges = [range(int(min(supply[i], demand[j])) + 1) for i in range(sources) for j in range(sinks)]
+    for values in itertools.product(*ranges):
+        flow = np.array(values, dtype=float).reshape(sources, sinks)
+        if (flow.sum(axis=1) <= supply).all() and (flow.sum(axis=0) == demand).all():
+            best = min(best, (flow * cost).sum())
+    return best
+
+def has_negative_cycle(flow, cost):
+    """Certificado de optimalidad: el grafo residual no tiene ciclos negativos"""
+    sources, sinks = cost.shape
+    distance = np.zeros(sources + sinks)
+    arcs = [(i, sources + j, cost[i, j]) for i in range(sources) for j in range(sinks)]
+    arcs += [(sources + j, i, -cost[i, j]) for i in range(sources) for j in range(sinks) if flow[i, j] > 1e-9]
+    for _ in range(sources + sinks):
+        changed = False
+        for a, b, weight in arcs:
+            if distance[a] + weight < distance[b] - 1e-9:
+                distance[b] = distance[a] + weight
+                changed = True
+        if not changed:
+            return False
+    return True
+
+def test_known_optimum():
+    supply = np.array([20.0, 30.0])
+    demand = np.array([10.0, 25.0, 15.0])
+    cost = np.array([[8.0, 6.0, 10.0], [9.0, 12.0, 13.0]])
+    flow = solve_transportation(supply, demand, cost)
+
+    assert flow.sum(axis=0) == pytest.approx(demand)
+    assert (flow.sum(axis=1) <= supply + 1e-9).all()
+    assert (flow * cost).sum() == pytest.approx(20 * 6 + 10 * 9 + 5 * 12 + 15 * 13)
+    assert not has_negative_cycle(flow, cost)
+
+@pytest.mark.parametrize('seed', range(10))
+def test_random_small_problems(seed):
+    rng = np.random.default_rng(seed)
+    supply = rng.integers(2, 7, 2).astype(float)
+    demand = rng.integers(1, 4, 3).astype(float)
+    supply[0] = demand.sum()
+    cost = rng.integers(1, 10, (2, 3)).astype(float)
+    flow = solve_transportation(supply, demand, cost)
+
+    assert (flow >= -1e-9).all()
+    assert (flow * cost).sum() == pytest.approx(brute_force(supply, demand, cost))
+    assert not has_negative_cycle(flow, cost)
+
+def test_partial_supply_and_empty():
+    flow = solve_transportation(np.array([5.0]), np.array([3.0, 4.0]), np.array([[1.0, 2.0]]))
+    assert flow.tolist() == [[3.0, 2.0]]
+    assert solve_transportation(np.zeros(0), np.zeros(0), np.zeros((0, 0))).shape == (0, 0)